@@ -493,7 +493,7 @@ class TechnicalAnalysisAgent(BaseAgent):
     def execute(self, symbol: str, **kwargs) -> Dict[str, Any]:
         """Execute technical analysis for a given stock symbol"""
         try:
-            metrics_processor = MetricsProcessor(self.db, symbol)
+            metrics_processor = MetricsProcessor(self.db, symbol).preload()
             calculated_metrics = CalculatedMetrics(metrics_processor)
             current_price_data = metrics_processor.get_current_price_metrics()
             stock_info = metrics_processor.get_stock_info_metrics()
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.agents.technical_analysis_agent import TechnicalAnalysisAgent
-from app.db.config import get_db
+from app.db.config import get_read_db
 
 
 
@@ -14,7 +14,7 @@ router = APIRouter(
 @router.get("/technical_agent/{symbol}")
 def run_technical_agent(
     symbol: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     agent = TechnicalAnalysisAgent(db)
     try:
@@ -1,52 +1,235 @@
-from fastapi import APIRouter
+import os
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 from app.tasks.ingestor import (
     ingest_daily_prices,
     ingest_current_prices,
+    ingest_intraday_prices,
+    apply_intraday_retention,
     ingest_stock_info,
     ingest_balance_sheet,
     ingest_income_statement,
     ingest_cash_flow,
-    ingest_market_sentiment
+    ingest_market_sentiment,
+    ingest_all,
+    ingest_fundamentals,
+    rollback_dataset,
+    ingest_dataset_streaming,
+    ingest_shard,
+    ingest_from_snapshot,
+    DATASET_TABLES
 )
+from app.tasks.jobs import submit_job, get_job, list_jobs
+from app.tasks.distributed import dispatch_dataset, dispatch_all
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.tasks.scheduler import price_scheduler
+from app.db.config import get_read_db
+from app.repositories.ingestion_runs import get_recent_runs, get_run_metrics, summarize_metrics
 
 
 router = APIRouter(prefix="/ingest", tags=["Ingestion"])
 
-@router.post("/daily")
-def trigger_daily_prices():
-    df = ingest_daily_prices()
-    return {"message": "Daily prices ingestion triggered", "rows": len(df) if df is not None else 0}
 
-@router.post("/current")
-def trigger_current_prices():
-    df = ingest_current_prices()
-    return {"message": "Current prices ingestion triggered", "rows": len(df) if df is not None else 0}
+def _queued(job, message: str):
+    return {"message": message, "job_id": job.id, "status": job.status}
 
-@router.post("/stock-info")
-def trigger_stock_info_ingestion():
-    df = ingest_stock_info()
-    return {"message": "Stock info ingestion triggered", "rows": len(df) if df is not None else 0}
 
-@router.post("/balance-sheet")
-def trigger_balance_sheet_ingestion():
-    df = ingest_balance_sheet()
-    return {"message": "Balance sheet ingestion triggered", "rows": len(df) if df is not None else 0}
+@router.post("/daily", status_code=202)
+def trigger_daily_prices(
+    incremental: bool = False,
+    snapshot: bool = False,
+    batched: bool = False,
+    symbols: Optional[List[str]] = Query(None),
+):
+    job = submit_job(
+        "daily_prices", ingest_daily_prices,
+        incremental=incremental, snapshot=snapshot, batched=batched, symbols=symbols
+    )
+    return _queued(job, "Daily prices ingestion queued")
 
-@router.post("/income-statement")
-def trigger_income_statement_ingestion():
-    df = ingest_income_statement()
-    return {"message": "Income statement ingestion triggered", "rows": len(df) if df is not None else 0}
+@router.post("/current", status_code=202)
+def trigger_current_prices(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("current_prices", ingest_current_prices, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Current prices ingestion queued")
 
-@router.post("/cash-flow")
-def trigger_cash_flow_ingestion():
-    df = ingest_cash_flow()
-    return {"message": "Cash flow ingestion triggered", "rows": len(df) if df is not None else 0}
+@router.post("/intraday", status_code=202)
+def trigger_intraday_prices(interval: str = "5m", symbols: Optional[List[str]] = Query(None)):
+    if interval not in settings.INTRADAY_RETENTION_DAYS:
+        raise HTTPException(status_code=400, detail=f"Unsupported intraday interval '{interval}'")
+    job = submit_job(f"intraday_{interval}", ingest_intraday_prices, interval=interval, symbols=symbols)
+    return _queued(job, f"{interval} intraday prices ingestion queued")
 
+@router.post("/intraday/retention", status_code=202)
+def trigger_intraday_retention():
+    """Rolls intraday bars past their retention up into daily bars and drops them."""
+    job = submit_job("intraday_retention", apply_intraday_retention)
+    return _queued(job, "Intraday retention queued")
 
+@router.post("/stock-info", status_code=202)
+def trigger_stock_info_ingestion(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("stock_info", ingest_stock_info, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Stock info ingestion queued")
 
+@router.post("/balance-sheet", status_code=202)
+def trigger_balance_sheet_ingestion(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("balance_sheet", ingest_balance_sheet, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Balance sheet ingestion queued")
 
+@router.post("/income-statement", status_code=202)
+def trigger_income_statement_ingestion(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("income_statement", ingest_income_statement, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Income statement ingestion queued")
 
-@router.post("/market-sentiment")
+@router.post("/cash-flow", status_code=202)
+def trigger_cash_flow_ingestion(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("cash_flow", ingest_cash_flow, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Cash flow ingestion queued")
+
+@router.post("/fundamentals", status_code=202)
+def trigger_fundamentals_refresh(force: bool = False, symbols: Optional[List[str]] = Query(None)):
+    """Refetches only the statements that are past their TTL or near a reporting date."""
+    job = submit_job("fundamentals", ingest_fundamentals, force=force, symbols=symbols)
+    return _queued(job, "Fundamentals refresh queued")
+
+
+@router.post("/all", status_code=202)
+def trigger_all_ingestion(snapshot: bool = False, symbols: Optional[List[str]] = Query(None)):
+    job = submit_job("all", ingest_all, snapshot=snapshot, symbols=symbols)
+    return _queued(job, "Full ingestion queued")
+
+
+@router.post("/shard/{shard_index}", status_code=202)
+def trigger_shard_ingestion(shard_index: int, shard_count: int):
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise HTTPException(status_code=400, detail=f"Invalid shard {shard_index} of {shard_count}.")
+    job = submit_job("shard", ingest_shard, shard_index=shard_index, shard_count=shard_count)
+    return _queued(job, f"Shard {shard_index} of {shard_count} ingestion queued")
+
+
+@router.post("/stream/{dataset}", status_code=202)
+def trigger_streaming_ingestion(
+    dataset: str,
+    chunk_rows: Optional[int] = None,
+    symbols: Optional[List[str]] = Query(None),
+):
+    if dataset not in DATASET_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+    job = submit_job(
+        f"stream_{dataset}", ingest_dataset_streaming,
+        dataset=dataset, chunk_rows=chunk_rows, symbols=symbols
+    )
+    return _queued(job, f"{dataset} streaming ingestion queued")
+
+
+@router.post("/distributed/{dataset}", status_code=202)
+def trigger_distributed_ingestion(dataset: str, symbols: Optional[List[str]] = Query(None)):
+    """Fans `dataset` (or `all`) out to Celery workers, one task per symbol."""
+    if dataset == "all":
+        results = dispatch_all(symbols)
+    elif dataset in DATASET_TABLES:
+        results = {dataset: dispatch_dataset(dataset, symbols)}
+    else:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+    return {
+        "message": f"{dataset} distributed ingestion queued",
+        "task_ids": {name: result.id for name, result in results.items()},
+    }
+
+@router.get("/distributed/tasks/{task_id}")
+def api_get_distributed_task(task_id: str):
+    result = celery_app.AsyncResult(task_id)
+    return {
+        "task_id": task_id,
+        "status": result.status,
+        "result": result.result if result.successful() else None,
+    }
+
+
+def _snapshot_directory(snapshot_name: str) -> Optional[str]:
+    """
+    The directory of snapshot `snapshot_name`, or None unless it is an existing
+    directory directly inside SNAPSHOT_DIR (rejects '.', '..', nested paths and
+    symlinks pointing elsewhere).
+    """
+    if snapshot_name in ("", ".", "..") or os.path.basename(snapshot_name) != snapshot_name:
+        return None
+    directory = os.path.realpath(os.path.join(settings.SNAPSHOT_DIR, snapshot_name))
+    if os.path.dirname(directory) != os.path.realpath(settings.SNAPSHOT_DIR) or not os.path.isdir(directory):
+        return None
+    return directory
+
+
+@router.post("/replay/{snapshot_name}", status_code=202)
+def trigger_snapshot_replay(snapshot_name: str, replace: bool = False):
+    """Loads the Parquet snapshot `SNAPSHOT_DIR/<snapshot_name>` into the database."""
+    directory = _snapshot_directory(snapshot_name)
+    if directory is None:
+        raise HTTPException(status_code=404, detail=f"Snapshot '{snapshot_name}' not found")
+    job = submit_job("replay", ingest_from_snapshot, directory=directory, snapshot=replace)
+    return _queued(job, f"Snapshot {snapshot_name} replay queued")
+
+
+@router.post("/rollback/{dataset}")
+def trigger_snapshot_rollback(dataset: str):
+    if dataset not in DATASET_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'")
+    try:
+        result = rollback_dataset(dataset)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": f"{dataset} rolled back to previous snapshot", **result}
+
+
+@router.post("/market-sentiment", status_code=202)
 def ingest_market_sentiment_endpoint():
-    ingest_market_sentiment()
-    return {"message": "Market sentiment ingested successfully"}
\ No newline at end of file
+    job = submit_job("market_sentiment", ingest_market_sentiment)
+    return _queued(job, "Market sentiment ingestion queued")
+
+
+# Job status APIs
+@router.get("/jobs")
+def api_list_jobs():
+    return [job.to_dict(include_symbols=False) for job in list_jobs()]
+
+@router.get("/jobs/{job_id}")
+def api_get_job(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Ingestion job '{job_id}' not found")
+    return job.to_dict()
+
+
+# Ingestion run ledger APIs
+@router.get("/runs")
+def api_list_runs(limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_read_db)):
+    return get_recent_runs(db, limit)
+
+@router.get("/runs/summary")
+def api_summarize_runs(
+    days: int = Query(7, ge=1),
+    stage: Optional[str] = "fetch",
+    by: str = "dataset",
+    dataset: Optional[str] = None,
+    limit: int = Query(50, ge=1),
+    db: Session = Depends(get_read_db),
+):
+    """p50/p95 step timings across runs; e.g. `?by=symbol&dataset=daily_prices` finds the slowest symbols."""
+    try:
+        return summarize_metrics(db, days=days, stage=stage, group_by=by, dataset=dataset, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/runs/{run_id}")
+def api_get_run_metrics(run_id: str, db: Session = Depends(get_read_db)):
+    metrics = get_run_metrics(db, run_id)
+    if not metrics:
+        raise HTTPException(status_code=404, detail=f"Ingestion run '{run_id}' not found")
+    return metrics
+
+
+@router.get("/scheduler")
+def api_get_price_scheduler():
+    """Current price scheduler state, including per-symbol refresh lag."""
+    return price_scheduler.status()
@@ -3,12 +3,12 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.schemas.market_sentiment import MarketSentimentSchema
 from app.repositories.get_market_sentiment import get_all_market_sentiments
-from app.db.config import get_db
+from app.db.config import get_read_db
 
 router = APIRouter(
     prefix="/market-sentiment",
     tags=["Market Sentiment"]
 )
 @router.get("/index", response_model=List[MarketSentimentSchema])
-def read_market_sentiments(db: Session = Depends(get_db)):
+def read_market_sentiments(db: Session = Depends(get_read_db)):
     return get_all_market_sentiments(db)
\ No newline at end of file
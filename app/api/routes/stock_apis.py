@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
-from datetime import date
+from datetime import date, datetime
 
 
-from app.db.config import get_db
-from app.repositories.helper import (
+from app.db.config import get_read_db, get_async_db
+from app.repositories.async_helper import (
     get_all_current_prices,
     get_current_price_by_symbol,
     get_daily_prices_by_symbol,
+    get_intraday_prices_by_symbol,
     get_all_stock_info,
     get_stock_info_by_symbol,
     get_all_balance_sheets,
@@ -27,6 +29,7 @@ from app.schemas.stock import (
     StockInfoResponse,
     CurrentPriceResponse,
     DailyPriceResponse,
+    IntradayPriceResponse,
     BalanceSheetResponse,
     IncomeStatementResponse,
     CashFlowResponse
@@ -41,7 +44,7 @@ router = APIRouter(prefix="/stocks", tags=["Stocks"])
 def get_stock_profile_metrics(
     symbol: str, 
     period_date: Optional[date] = Query(None, description="Specific date for financial statements (YYYY-MM-DD). Uses latest if not provided."),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Dict[str, Dict[str, Any]]:
     """
     Get comprehensive stock profile with all metrics organized by category.
@@ -95,10 +98,10 @@ def get_stock_profile_metrics(
 
 # Get Full stock data of the profile direct 
 @router.get("/stock_all/{symbol}")
-def get_stock_all(symbol: str, db: Session = Depends(get_db)):
+async def get_stock_all(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
         symbol = symbol.upper()
-        profile_data = get_stock_profile_by_symbol(db, symbol)
+        profile_data = await get_stock_profile_by_symbol(db, symbol)
         
         if not any(profile_data.values()):
             raise HTTPException(status_code=404, detail=f"No data found for symbol '{symbol}'")
@@ -117,17 +120,17 @@ def get_stock_all(symbol: str, db: Session = Depends(get_db)):
 
 # Current price APIs
 @router.get("/current-prices", response_model=List[CurrentPriceResponse])
-def api_get_current_prices(db: Session = Depends(get_db)):
+async def api_get_current_prices(db: AsyncSession = Depends(get_async_db)):
     try:
-        prices = get_all_current_prices(db)
+        prices = await get_all_current_prices(db)
         return prices
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch current prices: {str(e)}")
 
 @router.get("/current-prices/{symbol}", response_model=CurrentPriceResponse)
-def api_get_current_price(symbol: str, db: Session = Depends(get_db)):
+async def api_get_current_price(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        stock = get_current_price_by_symbol(db, symbol)
+        stock = await get_current_price_by_symbol(db, symbol)
         if not stock:
             raise HTTPException(status_code=404, detail=f"Current price for symbol '{symbol}' not found")
         return stock
@@ -136,27 +139,42 @@ def api_get_current_price(symbol: str, db: Session = Depends(get_db)):
 
 # Daily Price APIs (Returns 1yr data of Specific Stock)
 @router.get("/daily-prices/{symbol}", response_model=List[DailyPriceResponse])
-def api_get_daily_prices(symbol: str, db: Session = Depends(get_db)):
+async def api_get_daily_prices(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_daily_prices_by_symbol(db, symbol)
+        records = await get_daily_prices_by_symbol(db, symbol)
         if not records:
             raise HTTPException(status_code=404, detail=f"No daily price data found for symbol '{symbol}'")
         return records
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch daily prices for '{symbol}': {str(e)}")
 
+# Intraday Price APIs (latest bars first)
+@router.get("/intraday-prices/{symbol}", response_model=List[IntradayPriceResponse])
+async def api_get_intraday_prices(
+    symbol: str,
+    interval: str = "5m",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = Query(500, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+):
+    records = await get_intraday_prices_by_symbol(db, symbol, interval, start, end, limit)
+    if not records:
+        raise HTTPException(status_code=404, detail=f"No {interval} intraday data found for symbol '{symbol}'")
+    return records
+
 @router.get("/stock-info", response_model=List[StockInfoResponse])
-def api_get_stock_info_list(db: Session = Depends(get_db)):
+async def api_get_stock_info_list(db: AsyncSession = Depends(get_async_db)):
     try:
-        stocks = get_all_stock_info(db)
+        stocks = await get_all_stock_info(db)
         return stocks
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch stock info list: {str(e)}")
 
 @router.get("/stock-info/{symbol}", response_model=StockInfoResponse)
-def api_get_stock_info(symbol: str, db: Session = Depends(get_db)):
+async def api_get_stock_info(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        stock = get_stock_info_by_symbol(db, symbol)
+        stock = await get_stock_info_by_symbol(db, symbol)
         if not stock:
             raise HTTPException(status_code=404, detail=f"Stock info for symbol '{symbol}' not found")
         return stock
@@ -165,17 +183,17 @@ def api_get_stock_info(symbol: str, db: Session = Depends(get_db)):
 
 # BalanceSheet APIs
 @router.get("/balance-sheet", response_model=List[BalanceSheetResponse])
-def api_get_balance_sheets(db: Session = Depends(get_db)):
+async def api_get_balance_sheets(db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_all_balance_sheets(db)
+        records = await get_all_balance_sheets(db)
         return records
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch balance sheet data: {str(e)}")
 
 @router.get("/balance-sheet/{symbol}", response_model=List[BalanceSheetResponse])
-def api_get_balance_sheet(symbol: str, db: Session = Depends(get_db)):
+async def api_get_balance_sheet(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_balance_sheets_by_symbol(db, symbol)
+        records = await get_balance_sheets_by_symbol(db, symbol)
         if not records:
             raise HTTPException(status_code=404, detail=f"No balance sheet data found for symbol '{symbol}'")
         return records
@@ -184,17 +202,17 @@ def api_get_balance_sheet(symbol: str, db: Session = Depends(get_db)):
 
 # IncomeStatement APIs
 @router.get("/income-statement", response_model=List[IncomeStatementResponse])
-def api_get_income_statements(db: Session = Depends(get_db)):
+async def api_get_income_statements(db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_all_income_statements(db)
+        records = await get_all_income_statements(db)
         return records
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch income statement data: {str(e)}")
 
 @router.get("/income-statement/{symbol}", response_model=List[IncomeStatementResponse])
-def api_get_income_statement(symbol: str, db: Session = Depends(get_db)):
+async def api_get_income_statement(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_income_statements_by_symbol(db, symbol)
+        records = await get_income_statements_by_symbol(db, symbol)
         if not records:
             raise HTTPException(status_code=404, detail=f"No income statement data found for symbol '{symbol}'")
         return records
@@ -203,17 +221,17 @@ def api_get_income_statement(symbol: str, db: Session = Depends(get_db)):
 
 # CashFlow APIs
 @router.get("/cash-flow", response_model=List[CashFlowResponse])
-def api_get_cash_flows(db: Session = Depends(get_db)):
+async def api_get_cash_flows(db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_all_cash_flows(db)
+        records = await get_all_cash_flows(db)
         return records
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch cash flow data: {str(e)}")
 
 @router.get("/cash-flow/{symbol}", response_model=List[CashFlowResponse])
-def api_get_cash_flow(symbol: str, db: Session = Depends(get_db)):
+async def api_get_cash_flow(symbol: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        records = get_cash_flows_by_symbol(db, symbol)
+        records = await get_cash_flows_by_symbol(db, symbol)
         if not records:
             raise HTTPException(status_code=404, detail=f"No cash flow data found for symbol '{symbol}'")
         return records
@@ -1,23 +1,33 @@
-# # app/celery_app.py
+# app/core/celery_app.py
 
-# from celery import Celery
-# from celery.schedules import crontab
-# from app.core.config import settings
+from celery import Celery
+from kombu import Queue
+from app.core.config import settings
 
-# celery_app = Celery(
-#     "worker",
-#     broker=settings.CELERY_BROKER_URL,
-#     backend=settings.CELERY_RESULT_BACKEND
-# )
+# Queues: quick quote refreshes must not wait behind heavy fundamentals fetches.
+QUOTES_QUEUE = "quotes"
+FUNDAMENTALS_QUEUE = "fundamentals"
+INGESTION_QUEUE = "ingestion"
 
-# celery_app.autodiscover_tasks(['app.tasks'])
+celery_app = Celery(
+    "worker",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.distributed"],
+)
 
-# # Configure periodic task
-# celery_app.conf.beat_schedule = {
-#     'run-every-5-mins': {
-#         'task': 'app.tasks.scheduled.periodic_task',
-#         'schedule': crontab(minute='*/5'),
-#     },
-# }
-
-# celery_app.conf.timezone = 'UTC'
+celery_app.conf.update(
+    task_queues=(
+        Queue(QUOTES_QUEUE),
+        Queue(FUNDAMENTALS_QUEUE),
+        Queue(INGESTION_QUEUE),
+    ),
+    task_default_queue=INGESTION_QUEUE,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_acks_late=True,  # a crashed worker's symbol is redelivered, not lost
+    worker_prefetch_multiplier=1,  # per-symbol tasks are long; don't hoard them
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+)
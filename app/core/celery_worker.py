@@ -1,3 +1,6 @@
-# app/celery_worker.py
+# app/core/celery_worker.py
+# Run with e.g.:
+#   celery -A app.core.celery_worker worker -Q quotes -c 8
+#   celery -A app.core.celery_worker worker -Q fundamentals,ingestion -c 4
 
-# from app.celery_app import celery_app
+from app.core.celery_app import celery_app  # noqa: F401
@@ -0,0 +1,64 @@
+# app/core/change_feed.py
+"""
+Publishes which symbols' data changed after an ingestion write.
+
+In-process subscribers (e.g. caches or precomputed metrics) are called
+directly. When CHANGE_FEED_REDIS_URL is set the event is also published as JSON
+on the CHANGE_FEED_CHANNEL Redis channel, so other processes (API workers,
+Celery workers) can invalidate only the affected symbols.
+"""
+import json
+import threading
+from datetime import datetime
+from typing import Callable, List
+
+from app.core.config import settings
+
+Subscriber = Callable[[str, List[str]], None]
+
+_subscribers: List[Subscriber] = []
+_lock = threading.Lock()
+_redis = None
+
+
+def subscribe(callback: Subscriber):
+    """Registers `callback(dataset, symbols)` to be called for every published change."""
+    with _lock:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Subscriber):
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def _redis_client():
+    global _redis
+    if _redis is None and settings.CHANGE_FEED_REDIS_URL:
+        import redis
+        _redis = redis.Redis.from_url(settings.CHANGE_FEED_REDIS_URL)
+    return _redis
+
+
+def publish(dataset: str, symbols: List[str]):
+    """Announces that `dataset` rows of `symbols` changed. Subscriber and Redis errors are logged, not raised."""
+    if not symbols:
+        return
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(dataset, symbols)
+        except Exception as e:
+            print(f"Change feed subscriber failed for {dataset}: {e}")
+    try:
+        client = _redis_client()
+        if client is not None:
+            client.publish(settings.CHANGE_FEED_CHANNEL, json.dumps({
+                "dataset": dataset,
+                "symbols": symbols,
+                "published_at": datetime.utcnow().isoformat(),
+            }))
+    except Exception as e:
+        print(f"Could not publish {dataset} changes to Redis: {e}")
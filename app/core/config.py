@@ -1,6 +1,6 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 from functools import lru_cache
 
 
@@ -25,10 +25,73 @@ class Settings(BaseSettings):
 
 
     DATABASE_URL: Optional[str] = None
+    DATABASE_READ_URL: Optional[str] = None  # read replica for GET routes and agents; defaults to DATABASE_URL
+
+    # Connection pools (one per engine: writes, reads and async reads each get their own)
+    DB_POOL_SIZE: int = 5  # connections kept open
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 = never
+    DB_POOL_PRE_PING: bool = True  # test each connection on checkout (one extra round trip)
+
+    # EXPLAIN check of the hot read queries (app/db/query_plans.py)
+    QUERY_PLAN_CHECK_ON_STARTUP: bool = True
+    QUERY_PLAN_SEQ_SCAN_ROWS: int = 10_000_000  # flag sequential scans on tables at least this large
+
+    # Ingestion
+    INGEST_MAX_WORKERS: int = 8  # concurrent per-symbol fetches; 1 = serial
+    INGEST_SYMBOL_TIMEOUT: float = 30.0  # seconds to wait on a single symbol
+    INGEST_DOWNLOAD_BATCH_SIZE: int = 100  # tickers per yf.download call
+    INGEST_CHUNK_ROWS: int = 5000  # rows per commit in streaming ingestion
+    INGEST_JOB_CONCURRENCY: int = 2  # background ingestion jobs running at once
+    INGEST_JOB_HISTORY: int = 100  # finished jobs kept for status lookups
+    INTRADAY_RETENTION_DAYS: Dict[str, int] = {"1m": 7, "5m": 60}  # older bars are rolled up into daily bars
+    SNAPSHOT_DIR: str = "data/snapshots"  # Parquet snapshots written by app/tasks/csvv.py
+    SNAPSHOT_SWAP_LOCK_TIMEOUT_MS: int = 2000  # max wait for the table lock of a snapshot swap, per attempt
+    SNAPSHOT_SWAP_RETRIES: int = 5  # retries of a swap that timed out waiting for its lock
+    SNAPSHOT_SWAP_BACKOFF_BASE: float = 0.5  # seconds before the first retry, doubled per retry
+    SNAPSHOT_SWAP_BACKOFF_MAX: float = 5.0  # seconds
     
 
-    # CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
-    # CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
+    # Provider rate limits (requests per second) and retry policy
+    RATE_LIMIT_YFINANCE_PER_SEC: float = 2.0
+    RATE_LIMIT_NEWSAPI_PER_SEC: float = 1.0
+    RATE_LIMIT_FINNHUB_PER_SEC: float = 1.0  # free tier: 60/min
+    RATE_LIMIT_ALPHA_VANTAGE_PER_SEC: float = 0.08  # free tier: 5/min
+    RATE_LIMIT_REPLAY_PER_SEC: float = 1000.0  # recorded responses (DATA_PROVIDER=replay)
+    RATE_LIMIT_MAX_RETRIES: int = 4
+    RATE_LIMIT_BACKOFF_BASE: float = 1.0  # seconds
+    RATE_LIMIT_BACKOFF_MAX: float = 30.0  # seconds
+
+    # Market data provider: live, record (live + save responses) or replay (saved responses only)
+    DATA_PROVIDER: str = "live"
+    PROVIDER_RECORDINGS_DIR: str = "data/recordings"
+    REPLAY_LATENCY_SECONDS: float = 0.0  # artificial latency per replayed request
+    REPLAY_LATENCY_JITTER: float = 0.0  # +/- uniform jitter around it
+    REPLAY_SEED: Optional[int] = 0
+
+    # Celery (use "memory://" and "cache+memory://" to run without Redis, e.g. in tests)
+    CELERY_BROKER_URL: str = "redis://redis:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://redis:6379/0"
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+
+    # Changed-symbol notifications after ingestion writes (unset = in-process subscribers only)
+    CHANGE_FEED_REDIS_URL: Optional[str] = None
+    CHANGE_FEED_CHANNEL: str = "ingestion:changes"
+
+    # Fundamentals refresh planner
+    FUNDAMENTALS_TTL_DAYS: int = 45  # refetch a statement at least this often
+    FUNDAMENTALS_PERIOD_DAYS: int = 365  # spacing of statement periods (annual)
+    FUNDAMENTALS_REPORTING_LAG_DAYS: int = 60  # results are published this long after period end
+    FUNDAMENTALS_REPORTING_WINDOW_DAYS: int = 30  # start checking this long before the expected date
+    FUNDAMENTALS_RECHECK_DAYS: int = 3  # refetch interval inside the reporting window
+
+    # Current price scheduler (NSE trading hours, Asia/Kolkata)
+    PRICE_SCHEDULER_ENABLED: bool = False  # on PostgreSQL one process refreshes; the rest stand by
+    PRICE_REFRESH_OPEN_SECONDS: float = 60.0  # refresh interval while the market is open
+    PRICE_REFRESH_CLOSED_SECONDS: float = 3600.0  # refresh interval while it is closed
+    PRICE_REFRESH_MAX_SKIP: int = 8  # max consecutive refreshes an unchanged quote is skipped
+    NSE_HOLIDAYS: List[str] = []  # must be configured from NSE's yearly holiday circular, as YYYY-MM-DD, e.g. '["2026-10-20"]'
     
     
     class Config:
@@ -0,0 +1,48 @@
+# app/core/market_calendar.py
+"""
+NSE trading calendar: regular session 09:15-15:30 IST, Monday to Friday,
+excluding the exchange holidays listed in `settings.NSE_HOLIDAYS`.
+
+The holiday list is not shipped: NSE publishes it each December, and it must be
+configured (e.g. NSE_HOLIDAYS='["2026-10-20", ...]' in .env) or holidays are
+treated as trading days.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_OPEN = time(9, 15)
+MARKET_CLOSE = time(15, 30)
+
+
+def _now_ist(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(IST)).astimezone(IST)
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day.isoformat() not in settings.NSE_HOLIDAYS
+
+
+def has_holidays_for(year: int) -> bool:
+    """True if NSE_HOLIDAYS lists at least one date in `year`."""
+    return any(day.startswith(f"{year}-") for day in settings.NSE_HOLIDAYS)
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """True during the regular NSE session."""
+    now = _now_ist(now)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """Start of the next regular session after `now` (or of the current one if it has not started yet)."""
+    now = _now_ist(now)
+    day = now.date()
+    if now.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=IST)
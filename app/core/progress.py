@@ -0,0 +1,93 @@
+# app/core/progress.py
+"""
+Ingestion progress hooks.
+
+Fetch and write code reports per-symbol results, transform and write timings
+here; whoever runs the ingestion (e.g. a background job) installs a listener
+for the current context to receive them. With no listener installed the calls
+are no-ops.
+
+Provider functions that swallow their own exceptions (and return None) call
+`fetch_error` so the error class still reaches the listener; it is kept per
+thread and collected by `timed_fetch` in the same worker thread.
+"""
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Optional, Tuple
+
+_listener: ContextVar[Optional[Any]] = ContextVar("ingestion_progress_listener", default=None)
+_fetch_errors = threading.local()
+
+
+def set_listener(listener: Any) -> Token:
+    """
+    Installs `listener` for the current context. It must provide
+    `on_symbol`, `on_transform` and `on_rows_written` (see IngestionJob).
+    """
+    return _listener.set(listener)
+
+
+def reset_listener(token: Token):
+    _listener.reset(token)
+
+
+def _result_rows(result: Any) -> int:
+    """Row count of a fetch result: a DataFrame, a dict of DataFrames (symbol bundle) or None."""
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        return sum(_result_rows(value) for value in result.values())
+    return len(result)
+
+
+def _result_bytes(result: Any) -> int:
+    """In-memory size of a fetch result, same shapes as `_result_rows`."""
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        return sum(_result_bytes(value) for value in result.values())
+    return int(result.memory_usage(index=True, deep=True).sum())
+
+
+def fetch_error(exc: BaseException):
+    """Records the class of an error a fetcher handled itself, for the current thread's fetch."""
+    _fetch_errors.value = type(exc).__name__
+
+
+def timed_fetch(fetcher: Callable[[str], Any], symbol: str) -> Tuple[Any, float, Optional[str]]:
+    """Runs `fetcher(symbol)` and returns its result, duration and the class of any error it recorded."""
+    _fetch_errors.value = None
+    started = time.perf_counter()
+    result = fetcher(symbol)
+    error_class, _fetch_errors.value = _fetch_errors.value, None
+    return result, time.perf_counter() - started, error_class
+
+
+def symbol_fetched(
+    label: str,
+    symbol: str,
+    result: Any = None,
+    error: Optional[str] = None,
+    seconds: Optional[float] = None,
+    error_class: Optional[str] = None,
+):
+    listener = _listener.get()
+    if listener is not None:
+        listener.on_symbol(
+            label, symbol, _result_rows(result), error,
+            seconds=seconds, nbytes=_result_bytes(result), error_class=error_class,
+        )
+
+
+def transformed(label: str, seconds: float, result: Any = None):
+    listener = _listener.get()
+    if listener is not None:
+        listener.on_transform(label, seconds, _result_rows(result), _result_bytes(result))
+
+
+def rows_written(label: str, count: int, seconds: Optional[float] = None, frame: Any = None):
+    """Reports `count` rows written for `label`; `frame` is the DataFrame that was written, for its size."""
+    listener = _listener.get()
+    if listener is not None:
+        listener.on_rows_written(label, count, seconds=seconds, nbytes=_result_bytes(frame))
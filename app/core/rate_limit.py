@@ -0,0 +1,240 @@
+# app/core/rate_limit.py
+"""
+Shared, adaptive rate limiting and retry for external data providers.
+
+Each provider (yfinance, NewsAPI, Finnhub, Alpha Vantage) has one token bucket
+shared by every thread in the process. A throttling response halves the
+provider's rate and pauses it for the Retry-After period; successful calls
+restore the rate gradually (AIMD). Failed calls are retried with jittered
+exponential backoff.
+
+A fetch that runs under a `FetchContext` (see `run_in_context`) can be
+cancelled: its token waits and backoff sleeps end early, and it makes no
+further provider calls. The context also records how long the fetch spent
+waiting, so callers can time out on provider work alone.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from app.core.config import settings
+
+# Status codes worth retrying; 429 also slows the provider down.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# A throttled provider never drops below this fraction of its configured rate.
+MIN_RATE_FRACTION = 0.1
+
+
+class FetchCancelled(Exception):
+    """Raised inside a fetch whose FetchContext was cancelled."""
+
+
+class FetchContext:
+    """Cancellation flag and rate-limit wait accounting for one fetch on a worker thread."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.waited = 0.0
+        self._wait_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def work_seconds(self) -> float:
+        """Seconds since the fetch started, excluding time spent in token waits and backoff."""
+        with self._lock:
+            if self.started is None:
+                return 0.0
+            now = self.finished if self.finished is not None else time.monotonic()
+            waiting = now - self._wait_started if self._wait_started is not None else 0.0
+            return now - self.started - self.waited - waiting
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self._wait_started = time.monotonic()
+        try:
+            cancelled = self.cancelled.wait(seconds)
+        finally:
+            with self._lock:
+                self.waited += time.monotonic() - self._wait_started
+                self._wait_started = None
+        if cancelled:
+            raise FetchCancelled()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise FetchCancelled()
+
+
+_context = threading.local()
+
+
+def run_in_context(context: FetchContext, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs `func` on the current thread with `context` as its FetchContext."""
+    context.started = time.monotonic()
+    _context.value = context
+    try:
+        return func(*args, **kwargs)
+    finally:
+        context.finished = time.monotonic()
+        _context.value = None
+
+
+def _current_context() -> Optional[FetchContext]:
+    return getattr(_context, "value", None)
+
+
+def _sleep(seconds: float):
+    """time.sleep, or a cancellable, accounted wait inside a FetchContext."""
+    context = _current_context()
+    if context is None:
+        time.sleep(seconds)
+    else:
+        context.sleep(seconds)
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to throttling (AIMD)."""
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        self.base_rate = rate_per_sec
+        self.rate = rate_per_sec
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_sec)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            _sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Halves the rate and, if given, pauses every caller for `retry_after` seconds."""
+        with self._lock:
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def recover(self):
+        """Additively restores the rate after a successful call."""
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * MIN_RATE_FRACTION)
+
+
+def _provider_rates() -> Dict[str, float]:
+    return {
+        "yfinance": settings.RATE_LIMIT_YFINANCE_PER_SEC,
+        "newsapi": settings.RATE_LIMIT_NEWSAPI_PER_SEC,
+        "finnhub": settings.RATE_LIMIT_FINNHUB_PER_SEC,
+        "alpha_vantage": settings.RATE_LIMIT_ALPHA_VANTAGE_PER_SEC,
+        "replay": settings.RATE_LIMIT_REPLAY_PER_SEC,
+    }
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> TokenBucket:
+    """Returns the process-wide bucket for `provider`."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = TokenBucket(_provider_rates()[provider])
+        return _limiters[provider]
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), if the error carries one."""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _is_throttled(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    if response is not None and getattr(response, "status_code", None) == 429:
+        return True
+    # yfinance raises YFRateLimitError (or a plain error mentioning it) on 429
+    return type(exc).__name__ == "YFRateLimitError" or "Too Many Requests" in str(exc)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if _is_throttled(exc):
+        return True
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(exc, "response", None)
+    return response is not None and getattr(response, "status_code", None) in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    cap = min(settings.RATE_LIMIT_BACKOFF_MAX, settings.RATE_LIMIT_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def call_with_retry(provider: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Calls `func(*args, **kwargs)` under `provider`'s rate limit, retrying throttling,
+    timeout and 5xx errors up to RATE_LIMIT_MAX_RETRIES times. Other errors, and the
+    last retryable one, are raised to the caller. Raises FetchCancelled, without
+    calling the provider again, once the current FetchContext is cancelled.
+    """
+    limiter = get_limiter(provider)
+    context = _current_context()
+    attempt = 0
+    while True:
+        if context is not None:
+            context.check()
+        limiter.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if not _is_retryable(e) or attempt >= settings.RATE_LIMIT_MAX_RETRIES:
+                raise
+            retry_after = _retry_after(e)
+            if _is_throttled(e):
+                limiter.throttle(retry_after)
+            delay = max(retry_after or 0.0, backoff_delay(attempt))
+            print(f"  {provider} request failed ({e}); retry {attempt + 1} in {delay:.1f}s.")
+            _sleep(delay)
+            attempt += 1
+            continue
+        limiter.recover()
+        return result
+
+
+def rate_limited_get(provider: str, url: str, timeout: float = 10, **kwargs) -> requests.Response:
+    """`requests.get` + `raise_for_status` under `provider`'s rate limit and retry policy."""
+    def _get():
+        response = requests.get(url, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response
+    return call_with_retry(provider, _get)
@@ -1,13 +1,43 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from sqlalchemy.ext.declarative import declarative_base
 
 
 DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# GET routes and agents read from here (a replica, if configured) through their own pool,
+# so ingestion writes never wait on API reads for a connection.
+DATABASE_READ_URL = settings.DATABASE_READ_URL or DATABASE_URL
+
+
+def engine_options(url: str, read_only: bool = False, async_driver: bool = False) -> dict:
+    """create_engine keyword arguments for `url` from the DB_POOL_* settings."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    backend = make_url(url).get_backend_name()
+    if backend != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if read_only and backend == "postgresql":
+        # Every transaction on a read connection is READ ONLY, even against the primary
+        if async_driver:
+            options["connect_args"] = {"server_settings": {"default_transaction_read_only": "on"}}
+        else:
+            options["connect_args"] = {"options": "-c default_transaction_read_only=on"}
+    return options
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+read_engine = create_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL, read_only=True))
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,5 +48,36 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Session on the read-only engine, for GET routes and agents."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async drivers for the same databases: asyncpg for PostgreSQL, aiosqlite for SQLite.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the dialect's async driver (e.g. postgresql+asyncpg)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{parsed.get_backend_name()}' databases.")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
 
+
+# Async sessions only serve read routes, so they use the read URL and are read-only too
+async_engine = create_async_engine(
+    async_database_url(DATABASE_READ_URL),
+    **engine_options(DATABASE_READ_URL, read_only=True, async_driver=True),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
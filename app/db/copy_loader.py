@@ -0,0 +1,110 @@
+import io
+import uuid
+import pandas as pd
+from sqlalchemy import BigInteger, Date, Integer
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert_records
+
+
+def _to_copy_frame(table, df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Coerces `df` so every value serialises to text PostgreSQL can COPY into `table`."""
+    out = df[columns].copy()
+    for name in columns:
+        col_type = table.c[name].type
+        if isinstance(col_type, Date):
+            # yfinance dates are tz-aware timestamps; COPY only needs the calendar date
+            out[name] = pd.to_datetime(out[name]).dt.strftime("%Y-%m-%d")
+        elif isinstance(col_type, (Integer, BigInteger)):
+            # Float columns with NaN would be written as "123.0", which integer columns reject
+            out[name] = pd.to_numeric(out[name], errors="coerce").round().astype("Int64")
+    return out
+
+
+def supports_copy(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+
+def _copy_frame(cursor, quote, table, df: pd.DataFrame, columns, dest: str):
+    """Streams `df[columns]` as CSV into the (already quoted) table name `dest`."""
+    buffer = io.StringIO()
+    _to_copy_frame(table, df, columns).to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    col_list = ", ".join(quote(name) for name in columns)
+    cursor.copy_expert(f"COPY {dest} ({col_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def copy_into_table(db: Session, model, df: pd.DataFrame, table_name: str) -> int:
+    """
+    COPYs `df` into `table_name`, a PostgreSQL table laid out like `model`'s table.
+    Plain append with no conflict handling. Does not commit. Returns rows loaded.
+    """
+    if df is None or df.empty:
+        return 0
+    table = model.__table__
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    columns = [name for name in df.columns if name in table.c]
+    cursor = db.connection().connection.cursor()
+    try:
+        _copy_frame(cursor, quote, table, df, columns, quote(table_name))
+    finally:
+        cursor.close()
+    return len(df)
+
+
+def copy_upsert_dataframe(db: Session, model, df: pd.DataFrame) -> int:
+    """
+    Bulk loads `df` into `model`'s table and returns the number of rows inserted or updated.
+
+    On PostgreSQL the frame is streamed as CSV into a temporary staging table
+    with COPY FROM STDIN, then merged with a single INSERT ... SELECT ... ON CONFLICT
+    that only rewrites rows whose values changed. Other dialects fall back to
+    `upsert_records`. NaN values are loaded as NULL. Does not commit.
+    """
+    if df is None or df.empty:
+        return 0
+
+    if not supports_copy(db):
+        return upsert_records(db, model, df.to_dict(orient="records"))
+
+    table = model.__table__
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    columns = [name for name in df.columns if name in table.c]
+    pk_cols = [col.name for col in table.primary_key.columns]
+    update_cols = [name for name in columns if name not in pk_cols]
+
+    target = quote(table.name)
+    staging = quote(f"_stage_{table.name}_{uuid.uuid4().hex[:8]}")
+    col_list = ", ".join(quote(name) for name in columns)
+    pk_list = ", ".join(quote(name) for name in pk_cols)
+
+    # ON CONFLICT cannot touch the same row twice within one statement
+    df = df.drop_duplicates(subset=pk_cols, keep="last")
+
+    if update_cols:
+        assignments = ", ".join(f"{quote(name)} = EXCLUDED.{quote(name)}" for name in update_cols)
+        current = ", ".join(f"{target}.{quote(name)}" for name in update_cols)
+        incoming = ", ".join(f"EXCLUDED.{quote(name)}" for name in update_cols)
+        conflict = (
+            f"DO UPDATE SET {assignments} "
+            f"WHERE ROW({current}) IS DISTINCT FROM ROW({incoming})"
+        )
+    else:
+        conflict = "DO NOTHING"
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        _copy_frame(cursor, quote, table, df, columns, staging)
+        cursor.execute(
+            f"INSERT INTO {target} ({col_list}) SELECT {col_list} FROM {staging} "
+            f"ON CONFLICT ({pk_list}) {conflict}"
+        )
+        written = cursor.rowcount
+        cursor.execute(f"DROP TABLE {staging}")
+    finally:
+        cursor.close()
+    return written
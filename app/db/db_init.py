@@ -1,5 +1,59 @@
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
 from app.db.config import engine, Base
 from app.models import stock  
+from app.models import ingestion
+
+def _index_columns(index) -> tuple:
+    return tuple(getattr(expression, "element", expression).name for expression in index.expressions)
+
+
+# duplicate_table, or unique_violation on pg_class when another worker creates the same index at once
+_DUPLICATE_INDEX_CODES = ("42P07", "23505")
+
+
+def _create_index(index):
+    """
+    CREATE INDEX IF NOT EXISTS, so workers starting together do not fail on each
+    other's index. On PostgreSQL it is built CONCURRENTLY, leaving the table writable,
+    which needs an autocommit connection.
+    """
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+    if engine.dialect.name != "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql(ddl)
+        return
+    ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            conn.exec_driver_sql(ddl)
+        except DBAPIError as e:
+            code = getattr(e.orig, "pgcode", None) or getattr(e.orig, "sqlstate", None)
+            if code not in _DUPLICATE_INDEX_CODES:
+                raise
+            print(f"Index {index.name} was created by another worker.")
+
+
+def ensure_indexes():
+    """
+    Creates model indexes missing from tables that already exist; create_all only
+    indexes new tables. An index on the same columns under another name counts
+    as present, since snapshot swaps copy indexes with generated names.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not table.indexes or not inspector.has_table(table.name):
+            continue
+        existing = inspector.get_indexes(table.name)
+        names = {ix["name"] for ix in existing}
+        columns = {tuple(ix["column_names"]) for ix in existing}
+        for index in table.indexes:
+            if index.name not in names and _index_columns(index) not in columns:
+                print(f"Creating index {index.name} on {table.name}")
+                _create_index(index)
+
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    ensure_indexes()
@@ -0,0 +1,80 @@
+# app/db/partitions.py
+"""
+Partition management for `intraday_prices` (PostgreSQL only).
+
+The parent table is LIST-partitioned by interval; each interval partition
+(e.g. intraday_prices_1m) is RANGE-partitioned by bar time into one partition
+per IST trading day (e.g. intraday_prices_1m_p20261016). Rows can only be
+written once their day's partition exists, so writers call
+`ensure_intraday_partitions` first. On other dialects the table is a plain
+table and these functions do nothing.
+"""
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.market_calendar import IST
+from app.models.stock import IntradayPrice
+
+PARENT = IntradayPrice.__tablename__
+_DAY_SUFFIX = re.compile(r"_p(\d{8})$")
+
+
+def is_partitioned(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _interval_table(interval: str) -> str:
+    return f"{PARENT}_{interval}"
+
+
+def _day_table(interval: str, day: date) -> str:
+    return f"{_interval_table(interval)}_p{day:%Y%m%d}"
+
+
+def ensure_intraday_partitions(db: Session, interval: str, days: Iterable[date]):
+    """Creates the interval partition and one partition per day in `days`, if missing. Does not commit."""
+    if not is_partitioned(db):
+        return
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    interval_table = _interval_table(interval)
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {quote(interval_table)} PARTITION OF {quote(PARENT)} "
+        f"FOR VALUES IN ('{interval}') PARTITION BY RANGE (\"Datetime\")"
+    ))
+    for day in sorted(set(days)):
+        start = datetime.combine(day, time.min, tzinfo=IST)
+        end = start + timedelta(days=1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {quote(_day_table(interval, day))} "
+            f"PARTITION OF {quote(interval_table)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+
+def intraday_partition_days(db: Session, interval: str) -> List[date]:
+    """Trading days that have a partition for `interval`, oldest first."""
+    if not is_partitioned(db):
+        return []
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": _interval_table(interval)})
+    days = []
+    for (name,) in rows:
+        match = _DAY_SUFFIX.search(name)
+        if match:
+            days.append(datetime.strptime(match.group(1), "%Y%m%d").date())
+    return sorted(days)
+
+
+def drop_intraday_partition(db: Session, interval: str, day: date):
+    """Drops one day of `interval` bars in constant time. Does not commit."""
+    if not is_partitioned(db):
+        return
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    db.execute(text(f"DROP TABLE IF EXISTS {quote(_day_table(interval, day))}"))
@@ -0,0 +1,114 @@
+# app/db/query_plans.py
+"""
+EXPLAIN check for the hot read queries (PostgreSQL only).
+
+Each query in `hot_queries` is planned with `EXPLAIN (FORMAT JSON)`, without
+running it, and every sequential scan in the plan is reported with the planner's
+row estimate for its table. A sequential scan is flagged once that table has at
+least QUERY_PLAN_SEQ_SCAN_ROWS rows; below that the planner may rightly prefer
+one. The app runs the check at startup (QUERY_PLAN_CHECK_ON_STARTUP), and
+
+    python -m app.db.query_plans [--symbol RELIANCE.NS] [--min-rows 0] [--verbose]
+
+runs it by hand, exiting with status 1 if anything was flagged.
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import distinct_on
+
+from app.core.config import settings
+from app.db.config import read_engine
+from app.models.stock import DailyPrice, BalanceSheet, IncomeStatement, CashFlow
+from app.repositories.helper import PROFILE_DAILY_PRICES, stock_profile_query
+
+STATEMENT_MODELS = (BalanceSheet, IncomeStatement, CashFlow)
+
+
+def hot_queries(symbol: str) -> Dict[str, Any]:
+    """The read queries behind the stock APIs, agents and batch getters, for `symbol`."""
+    symbols = [symbol]
+    ranked = select(
+        DailyPrice,
+        func.row_number().over(partition_by=DailyPrice.symbol, order_by=DailyPrice.Date.desc()).label("rn"),
+    ).where(DailyPrice.symbol.in_(symbols)).subquery()
+
+    queries = {
+        "stock profile": stock_profile_query().bindparams(symbol=symbol, daily_limit=PROFILE_DAILY_PRICES),
+        "daily prices by symbol": select(DailyPrice)
+            .where(DailyPrice.symbol == symbol)
+            .order_by(DailyPrice.Date.desc())
+            .limit(PROFILE_DAILY_PRICES),
+        "daily prices by symbols": select(ranked).where(ranked.c.rn <= PROFILE_DAILY_PRICES),
+    }
+    for model in STATEMENT_MODELS:
+        table = model.__tablename__
+        queries[f"latest {table} by symbol"] = select(model) \
+            .where(model.symbol == symbol).order_by(model.Date.desc()).limit(1)
+        queries[f"latest {table} by symbols"] = select(model).ext(distinct_on(model.symbol)) \
+            .where(model.symbol.in_(symbols)).order_by(model.symbol, model.Date.desc())
+    return queries
+
+
+def _plan_nodes(plan: Dict[str, Any]):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _table_rows(conn, tables: List[str]) -> Dict[str, int]:
+    """Planner row estimates from pg_class (current after ANALYZE/autovacuum)."""
+    if not tables:
+        return {}
+    rows = conn.execute(
+        text("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(:tables)"), {"tables": tables}
+    )
+    return {name: max(int(reltuples), 0) for name, reltuples in rows}
+
+
+def check_query_plans(symbol: str = "RELIANCE.NS", min_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Plans every hot query and returns one entry per query with its top plan node,
+    its sequential scans and whether any of them is flagged. Prints flagged ones.
+    """
+    if read_engine.dialect.name != "postgresql":
+        print("Query plan check skipped: it requires PostgreSQL.")
+        return []
+    min_rows = settings.QUERY_PLAN_SEQ_SCAN_ROWS if min_rows is None else min_rows
+
+    results = []
+    with read_engine.connect() as conn:
+        for name, query in hot_queries(symbol).items():
+            sql = query.compile(dialect=read_engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+            scans = [node["Relation Name"] for node in _plan_nodes(plan) if node["Node Type"] == "Seq Scan"]
+            table_rows = _table_rows(conn, scans)
+            seq_scans = [{"table": table, "rows": table_rows.get(table, 0)} for table in scans]
+            flagged = [scan for scan in seq_scans if scan["rows"] >= min_rows]
+            for scan in flagged:
+                print(f"Query plan warning: '{name}' scans {scan['table']} sequentially (~{scan['rows']:,} rows)")
+            results.append({
+                "query": name,
+                "plan": plan["Node Type"],
+                "total_cost": plan["Total Cost"],
+                "seq_scans": seq_scans,
+                "flagged": bool(flagged),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot read queries and flag sequential scans.")
+    parser.add_argument("--symbol", default="RELIANCE.NS", help="symbol to plan the queries for")
+    parser.add_argument("--min-rows", type=int, help="flag sequential scans on tables with at least this many rows")
+    parser.add_argument("--verbose", action="store_true", help="print every query, not only flagged ones")
+    args = parser.parse_args()
+
+    results = check_query_plans(args.symbol, args.min_rows)
+    if args.verbose:
+        for result in results:
+            scans = ", ".join(f"{s['table']} (~{s['rows']:,} rows)" for s in result["seq_scans"]) or "none"
+            print(f"{result['query']:<40} {result['plan']:<20} cost {result['total_cost']:>12.2f}  seq scans: {scans}")
+    sys.exit(1 if any(result["flagged"] for result in results) else 0)
@@ -0,0 +1,75 @@
+# app/db/row_hash.py
+"""
+Row-level change detection.
+
+Each normalized row is hashed (all table columns, in table order) and compared
+with the hash stored when the row was last written. Only rows whose hash
+differs need to be sent to the database, and their keys tell downstream
+consumers exactly which symbols changed.
+"""
+from typing import Dict, List, Tuple
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert_records
+from app.models.ingestion import RowHash
+
+
+def _row_keys(model, df: pd.DataFrame) -> pd.Series:
+    pk_cols = [col.name for col in model.__table__.primary_key.columns]
+    return df[pk_cols].astype(str).agg("|".join, axis=1)
+
+
+def hash_rows(model, df: pd.DataFrame) -> pd.Series:
+    """Hex hash of every row of `df` over `model`'s columns, indexed by row key."""
+    columns = [col.name for col in model.__table__.columns if col.name in df.columns]
+    # NaN and None must hash the same, or a re-fetched missing value would look like a change
+    normalized = df[columns].astype(object).where(df[columns].notna(), None)
+    hashes = pd.util.hash_pandas_object(normalized, index=False).map("{:016x}".format)
+    return pd.Series(hashes.values, index=_row_keys(model, df).values)
+
+
+def filter_changed_rows(db: Session, model, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Returns the rows of `df` whose hash differs from the stored one (new rows included)
+    and their new hashes keyed by row key, to be saved with `store_row_hashes`.
+    """
+    pk_cols = [col.name for col in model.__table__.primary_key.columns]
+    df = df.drop_duplicates(subset=pk_cols, keep="last")
+    hashes = hash_rows(model, df)
+    table_name = model.__table__.name
+    stored = dict(
+        db.query(RowHash.row_key, RowHash.row_hash)
+        .filter(RowHash.table_name == table_name, RowHash.row_key.in_(list(hashes.index)))
+        .all()
+    )
+    changed_mask = [stored.get(key) != value for key, value in hashes.items()]
+    changed = hashes[changed_mask]
+    return df[changed_mask], changed.to_dict()
+
+
+def store_row_hashes(db: Session, model, hashes: Dict[str, str]) -> int:
+    """Saves the hashes of rows that were just written. Does not commit."""
+    table_name = model.__table__.name
+    return upsert_records(db, RowHash, [
+        {"table_name": table_name, "row_key": key, "row_hash": value}
+        for key, value in hashes.items()
+    ])
+
+
+def clear_row_hashes(db: Session, model):
+    """
+    Forgets every stored hash of `model`'s table, e.g. after its rows were replaced
+    by a path that does not hash them; the next write then sends every row. Does not commit.
+    """
+    db.query(RowHash).filter(RowHash.table_name == model.__table__.name).delete(synchronize_session=False)
+
+
+def reset_row_hashes(db: Session, model, hashes: Dict[str, str]):
+    """Replaces every stored hash of `model`'s table, e.g. after a full snapshot swap. Does not commit."""
+    clear_row_hashes(db, model)
+    store_row_hashes(db, model, hashes)
+
+
+def changed_symbols(df: pd.DataFrame) -> List[str]:
+    return sorted(df["symbol"].unique()) if "symbol" in df.columns else []
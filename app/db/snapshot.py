@@ -0,0 +1,148 @@
+import datetime
+import time
+from typing import Any, Dict, List, Set
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.copy_loader import supports_copy, copy_into_table
+from app.db.upsert import upsert_records
+from app.models.ingestion import TableVersion
+
+PREV_SUFFIX = "__prev"
+
+
+def _snapshot_version(db: Session, table_name: str) -> TableVersion:
+    row = db.get(TableVersion, table_name)
+    if row is None:
+        row = TableVersion(table_name=table_name, version=0)
+        db.add(row)
+    return row
+
+
+def _changed_symbols(db: Session, quote, left: str, right: str) -> Set[str]:
+    """Symbols with at least one row that differs between tables `left` and `right`."""
+    left, right = quote(left), quote(right)
+    rows = db.execute(text(
+        f"SELECT symbol FROM (SELECT * FROM {left} EXCEPT SELECT * FROM {right}) a "
+        f"UNION SELECT symbol FROM (SELECT * FROM {right} EXCEPT SELECT * FROM {left}) b"
+    ))
+    return {row[0] for row in rows}
+
+
+def _is_lock_timeout(exc: OperationalError) -> bool:
+    # lock_not_available; psycopg2 exposes it as pgcode, psycopg 3 as sqlstate
+    orig = exc.orig
+    return (getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)) == "55P03"
+
+
+def _rename_tables(db: Session, statements: List[str]):
+    """
+    Runs the ALTER TABLE ... RENAME statements of a swap under a short lock_timeout.
+    A rename needs an ACCESS EXCLUSIVE lock, and while it waits behind an open read
+    transaction every new reader of the table queues behind it; the timeout bounds
+    that wait. On timeout the renames are rolled back to a savepoint and retried
+    after a backoff, up to SNAPSHOT_SWAP_RETRIES times.
+    """
+    db.execute(text(f"SET LOCAL lock_timeout = '{int(settings.SNAPSHOT_SWAP_LOCK_TIMEOUT_MS)}ms'"))
+    for attempt in range(settings.SNAPSHOT_SWAP_RETRIES + 1):
+        savepoint = db.begin_nested()
+        try:
+            for statement in statements:
+                db.execute(text(statement))
+            savepoint.commit()
+            break
+        except OperationalError as e:
+            savepoint.rollback()
+            if not _is_lock_timeout(e) or attempt == settings.SNAPSHOT_SWAP_RETRIES:
+                raise
+            delay = min(settings.SNAPSHOT_SWAP_BACKOFF_BASE * 2 ** attempt, settings.SNAPSHOT_SWAP_BACKOFF_MAX)
+            print(f"Snapshot swap waited too long for a table lock; retrying in {delay:.1f}s.")
+            time.sleep(delay)
+    db.execute(text("SET LOCAL lock_timeout = DEFAULT"))
+
+
+def swap_in_snapshot(db: Session, model, df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Replaces the contents of `model`'s table with `df` as a new snapshot.
+
+    On PostgreSQL the data is COPYed into a versioned shadow table
+    (e.g. stock_info__v7), which is then renamed over the live table while the
+    old live table becomes `<table>__prev`. Readers never see a partially
+    written table: they see the old snapshot until the caller commits.
+
+    They can briefly wait, though. The renames take an ACCESS EXCLUSIVE lock that
+    is held until commit, and new readers queue behind it, including while it
+    waits for open reads to finish (bounded by SNAPSHOT_SWAP_LOCK_TIMEOUT_MS per
+    attempt, see `_rename_tables`). All the slow work, the COPY and the diff,
+    happens before the renames, so callers should do any other writes first and
+    commit right after this returns. Other dialects replace the rows inside the
+    transaction instead and keep no previous snapshot.
+
+    Does not commit. Returns the new version, rows written and the set of
+    symbols whose rows changed compared with the previous snapshot.
+    """
+    table_name = model.__table__.name
+    pk_cols = [col.name for col in model.__table__.primary_key.columns]
+    df = df.drop_duplicates(subset=pk_cols, keep="last")
+    version_row = _snapshot_version(db, table_name)
+    new_version = version_row.version + 1
+
+    if supports_copy(db):
+        quote = db.get_bind().dialect.identifier_preparer.quote
+        shadow = f"{table_name}__v{new_version}"
+        prev = f"{table_name}{PREV_SUFFIX}"
+
+        db.execute(text(f"DROP TABLE IF EXISTS {quote(shadow)}"))
+        db.execute(text(f"CREATE TABLE {quote(shadow)} (LIKE {quote(table_name)} INCLUDING ALL)"))
+        copy_into_table(db, model, df, shadow)
+        changed = _changed_symbols(db, quote, shadow, table_name)
+
+        _rename_tables(db, [
+            f"DROP TABLE IF EXISTS {quote(prev)}",
+            f"ALTER TABLE {quote(table_name)} RENAME TO {quote(prev)}",
+            f"ALTER TABLE {quote(shadow)} RENAME TO {quote(table_name)}",
+        ])
+    else:
+        db.query(model).delete()
+        upsert_records(db, model, df.to_dict(orient="records"))
+        changed = set(df["symbol"])
+
+    version_row.version = new_version
+    version_row.row_count = len(df)
+    version_row.swapped_at = datetime.datetime.utcnow()
+    return {"version": new_version, "rows": len(df), "changed_symbols": changed}
+
+
+def rollback_snapshot(db: Session, model) -> Dict[str, Any]:
+    """
+    Swaps `model`'s live table with its `<table>__prev` snapshot (PostgreSQL only).
+    Rolling back twice restores the newer snapshot. Takes the same locks as
+    `swap_in_snapshot`; does not commit, so commit right after it returns.
+    """
+    if not supports_copy(db):
+        raise ValueError("Snapshot rollback requires PostgreSQL.")
+
+    table_name = model.__table__.name
+    prev = f"{table_name}{PREV_SUFFIX}"
+    if not inspect(db.connection()).has_table(prev):
+        raise ValueError(f"No previous snapshot of '{table_name}' to roll back to.")
+
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    swap = f"{table_name}__swap"
+    # Counted before the renames so the table lock is not held while scanning
+    row_count = db.execute(text(f"SELECT count(*) FROM {quote(prev)}")).scalar()
+    _rename_tables(db, [
+        f"ALTER TABLE {quote(table_name)} RENAME TO {quote(swap)}",
+        f"ALTER TABLE {quote(prev)} RENAME TO {quote(table_name)}",
+        f"ALTER TABLE {quote(swap)} RENAME TO {quote(prev)}",
+    ])
+
+    # Versions count swaps, so shadow table names stay unique after a rollback
+    version_row = _snapshot_version(db, table_name)
+    version_row.version += 1
+    version_row.row_count = row_count
+    version_row.swapped_at = datetime.datetime.utcnow()
+    return {"version": version_row.version, "rows": version_row.row_count}
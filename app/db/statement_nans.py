@@ -0,0 +1,50 @@
+# app/db/statement_nans.py
+"""
+One-time data migration (PostgreSQL only): rewrites NaN statement values to NULL.
+
+Older ingestions could store NaN instead of NULL in the statement tables; new
+rows are normalized before they are written, so once this has run there is
+nothing left for it to do. Run it once per database after upgrading:
+
+    python -m app.db.statement_nans
+"""
+from typing import Dict
+
+from sqlalchemy import text
+
+from app.db.config import engine
+from app.models import stock
+
+# Statement columns that older ingestions could have stored as NaN instead of NULL.
+STATEMENT_NAN_COLUMNS = {
+    stock.BalanceSheet: ["total_assets", "total_debt", "stockholders_equity", "cash_and_cash_equivalents"],
+    stock.IncomeStatement: [
+        "total_revenue", "gross_profit", "operating_income", "net_income", "basic_eps", "diluted_eps"
+    ],
+    stock.CashFlow: ["operating_cash_flow", "capital_expenditure", "free_cash_flow", "cash_dividends_paid"],
+}
+
+
+def null_statement_nans() -> Dict[str, int]:
+    """Rewrites NaN statement values to NULL in one transaction; returns rows updated per `table.column`."""
+    if engine.dialect.name != "postgresql":
+        print("Statement NaN migration skipped: it requires PostgreSQL.")
+        return {}
+    updated = {}
+    with engine.begin() as conn:
+        for model, columns in STATEMENT_NAN_COLUMNS.items():
+            for column in columns:
+                result = conn.execute(text(
+                    f'UPDATE {model.__tablename__} SET "{column}" = NULL '
+                    f"WHERE \"{column}\" = 'NaN'"
+                ))
+                updated[f"{model.__tablename__}.{column}"] = result.rowcount
+    return updated
+
+
+if __name__ == "__main__":
+    counts = null_statement_nans()
+    for name, rows in counts.items():
+        if rows:
+            print(f"{name}: {rows} NaN values set to NULL")
+    print(f"Statement NaN migration done ({sum(counts.values())} values updated).")
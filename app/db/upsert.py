@@ -0,0 +1,57 @@
+from typing import Any, Dict, List
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+# Dialects that support INSERT ... ON CONFLICT DO UPDATE ... WHERE
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Keeps each statement well under PostgreSQL's 65535 bind parameter limit
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def upsert_records(
+    db: Session,
+    model,
+    records: List[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Inserts `records` into `model`'s table, updating existing rows on primary key conflict.
+
+    Existing rows are only rewritten when at least one column actually changed,
+    so unchanged rows cost no write. Uses INSERT ... ON CONFLICT on PostgreSQL
+    and SQLite, and falls back to `Session.merge` on other dialects.
+    Does not commit. Returns the number of rows inserted or updated.
+    """
+    if not records:
+        return 0
+
+    table = model.__table__
+    pk_cols = [col.name for col in table.primary_key.columns]
+    update_cols = [name for name in records[0] if name not in pk_cols and name in table.c]
+
+    insert_fn = _DIALECT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_fn is None:
+        for record in records:
+            db.merge(model(**record))
+        return len(records)
+
+    written = 0
+    for start in range(0, len(records), chunk_size):
+        stmt = insert_fn(table).values(records[start:start + chunk_size])
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=pk_cols,
+                set_={name: stmt.excluded[name] for name in update_cols},
+                where=or_(*[table.c[name].is_distinct_from(stmt.excluded[name]) for name in update_cols]),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=pk_cols)
+        result = db.execute(stmt)
+        written += max(result.rowcount or 0, 0)
+    return written
@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware # Import CORSMiddleware
 from app.core.config import settings
 from app.db.db_init import init_db
+from app.db.query_plans import check_query_plans
+from app.tasks.scheduler import price_scheduler
 
 from app.api.routes.ingest import router as ingest_router 
 from app.api.routes.stock_apis import router as stock_router
@@ -33,6 +35,18 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()  # create tables if not exist
+    if settings.QUERY_PLAN_CHECK_ON_STARTUP:
+        try:
+            check_query_plans()
+        except Exception as e:
+            print(f"Query plan check failed: {e}")
+    if settings.PRICE_SCHEDULER_ENABLED:
+        price_scheduler.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    price_scheduler.stop()
 
 
 # Register the ingestion router
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Date, Float, Text, ForeignKey
+from app.db.config import Base
+import datetime
+
+
+class TableVersion(Base):
+    """Current snapshot version of a table that is loaded by atomic swap."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    row_count = Column(Integer, nullable=True)
+    swapped_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+class RowHash(Base):
+    """Hash of the last written version of a row, used to skip rewriting unchanged rows."""
+    __tablename__ = "row_hashes"
+
+    table_name = Column(String, primary_key=True)
+    row_key = Column(String, primary_key=True)  # primary key values joined by "|"
+    row_hash = Column(String(16), nullable=False)
+
+class DatasetFreshness(Base):
+    """When a symbol's dataset was last fetched and the latest period it returned."""
+    __tablename__ = "dataset_freshness"
+
+    symbol = Column(String, primary_key=True)
+    dataset = Column(String, primary_key=True)
+    last_fetched_at = Column(DateTime, nullable=False)
+    latest_period = Column(Date, nullable=True)
+
+
+class IngestionRun(Base):
+    """One background ingestion job, persisted when it finishes."""
+    __tablename__ = "ingestion_runs"
+
+    id = Column(String, primary_key=True)
+    name = Column(String, nullable=False, index=True)
+    params = Column(Text, nullable=True)  # JSON
+    status = Column(String, nullable=False)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    rows_written = Column(Integer, nullable=True)
+    failures = Column(Integer, nullable=True)
+
+
+class IngestionRunMetric(Base):
+    """
+    One timed step of an ingestion run: a per-symbol `fetch`, or a per-dataset
+    `transform` or `write` (symbol is NULL).
+    """
+    __tablename__ = "ingestion_run_metrics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String, ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    dataset = Column(String, nullable=False)
+    symbol = Column(String, nullable=True, index=True)
+    stage = Column(String, nullable=False)
+    seconds = Column(Float, nullable=True)
+    rows = Column(Integer, nullable=True)
+    bytes = Column(BigInteger, nullable=True)
+    error_class = Column(String, nullable=True)
+    recorded_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
@@ -1,5 +1,5 @@
 # app/models/base.py
-from sqlalchemy import Column, String, Float, BigInteger, Date, Numeric
+from sqlalchemy import Column, String, Float, BigInteger, Date, DateTime, Numeric, Boolean, Index
 from app.db.config import Base
 
 
@@ -27,6 +27,25 @@ class DailyPrice(Base):
     Volume = Column(BigInteger)
 
 
+class IntradayPrice(Base):
+    """
+    1m/5m bars. On PostgreSQL the table is partitioned by interval and then by
+    trading day (see app/db/partitions.py), so reads prune to a few partitions
+    and old days are dropped as whole partitions by the retention rollup.
+    """
+    __tablename__ = "intraday_prices"
+    __table_args__ = {"postgresql_partition_by": 'LIST ("interval")'}
+
+    symbol = Column(String, primary_key=True)
+    interval = Column(String(3), primary_key=True)
+    Datetime = Column(DateTime(timezone=True), primary_key=True)
+    Open = Column(Float)
+    High = Column(Float)
+    Low = Column(Float)
+    Close = Column(Float)
+    Volume = Column(BigInteger)
+
+
 class StockInfo(Base):
     __tablename__ = "stock_info"
 
@@ -98,4 +117,33 @@ class CashFlow(Base):
     operating_cash_flow = Column(Numeric(38, 2), nullable=True)
     capital_expenditure = Column(Numeric(38, 2), nullable=True)
     free_cash_flow = Column(Numeric(38, 2), nullable=True)
-    cash_dividends_paid = Column(Numeric(38, 2), nullable=True)
\ No newline at end of file
+    cash_dividends_paid = Column(Numeric(38, 2), nullable=True)
+
+
+class UniverseSymbol(Base):
+    __tablename__ = "symbol_universe"
+
+    symbol = Column(String, primary_key=True)
+    exchange = Column(String, nullable=False, default="NSE")
+    index_membership = Column(String, nullable=True)  # comma-separated, e.g. "NIFTY50,NIFTY500"
+    active = Column(Boolean, nullable=False, default=True)
+
+
+def _latest_first_index(model) -> Index:
+    """
+    (symbol, Date DESC) INCLUDE (every other column): latest-first reads per symbol
+    (`ORDER BY "Date" DESC LIMIT n`, DISTINCT ON) become index-only scans on PostgreSQL.
+    """
+    table = model.__table__
+    included = [column.name for column in table.columns if column.name not in ("symbol", "Date")]
+    return Index(
+        f"ix_{table.name}_symbol_date_desc", table.c.symbol, table.c.Date.desc(),
+        postgresql_include=included,
+    )
+
+
+# Covering indexes for the hot per-symbol reads (see app/db/query_plans.py)
+_latest_first_index(DailyPrice)
+_latest_first_index(BalanceSheet)
+_latest_first_index(IncomeStatement)
+_latest_first_index(CashFlow)
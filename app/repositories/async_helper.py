@@ -0,0 +1,112 @@
+# app/repositories/async_helper.py
+"""
+Async versions of the read getters in `app.repositories.helper`, for routes that
+use an `AsyncSession` (see `app.db.config.get_async_db`). Same names, arguments
+and return values; each one awaits its query instead of blocking a thread.
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.helper import PROFILE_DAILY_PRICES, stock_profile_query, stock_profile_from_row
+from app.models.stock import (
+    CurrentPrice,
+    StockInfo,
+    DailyPrice,
+    IntradayPrice,
+    CashFlow,
+    BalanceSheet,
+    IncomeStatement
+)
+
+
+async def get_all_current_prices(db: AsyncSession) -> List[CurrentPrice]:
+    return (await db.scalars(select(CurrentPrice))).all()
+
+
+async def get_current_price_by_symbol(db: AsyncSession, symbol: str) -> Optional[CurrentPrice]:
+    return await db.scalar(select(CurrentPrice).where(CurrentPrice.symbol == symbol.upper()).limit(1))
+
+
+async def get_daily_prices_by_symbol(db: AsyncSession, symbol: str, limit: Optional[int] = None) -> List[DailyPrice]:
+    # Latest prices first
+    query = select(DailyPrice).where(DailyPrice.symbol == symbol.upper()).order_by(DailyPrice.Date.desc())
+    if limit:
+        query = query.limit(limit)
+    return (await db.scalars(query)).all()
+
+
+async def get_intraday_prices_by_symbol(
+    db: AsyncSession,
+    symbol: str,
+    interval: str = "5m",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[IntradayPrice]:
+    query = select(IntradayPrice).where(
+        IntradayPrice.symbol == symbol.upper(), IntradayPrice.interval == interval
+    )
+    if start:
+        query = query.where(IntradayPrice.Datetime >= start)
+    if end:
+        query = query.where(IntradayPrice.Datetime < end)
+    query = query.order_by(IntradayPrice.Datetime.desc())
+    if limit:
+        query = query.limit(limit)
+    return (await db.scalars(query)).all()
+
+
+async def get_all_stock_info(db: AsyncSession) -> List[StockInfo]:
+    return (await db.scalars(select(StockInfo))).all()
+
+
+async def get_stock_info_by_symbol(db: AsyncSession, symbol: str) -> Optional[StockInfo]:
+    return await db.scalar(select(StockInfo).where(StockInfo.symbol == symbol.upper()).limit(1))
+
+
+async def get_all_balance_sheets(db: AsyncSession) -> List[BalanceSheet]:
+    return (await db.scalars(select(BalanceSheet))).all()
+
+
+async def get_balance_sheets_by_symbol(db: AsyncSession, symbol: str) -> List[BalanceSheet]:
+    return (await db.scalars(select(BalanceSheet).where(BalanceSheet.symbol == symbol.upper()))).all()
+
+
+async def get_all_income_statements(db: AsyncSession) -> List[IncomeStatement]:
+    return (await db.scalars(select(IncomeStatement))).all()
+
+
+async def get_income_statements_by_symbol(db: AsyncSession, symbol: str) -> List[IncomeStatement]:
+    return (await db.scalars(select(IncomeStatement).where(IncomeStatement.symbol == symbol.upper()))).all()
+
+
+async def get_all_cash_flows(db: AsyncSession) -> List[CashFlow]:
+    return (await db.scalars(select(CashFlow))).all()
+
+
+async def get_cash_flows_by_symbol(db: AsyncSession, symbol: str) -> List[CashFlow]:
+    return (await db.scalars(select(CashFlow).where(CashFlow.symbol == symbol.upper()))).all()
+
+
+async def get_stock_profile_by_symbol(db: AsyncSession, symbol: str) -> dict:
+    profile = await load_stock_profile(db, symbol, daily_limit=0)
+    profile.pop("daily_prices")
+    return profile
+
+
+async def load_stock_profile(db: AsyncSession, symbol: str, daily_limit: int = PROFILE_DAILY_PRICES) -> dict:
+    """See `app.repositories.helper.load_stock_profile`."""
+    symbol = symbol.upper()
+    if db.get_bind().dialect.name == "postgresql":
+        row = (await db.execute(stock_profile_query(), {"symbol": symbol, "daily_limit": daily_limit})).one()
+        return stock_profile_from_row(row)
+    return {
+        "stock_info": await get_stock_info_by_symbol(db, symbol),
+        "current_price": await get_current_price_by_symbol(db, symbol),
+        "balance_sheet": await get_balance_sheets_by_symbol(db, symbol),
+        "income_statement": await get_income_statements_by_symbol(db, symbol),
+        "cash_flow": await get_cash_flows_by_symbol(db, symbol),
+        "daily_prices": await get_daily_prices_by_symbol(db, symbol, limit=daily_limit) if daily_limit else [],
+    }
@@ -0,0 +1,39 @@
+# app/repositories/freshness.py
+from datetime import date, datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert_records
+from app.models.ingestion import DatasetFreshness
+
+
+def get_freshness(db: Session, dataset: str, symbols: List[str]) -> Dict[str, DatasetFreshness]:
+    """Returns the freshness entries of `dataset` for `symbols`, keyed by symbol."""
+    rows = (
+        db.query(DatasetFreshness)
+        .filter(DatasetFreshness.dataset == dataset, DatasetFreshness.symbol.in_(symbols))
+        .all()
+    )
+    return {row.symbol: row for row in rows}
+
+
+def record_fetches(
+    db: Session,
+    dataset: str,
+    latest_periods: Dict[str, Optional[date]],
+    fetched_at: Optional[datetime] = None,
+) -> int:
+    """Marks `dataset` as fetched now for each symbol in `latest_periods`, with its latest period. Does not commit."""
+    fetched_at = fetched_at or datetime.utcnow()
+    records = [
+        {"symbol": symbol, "dataset": dataset, "last_fetched_at": fetched_at, "latest_period": period}
+        for symbol, period in latest_periods.items()
+    ]
+    return upsert_records(db, DatasetFreshness, records)
+
+
+def latest_periods(df: pd.DataFrame) -> Dict[str, date]:
+    """Latest statement period per symbol in a `symbol, Date, ...` frame, for `record_fetches`."""
+    latest = pd.to_datetime(df["Date"]).groupby(df["symbol"]).max()
+    return {symbol: period.date() for symbol, period in latest.items()}
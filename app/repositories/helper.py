@@ -1,13 +1,17 @@
 # app/repositories/helper.py
-from typing import List, Optional
-from datetime import date
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import JSON, func, inspect, text
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.orm import Session, aliased
 from typing import List, Optional
 
 from app.models.stock import (
     CurrentPrice, 
     StockInfo, 
     DailyPrice, 
+    IntradayPrice,
     CashFlow, 
     BalanceSheet, 
     IncomeStatement
@@ -109,6 +113,28 @@ def get_daily_prices_by_symbol(db: Session, symbol: str, limit: Optional[int] =
     return query.all()
 
 
+def get_intraday_prices_by_symbol(
+    db: Session,
+    symbol: str,
+    interval: str = "5m",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[IntradayPrice]:
+    """Latest-first intraday bars; a time range lets PostgreSQL prune to the matching day partitions."""
+    query = db.query(IntradayPrice).filter(
+        IntradayPrice.symbol == symbol.upper(), IntradayPrice.interval == interval
+    )
+    if start:
+        query = query.filter(IntradayPrice.Datetime >= start)
+    if end:
+        query = query.filter(IntradayPrice.Datetime < end)
+    query = query.order_by(IntradayPrice.Datetime.desc())
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
 # Function to get all stock info
 def get_all_stock_info(db: Session) -> List[StockInfo]:
     return db.query(StockInfo).all()
@@ -143,19 +169,208 @@ def get_cash_flows_by_symbol(db: Session, symbol: str) -> List[CashFlow]:
 
 # Function to get complete stock profile
 def get_stock_profile_by_symbol(db: Session, symbol: str) -> dict:
+    profile = load_stock_profile(db, symbol, daily_limit=0)
+    profile.pop("daily_prices")
+    return profile
+
+
+# ========================================================================================================
+# Multi-symbol getters: one query per table, results keyed by every requested symbol
+
+
+def _normalize_symbols(symbols: List[str]) -> List[str]:
+    return list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+
+def _group_by_symbol(rows, symbols: List[str]) -> Dict[str, list]:
+    grouped = {symbol: [] for symbol in symbols}
+    for row in rows:
+        grouped[row.symbol].append(row)
+    return grouped
+
+
+def _one_per_symbol(db: Session, model, symbols: List[str]) -> Dict[str, Optional[object]]:
+    symbols = _normalize_symbols(symbols)
+    found = {row.symbol: row for row in db.query(model).filter(model.symbol.in_(symbols)).all()}
+    return {symbol: found.get(symbol) for symbol in symbols}
+
+
+def get_current_prices_by_symbols(db: Session, symbols: List[str]) -> Dict[str, Optional[CurrentPrice]]:
+    return _one_per_symbol(db, CurrentPrice, symbols)
+
+
+def get_stock_info_by_symbols(db: Session, symbols: List[str]) -> Dict[str, Optional[StockInfo]]:
+    return _one_per_symbol(db, StockInfo, symbols)
+
+
+def get_daily_prices_by_symbols(
+    db: Session, symbols: List[str], limit: Optional[int] = None
+) -> Dict[str, List[DailyPrice]]:
+    """Latest-first daily prices per symbol; `limit` applies to each symbol (ROW_NUMBER window)."""
+    symbols = _normalize_symbols(symbols)
+    if not limit:
+        rows = (
+            db.query(DailyPrice)
+            .filter(DailyPrice.symbol.in_(symbols))
+            .order_by(DailyPrice.symbol, DailyPrice.Date.desc())
+            .all()
+        )
+        return _group_by_symbol(rows, symbols)
+
+    ranked = (
+        db.query(
+            DailyPrice,
+            func.row_number().over(partition_by=DailyPrice.symbol, order_by=DailyPrice.Date.desc()).label("rn"),
+        )
+        .filter(DailyPrice.symbol.in_(symbols))
+        .subquery()
+    )
+    price = aliased(DailyPrice, ranked)
+    rows = (
+        db.query(price)
+        .filter(ranked.c.rn <= limit)
+        .order_by(price.symbol, price.Date.desc())
+        .all()
+    )
+    return _group_by_symbol(rows, symbols)
+
+
+def _statements_by_symbols(db: Session, model, symbols: List[str]) -> Dict[str, list]:
+    symbols = _normalize_symbols(symbols)
+    rows = db.query(model).filter(model.symbol.in_(symbols)).order_by(model.symbol, model.Date.desc()).all()
+    return _group_by_symbol(rows, symbols)
+
+
+def _latest_statements(db: Session, model, symbols: List[str]) -> Dict[str, Optional[object]]:
+    """Most recent statement per symbol: DISTINCT ON on PostgreSQL, a ROW_NUMBER window elsewhere."""
+    symbols = _normalize_symbols(symbols)
+    if db.get_bind().dialect.name == "postgresql":
+        rows = (
+            db.query(model)
+            .filter(model.symbol.in_(symbols))
+            .ext(distinct_on(model.symbol))
+            .order_by(model.symbol, model.Date.desc())
+            .all()
+        )
+    else:
+        ranked = (
+            db.query(
+                model,
+                func.row_number().over(partition_by=model.symbol, order_by=model.Date.desc()).label("rn"),
+            )
+            .filter(model.symbol.in_(symbols))
+            .subquery()
+        )
+        rows = db.query(aliased(model, ranked)).filter(ranked.c.rn == 1).all()
+    found = {row.symbol: row for row in rows}
+    return {symbol: found.get(symbol) for symbol in symbols}
+
+
+def get_balance_sheets_by_symbols(db: Session, symbols: List[str]) -> Dict[str, List[BalanceSheet]]:
+    return _statements_by_symbols(db, BalanceSheet, symbols)
+
+
+def get_income_statements_by_symbols(db: Session, symbols: List[str]) -> Dict[str, List[IncomeStatement]]:
+    return _statements_by_symbols(db, IncomeStatement, symbols)
+
+
+def get_cash_flows_by_symbols(db: Session, symbols: List[str]) -> Dict[str, List[CashFlow]]:
+    return _statements_by_symbols(db, CashFlow, symbols)
+
+
+def get_latest_balance_sheets(db: Session, symbols: List[str]) -> Dict[str, Optional[BalanceSheet]]:
+    return _latest_statements(db, BalanceSheet, symbols)
+
+
+def get_latest_income_statements(db: Session, symbols: List[str]) -> Dict[str, Optional[IncomeStatement]]:
+    return _latest_statements(db, IncomeStatement, symbols)
+
+
+def get_latest_cash_flows(db: Session, symbols: List[str]) -> Dict[str, Optional[CashFlow]]:
+    return _latest_statements(db, CashFlow, symbols)
+
+
+# ========================================================================================================
+# Single-round-trip profile loader
+
+# Latest daily bars loaded with a profile; covers the longest technical indicator window (volatility, 253 days)
+PROFILE_DAILY_PRICES = 260
+
+# (key, model, one row or many)
+PROFILE_TABLES = (
+    ("stock_info", StockInfo, False),
+    ("current_price", CurrentPrice, False),
+    ("balance_sheet", BalanceSheet, True),
+    ("income_statement", IncomeStatement, True),
+    ("cash_flow", CashFlow, True),
+)
+
+
+def stock_profile_query():
+    """
+    One PostgreSQL statement returning every profile table for :symbol as JSON columns,
+    plus the latest :daily_limit daily bars, so a profile costs one round trip.
+    """
+    parts = []
+    for key, model, many in PROFILE_TABLES:
+        aggregate = "json_agg(t)" if many else "row_to_json(t)"
+        parts.append(f"(SELECT {aggregate} FROM {model.__tablename__} t WHERE t.symbol = :symbol) AS {key}")
+    parts.append(
+        f"(SELECT json_agg(t ORDER BY t.\"Date\" DESC) FROM (SELECT * FROM {DailyPrice.__tablename__} "
+        f"WHERE symbol = :symbol ORDER BY \"Date\" DESC LIMIT :daily_limit) t) AS daily_prices"
+    )
+    columns = {key: JSON for key, _, _ in PROFILE_TABLES}
+    return text("SELECT " + ",\n       ".join(parts)).columns(daily_prices=JSON, **columns)
+
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(str(value))
+    return python_type(value)
+
+
+def _model_from_json(model, row: dict):
+    """Detached `model` instance from a row_to_json object (keys are column names)."""
+    values = {}
+    for attr in inspect(model).column_attrs:
+        column = attr.columns[0]
+        values[attr.key] = _from_json(column, row.get(column.name))
+    return model(**values)
+
+
+def stock_profile_from_row(row) -> dict:
+    """Turns the row of `stock_profile_query` into the profile dict of model instances."""
+    profile = {}
+    for key, model, many in PROFILE_TABLES + (("daily_prices", DailyPrice, True),):
+        value = row._mapping[key]
+        if many:
+            profile[key] = [_model_from_json(model, item) for item in value or []]
+        else:
+            profile[key] = _model_from_json(model, value) if value else None
+    return profile
+
+
+def load_stock_profile(db: Session, symbol: str, daily_limit: int = PROFILE_DAILY_PRICES) -> dict:
+    """
+    Stock info, current price, the three statements and the latest `daily_limit`
+    daily prices for `symbol`. One query on PostgreSQL; one query per table elsewhere.
+    """
     symbol = symbol.upper()
-    
-    stock_info = get_stock_info_by_symbol(db, symbol)
-    current_price = get_current_price_by_symbol(db, symbol)
-    balance_sheets = get_balance_sheets_by_symbol(db, symbol)
-    income_statements = get_income_statements_by_symbol(db, symbol)
-    cash_flows = get_cash_flows_by_symbol(db, symbol)
-    
+    if db.get_bind().dialect.name == "postgresql":
+        row = db.execute(stock_profile_query(), {"symbol": symbol, "daily_limit": daily_limit}).one()
+        return stock_profile_from_row(row)
     return {
-        "stock_info": stock_info,
-        "current_price": current_price,
-        "balance_sheet": balance_sheets,
-        "income_statement": income_statements,
-        "cash_flow": cash_flows
+        "stock_info": get_stock_info_by_symbol(db, symbol),
+        "current_price": get_current_price_by_symbol(db, symbol),
+        "balance_sheet": get_balance_sheets_by_symbol(db, symbol),
+        "income_statement": get_income_statements_by_symbol(db, symbol),
+        "cash_flow": get_cash_flows_by_symbol(db, symbol),
+        "daily_prices": get_daily_prices_by_symbol(db, symbol, limit=daily_limit) if daily_limit else [],
     }
-
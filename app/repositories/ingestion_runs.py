@@ -0,0 +1,81 @@
+# app/repositories/ingestion_runs.py
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models.ingestion import IngestionRun, IngestionRunMetric
+
+SUMMARY_GROUPS = ("dataset", "symbol", "stage", "error_class")
+
+
+def save_run(db: Session, run: Dict[str, Any], metrics: List[Dict[str, Any]]) -> IngestionRun:
+    """Persists a finished run (see `IngestionJob.to_dict`) and its timed steps. Does not commit."""
+    row = IngestionRun(
+        id=run["id"],
+        name=run["name"],
+        params=json.dumps(run["params"], default=str),
+        status=run["status"],
+        error=run["error"],
+        started_at=run["started_at"],
+        finished_at=run["finished_at"],
+        duration_seconds=run["elapsed_seconds"],
+        rows_written=run["total_rows_written"],
+        failures=run["failures"],
+    )
+    db.merge(row)
+    db.bulk_insert_mappings(IngestionRunMetric, [{"run_id": run["id"], **metric} for metric in metrics])
+    return row
+
+
+def get_recent_runs(db: Session, limit: int = 50) -> List[IngestionRun]:
+    return db.query(IngestionRun).order_by(IngestionRun.started_at.desc()).limit(limit).all()
+
+
+def get_run_metrics(db: Session, run_id: str) -> List[IngestionRunMetric]:
+    return db.query(IngestionRunMetric).filter(IngestionRunMetric.run_id == run_id).all()
+
+
+def summarize_metrics(
+    db: Session,
+    days: int = 7,
+    stage: Optional[str] = "fetch",
+    group_by: str = "dataset",
+    dataset: Optional[str] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """
+    p50/p95/max step duration, error counts, rows and bytes over the last `days`,
+    grouped by `group_by` (one of SUMMARY_GROUPS) and slowest p95 first.
+    """
+    if group_by not in SUMMARY_GROUPS:
+        raise ValueError(f"Cannot group by '{group_by}'; use one of {', '.join(SUMMARY_GROUPS)}.")
+    query = db.query(
+        IngestionRunMetric.dataset, IngestionRunMetric.symbol, IngestionRunMetric.stage,
+        IngestionRunMetric.error_class, IngestionRunMetric.seconds,
+        IngestionRunMetric.rows, IngestionRunMetric.bytes, IngestionRunMetric.run_id,
+    ).filter(IngestionRunMetric.recorded_at >= datetime.utcnow() - timedelta(days=days))
+    if stage:
+        query = query.filter(IngestionRunMetric.stage == stage)
+    if dataset:
+        query = query.filter(IngestionRunMetric.dataset == dataset)
+    df = pd.read_sql(query.statement, db.get_bind())
+    if df.empty:
+        return []
+
+    df["failed"] = df["error_class"].notna()
+    df[group_by] = df[group_by].fillna("(none)")
+    summary = df.groupby(group_by).agg(
+        count=("seconds", "size"),
+        runs=("run_id", "nunique"),
+        p50_seconds=("seconds", lambda s: s.quantile(0.5)),
+        p95_seconds=("seconds", lambda s: s.quantile(0.95)),
+        max_seconds=("seconds", "max"),
+        errors=("failed", "sum"),
+        rows=("rows", "sum"),
+        bytes=("bytes", "sum"),
+    ).reset_index()
+    summary = summary.sort_values("p95_seconds", ascending=False, na_position="last").head(limit)
+    summary = summary.round({"p50_seconds": 3, "p95_seconds": 3, "max_seconds": 3})
+    return summary.astype(object).where(summary.notna(), None).to_dict(orient="records")
@@ -745,6 +745,8 @@ from app.repositories.helper import (
     get_daily_prices_by_symbol,
     get_latest_financial_data,
     get_previous_period_data,
+    load_stock_profile,
+    PROFILE_DAILY_PRICES,
     safe_divide
 )
 
@@ -756,12 +758,32 @@ class MetricsProcessor:
         self.db = db
         self.symbol = symbol.upper()
         self._cache = {}
+        self._daily_prices = None  # latest PROFILE_DAILY_PRICES bars, set by preload()
+
+    def preload(self) -> "MetricsProcessor":
+        """Loads every dataset (and the latest daily prices) in one database round trip."""
+        profile = load_stock_profile(self.db, self.symbol)
+        self._cache.update({
+            'current_price': profile["current_price"],
+            'stock_info': profile["stock_info"],
+            'balance_sheets': profile["balance_sheet"],
+            'income_statements': profile["income_statement"],
+            'cash_flows': profile["cash_flow"],
+        })
+        self._daily_prices = profile["daily_prices"]
+        return self
     
     def _get_cached_data(self, data_type: str, limit: Optional[int] = None):
         """Cache database calls to avoid redundant queries."""
         # Use a key that includes the limit for daily prices
         cache_key = f"{data_type}_{limit}" if data_type == 'daily_prices' and limit else data_type
         
+        # Preloaded bars are latest first; they answer any limit they cover
+        if data_type == 'daily_prices' and self._daily_prices is not None and limit and (
+            limit <= PROFILE_DAILY_PRICES or len(self._daily_prices) < PROFILE_DAILY_PRICES
+        ):
+            return self._daily_prices[:limit]
+
         if cache_key not in self._cache:
             if data_type == 'current_price':
                 self._cache[cache_key] = get_current_price_by_symbol(self.db, self.symbol)
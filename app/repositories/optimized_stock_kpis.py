@@ -19,8 +19,8 @@ def get_metrics_by_category(db: Session, symbol: str, period_date: Optional[date
         Dictionary containing all metrics organized by category
     """
     
-    # Initialize processors with caching
-    processor = MetricsProcessor(db, symbol)
+    # Initialize processors with caching; all data is loaded in one round trip
+    processor = MetricsProcessor(db, symbol).preload()
     calculator = CalculatedMetrics(processor)
     
     # Get all required data with single database hits
@@ -0,0 +1,45 @@
+# app/repositories/universe.py
+from typing import List, Optional
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert_records
+from app.models.stock import UniverseSymbol
+
+
+def get_universe_symbols(
+    db: Session,
+    index: Optional[str] = None,
+    exchange: Optional[str] = None,
+    active_only: bool = True,
+) -> List[str]:
+    """Returns registered symbols, optionally filtered by index membership and exchange, sorted by symbol."""
+    query = db.query(UniverseSymbol.symbol, UniverseSymbol.index_membership)
+    if active_only:
+        query = query.filter(UniverseSymbol.active.is_(True))
+    if exchange:
+        query = query.filter(UniverseSymbol.exchange == exchange.upper())
+    rows = query.order_by(UniverseSymbol.symbol).all()
+    if index:
+        # Membership is a comma-separated list, so match whole entries (NIFTY50 != NIFTY500)
+        rows = [row for row in rows if index.upper() in (row.index_membership or "").split(",")]
+    return [row.symbol for row in rows]
+
+
+def register_symbols(
+    db: Session,
+    symbols: List[str],
+    exchange: str = "NSE",
+    index: Optional[str] = None,
+    active: bool = True,
+) -> int:
+    """Adds or updates symbols in the universe registry, replacing their index membership. Does not commit."""
+    records = [
+        {
+            "symbol": symbol.upper(),
+            "exchange": exchange.upper(),
+            "index_membership": index.upper() if index else None,
+            "active": active,
+        }
+        for symbol in symbols
+    ]
+    return upsert_records(db, UniverseSymbol, records)
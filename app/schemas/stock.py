@@ -2,7 +2,7 @@ from pydantic import BaseModel, field_validator
 from typing import Optional
 from decimal import Decimal
 import math
-from datetime import date
+from datetime import date, datetime
 
 
 class StockInfoResponse(BaseModel):
@@ -108,6 +108,19 @@ class DailyPriceResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class IntradayPriceResponse(BaseModel):
+    symbol: str
+    interval: str
+    Datetime: datetime
+    Open: Optional[float] = None
+    High: Optional[float] = None
+    Low: Optional[float] = None
+    Close: Optional[float] = None
+    Volume: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
 class BalanceSheetResponse(BaseModel):
     symbol: str
     Date: date
@@ -116,16 +129,6 @@ class BalanceSheetResponse(BaseModel):
     stockholders_equity: Optional[float] = None
     cash_and_cash_equivalents: Optional[float] = None
 
-    @field_validator(
-        'total_assets', 'total_debt', 'stockholders_equity', 'cash_and_cash_equivalents',
-        mode='before'
-    )
-    @classmethod
-    def validate_decimal_fields(cls, v):
-        if isinstance(v, Decimal) and v.is_nan():
-            return None
-        return v
-
     class Config:
         from_attributes = True
 
@@ -139,19 +142,6 @@ class IncomeStatementResponse(BaseModel):
     basic_eps: Optional[float] = None
     diluted_eps: Optional[float] = None
 
-    @field_validator(
-        'total_revenue', 'gross_profit', 'operating_income', 'net_income',
-        'basic_eps', 'diluted_eps',
-        mode='before'
-    )
-    @classmethod
-    def validate_numeric_fields(cls, v):
-        if isinstance(v, Decimal) and v.is_nan():
-            return None
-        if isinstance(v, float) and math.isnan(v):
-            return None
-        return v
-
     class Config:
         from_attributes = True
 
@@ -163,15 +153,5 @@ class CashFlowResponse(BaseModel):
     free_cash_flow: Optional[float] = None
     cash_dividends_paid: Optional[float] = None
 
-    @field_validator(
-        'operating_cash_flow', 'capital_expenditure', 'free_cash_flow', 'cash_dividends_paid',
-        mode='before'
-    )
-    @classmethod
-    def validate_decimal_fields(cls, v):
-        if isinstance(v, Decimal) and v.is_nan():
-            return None
-        return v
-
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -4,6 +4,7 @@ For the global stock news.
 
 import requests
 from app.core.config import settings
+from app.core.rate_limit import rate_limited_get
 
 api_key = settings.ALPHA_VANTAGE_API_KEY
 
@@ -35,8 +36,7 @@ def fetch_news_sentiment(ticker=None, sort='LATEST', limit=10):
         params['tickers'] = ticker
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = rate_limited_get("alpha_vantage", base_url, params=params)
         data = response.json()
 
         if 'feed' in data:
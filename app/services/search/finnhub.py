@@ -2,6 +2,7 @@ import os
 import requests
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.rate_limit import rate_limited_get
 
 api_key = settings.FINNHUB_API_KEY
 
@@ -27,8 +28,7 @@ def fetch_general_news(category='general', limit=10):
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = rate_limited_get("finnhub", base_url, params=params)
         data = response.json()
 
         # Limit the number of articles returned
@@ -83,8 +83,7 @@ def fetch_company_news(symbol=None, from_date=None, to_date=None):
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = rate_limited_get("finnhub", base_url, params=params)
         data = response.json()
 
         news_items = []
@@ -2,6 +2,7 @@
 
 import requests
 from app.core.config import settings
+from app.core.rate_limit import rate_limited_get
 
 api_key = settings.NEWSAPI_KEY
 
@@ -30,8 +31,7 @@ def fetch_news(query="Indian stock market", sort="publishedAt", limit=10):
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = rate_limited_get("newsapi", base_url, params=params)
         data = response.json()
 
         if data.get("status") == "ok" and "articles" in data:
@@ -102,8 +102,7 @@ def fetch_indian_news(query=None, stock='company', sort="publishedAt", limit=10)
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = rate_limited_get("newsapi", base_url, params=params)
         data = response.json()
 
         if data.get("status") == "ok" and "articles" in data:
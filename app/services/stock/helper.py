@@ -1,7 +1,16 @@
 # app/tasks/ingestor.py
 import pandas as pd
-from typing import List, Optional 
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 import os
+import time
+import zlib
+from collections import deque
+from datetime import date, datetime
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from app.core import progress
+from app.core.config import settings
+from app.core.rate_limit import FetchContext, run_in_context
 from app.services.stock import yfinance_api
 # import yfinance_api
 
@@ -22,170 +31,400 @@ nifty50_symbols: List[str] = [
 
 OUTPUT_DIR = "data/nifty50_csvs"
 
-def fetch_stock_info() -> Optional[pd.DataFrame]:
+
+def resolve_symbols(symbols: Optional[Iterable[str]] = None) -> List[str]:
+    """Returns the requested symbols, or the Nifty 50 list when none are given."""
+    return list(symbols) if symbols is not None else list(nifty50_symbols)
+
+
+def shard_symbols(symbols: List[str], shard_count: int, shard_index: int) -> List[str]:
     """
-    Fetches general stock information for all Nifty 50 symbols and returns a DataFrame.
-    Returns None if yfinance_api is not available or no data is collected.
+    Returns the symbols that belong to shard `shard_index` of `shard_count`.
+    Assignment hashes the symbol (crc32), so it is stable across processes and a
+    symbol keeps its shard when others are added to or removed from the universe.
     """
-    if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest stock info.")
-        return None
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}.")
+    return [symbol for symbol in symbols if zlib.crc32(symbol.encode()) % shard_count == shard_index]
 
-    all_stock_info_dfs: List[pd.DataFrame] = []
 
-    for symbol in nifty50_symbols:
-        df = yfinance_api.stock(symbol)
-        if df is not None and not df.empty:
-            all_stock_info_dfs.append(df)
-        else:
-            print(f"  Skipping {symbol} for stock info (no data).")
+def _display(dataset: str) -> str:
+    """Readable name of a dataset key for log lines, e.g. 'stock_info' -> 'stock info'."""
+    return dataset.replace("_", " ")
 
-    if not all_stock_info_dfs:
-        print("No stock info data collected for any symbol.")
-        return None # Return None if no data was collected
 
-    combined_df = pd.concat(all_stock_info_dfs, ignore_index=True)
-    print("Stock info ingestion complete.")
-    return combined_df
+# How often a waiting consumer re-checks a fetch's provider-work time against its timeout
+_TIMEOUT_POLL_SECONDS = 0.5
 
 
-def fetch_daily_prices() -> Optional[pd.DataFrame]:
+def _wait_for_fetch(future: Future, context: FetchContext, timeout: float):
     """
-    Fetches daily historical prices for all Nifty 50 symbols and returns a DataFrame.
-    Returns None if yfinance_api is not available or no data is collected.
+    Waits for a fetch submitted with `run_in_context`. Only provider work counts
+    towards `timeout`: time queued for a worker, waiting for rate-limit tokens or
+    backing off between retries does not. On timeout the fetch is cancelled.
+    """
+    while True:
+        if future.done():
+            return future.result()
+        remaining = timeout - context.work_seconds()
+        if remaining <= 0:
+            context.cancel()
+            raise FutureTimeoutError()
+        try:
+            return future.result(timeout=min(remaining, _TIMEOUT_POLL_SECONDS))
+        except FutureTimeoutError:
+            continue
+
+
+def _iter_per_symbol(
+    fetcher: Callable[[str], Any],
+    dataset: str,
+    symbols: Iterable[str],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[str, Any]]:
     """
+    Lazily runs `fetcher` for every symbol on a bounded thread pool and yields
+    `(symbol, result)` pairs in the same order as `symbols`.
+    At most `2 * max_workers` fetches are in flight, so memory does not grow
+    with the size of the universe when results are consumed as they arrive.
+    Progress is reported under the `dataset` key.
+    A symbol that errors or spends more than `timeout` seconds on provider work
+    (rate-limit waits excluded) yields None and its fetch is cancelled.
+    """
+    max_workers = max_workers if max_workers is not None else settings.INGEST_MAX_WORKERS
+    timeout = timeout if timeout is not None else settings.INGEST_SYMBOL_TIMEOUT
+
+    if max_workers <= 1:
+        for symbol in symbols:
+            result, seconds, error_class = progress.timed_fetch(fetcher, symbol)
+            progress.symbol_fetched(dataset, symbol, result, seconds=seconds, error_class=error_class)
+            yield symbol, result
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def submit(symbol: str) -> Tuple[str, Future, FetchContext]:
+        context = FetchContext()
+        return symbol, executor.submit(run_in_context, context, progress.timed_fetch, fetcher, symbol), context
+
+    remaining = iter(symbols)
+    pending: Deque[Tuple[str, Future, FetchContext]] = deque(
+        submit(symbol) for symbol in islice(remaining, 2 * max_workers)
+    )
+    try:
+        while pending:
+            symbol, future, context = pending.popleft()
+            error = None
+            try:
+                result, seconds, error_class = _wait_for_fetch(future, context, timeout)
+            except FutureTimeoutError:
+                print(f"  Timed out fetching {_display(dataset)} for {symbol} after {timeout}s of provider work.")
+                result, error = None, f"timeout after {timeout}s"
+                seconds, error_class = timeout, "TimeoutError"
+            except Exception as e:
+                print(f"  An error occurred while fetching {_display(dataset)} for {symbol}: {e}")
+                result, error = None, f"{type(e).__name__}: {e}"
+                seconds, error_class = None, type(e).__name__
+            progress.symbol_fetched(dataset, symbol, result, error, seconds=seconds, error_class=error_class)
+            for next_symbol in islice(remaining, 1):
+                pending.append(submit(next_symbol))
+            yield symbol, result
+    finally:
+        # Stop the retry loops of fetches still running (their results would be discarded)
+        # and don't block on them.
+        for _, _, context in pending:
+            context.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_per_symbol(
+    fetcher: Callable[[str], Any],
+    dataset: str,
+    symbols: List[str],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """Runs `fetcher` for every symbol and returns the raw results in the same order as `symbols`."""
+    return [result for _, result in _iter_per_symbol(fetcher, dataset, symbols, max_workers, timeout)]
+
+
+def _fetch_symbols(
+    fetcher: Callable[[str], Optional[pd.DataFrame]],
+    dataset: str,
+    symbols: List[str],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[pd.DataFrame]:
+    """Runs `fetcher` for every symbol and keeps the non-empty DataFrames, in symbol order."""
+    results = _run_per_symbol(fetcher, dataset, symbols, max_workers, timeout)
+
+    collected: List[pd.DataFrame] = []
+    for symbol, df in zip(symbols, results):
+        if df is not None and not df.empty:
+            collected.append(df)
+        else:
+            print(f"  Skipping {symbol} for {_display(dataset)} (no data).")
+    return collected
+
+
+def _fetch_dataset(
+    fetcher: Callable[[str], Optional[pd.DataFrame]],
+    dataset: str,
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    """Fetches one dataset for `symbols` (default: Nifty 50) and concatenates the per-symbol frames."""
     if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest daily prices.")
+        print(f"yfinance_api is not available. Cannot ingest {_display(dataset)}.")
         return None
 
-    all_daily_prices_dfs: List[pd.DataFrame] = []
-
-    for symbol in nifty50_symbols:
-        df = yfinance_api.daily_prices(symbol)
-        if df is not None and not df.empty:
-            all_daily_prices_dfs.append(df)
-        else:
-            print(f"  Skipping {symbol} for daily prices (no data).")
+    dfs = _fetch_symbols(fetcher, dataset, resolve_symbols(symbols), max_workers, timeout)
 
-    if not all_daily_prices_dfs:
-        print("No daily prices data collected for any symbol.")
-        return None 
+    if not dfs:
+        print(f"No {_display(dataset)} data collected for any symbol.")
+        return None
 
-    combined_df = pd.concat(all_daily_prices_dfs, ignore_index=True)
-    print("Daily prices ingestion complete.")
+    started = time.perf_counter()
+    combined_df = pd.concat(dfs, ignore_index=True)
+    progress.transformed(dataset, time.perf_counter() - started, combined_df)
+    print(f"{_display(dataset).capitalize()} ingestion complete.")
     return combined_df
 
 
-def fetch_balance_sheet() -> Optional[pd.DataFrame]:
+def _fetch_statements(
+    statement: str,
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
     """
-    Fetches balance sheet data for all Nifty 50 symbols and returns a DataFrame.
-    Returns None if yfinance_api is not available or no data is collected.
+    Fetches the raw `statement` frames for `symbols` concurrently, then reshapes
+    all of them at once with `yfinance_api.normalize_statements`.
     """
-    if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest balance sheet.")
+    label = _display(statement)
+    symbols = resolve_symbols(symbols)
+    results = _run_per_symbol(
+        lambda symbol: yfinance_api.raw_statement(symbol, statement), statement, symbols, max_workers, timeout
+    )
+
+    started = time.perf_counter()
+    combined_df = yfinance_api.normalize_statements(statement, dict(zip(symbols, results)))
+    progress.transformed(statement, time.perf_counter() - started, combined_df)
+    if combined_df is None:
+        print(f"No {label} data collected for any symbol.")
         return None
+    print(f"{label.capitalize()} ingestion complete.")
+    return combined_df
 
-    all_balance_sheet_dfs: List[pd.DataFrame] = []
-
-    for symbol in nifty50_symbols:
-        df = yfinance_api.balance_sheet(symbol)
-        if df is not None and not df.empty:
-            all_balance_sheet_dfs.append(df)
-        else:
-            print(f"  Skipping {symbol} for balance sheet (no data).")
-
-    if not all_balance_sheet_dfs:
-        print("No balance sheet data collected for any symbol.")
-        return None
 
-    combined_df = pd.concat(all_balance_sheet_dfs, ignore_index=True)
-    print("Balance sheet ingestion complete.")
-    return combined_df
+def fetch_stock_info(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches general stock information for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
+    Returns None if yfinance_api is not available or no data is collected.
+    """
+    return _fetch_dataset(yfinance_api.stock, "stock_info", symbols, max_workers, timeout)
 
 
-def fetch_income_statement() -> Optional[pd.DataFrame]:
+def fetch_daily_prices(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    since: Optional[Dict[str, date]] = None,
+) -> Optional[pd.DataFrame]:
     """
-    Fetches income statement data for all Nifty 50 symbols and returns a DataFrame.
+    Fetches daily historical prices for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
+    `since` maps a symbol to the first date to fetch; symbols missing from it get the full year.
     Returns None if yfinance_api is not available or no data is collected.
     """
-    if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest income statement.")
-        return None
+    if since:
+        def fetcher(symbol: str) -> Optional[pd.DataFrame]:
+            return yfinance_api.daily_prices(symbol, start=since.get(symbol))
+    else:
+        fetcher = yfinance_api.daily_prices
+    return _fetch_dataset(fetcher, "daily_prices", symbols, max_workers, timeout)
+
+
+def fetch_intraday_prices(
+    symbols: Optional[List[str]] = None,
+    interval: str = "5m",
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    since: Optional[Dict[str, datetime]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches `interval` intraday bars for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
+    `since` maps a symbol to the first bar time to fetch; other symbols get the full available lookback.
+    """
+    since = since or {}
 
-    all_income_statement_dfs: List[pd.DataFrame] = []
+    def fetcher(symbol: str) -> Optional[pd.DataFrame]:
+        return yfinance_api.intraday_prices(symbol, interval, start=since.get(symbol))
+    return _fetch_dataset(fetcher, f"intraday_prices_{interval}", symbols, max_workers, timeout)
 
-    for symbol in nifty50_symbols:
-        df = yfinance_api.income_statement(symbol)
-        if df is not None and not df.empty:
-            all_income_statement_dfs.append(df)
-        else:
-            print(f"  Skipping {symbol} for income statement (no data).")
 
-    if not all_income_statement_dfs:
-        print("No income statement data collected for any symbol.")
-        return None # Return None if no data was collected
+def fetch_daily_prices_batched(
+    symbols: Optional[List[str]] = None,
+    batch_size: Optional[int] = None,
+    since: Optional[Dict[str, date]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches daily prices for `symbols` (default: all Nifty 50 symbols) using multi-ticker downloads of
+    `batch_size` symbols each, instead of one request per symbol.
+    `since` maps a symbol to the first date to fetch; symbols missing from it get the full year.
+    Returns None if no data is collected.
+    """
+    batch_size = batch_size or settings.INGEST_DOWNLOAD_BATCH_SIZE
+    since = since or {}
+    symbols = resolve_symbols(symbols)
+
+    dfs: List[pd.DataFrame] = []
+    for i in range(0, len(symbols), batch_size):
+        batch = symbols[i:i + batch_size]
+        # One request per batch: start from the earliest date any symbol in it needs
+        starts = [since.get(symbol) for symbol in batch]
+        start = None if None in starts else min(starts)
+        df, seconds, error_class = progress.timed_fetch(
+            lambda batch: yfinance_api.daily_prices_batch(batch, start=start), batch
+        )
+        for symbol in batch:
+            symbol_df = df[df["symbol"] == symbol] if df is not None else None
+            # One request served the whole batch, so each symbol gets an equal share of its latency
+            progress.symbol_fetched(
+                "daily_prices", symbol, symbol_df, seconds=seconds / len(batch), error_class=error_class
+            )
+        if df is None or df.empty:
+            continue
+        if start is not None:
+            symbol_starts = pd.to_datetime(df["symbol"].map(since))
+            dates = df["Date"].dt.tz_localize(None) if df["Date"].dt.tz is not None else df["Date"]
+            df = df[dates >= symbol_starts]
+        dfs.append(df)
+
+    if not dfs:
+        print("No daily prices data collected for any symbol.")
+        return None
 
-    # Ensure consistent columns before concatenating if possible
-    combined_df = pd.concat(all_income_statement_dfs, ignore_index=True)
-    print("Income statement ingestion complete.")
+    combined_df = pd.concat(dfs, ignore_index=True)
+    print("Daily prices ingestion complete.")
     return combined_df
 
 
-def fetch_cash_flow() -> Optional[pd.DataFrame]:
+def fetch_balance_sheet(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
     """
-    Fetches cash flow data for all Nifty 50 symbols and returns a DataFrame.
+    Fetches balance sheet data for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
     Returns None if yfinance_api is not available or no data is collected.
     """
-    if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest cash flow.")
-        return None
-
-    all_cash_flow_dfs: List[pd.DataFrame] = []
+    return _fetch_statements("balance_sheet", symbols, max_workers, timeout)
 
-    for symbol in nifty50_symbols:
-        df = yfinance_api.cash_flow(symbol)
-        if df is not None and not df.empty:
-            all_cash_flow_dfs.append(df)
-        else:
-            print(f"  Skipping {symbol} for cash flow (no data).")
 
-    if not all_cash_flow_dfs:
-        print("No cash flow data collected for any symbol.")
-        return None # Return None if no data was collected
-
-    # Ensure consistent columns before concatenating if possible
-    combined_df = pd.concat(all_cash_flow_dfs, ignore_index=True)
-    # print(combined_df.head()) 
-    print("Cash flow ingestion complete.")
-    return combined_df
+def fetch_income_statement(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches income statement data for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
+    Returns None if yfinance_api is not available or no data is collected.
+    """
+    return _fetch_statements("income_statement", symbols, max_workers, timeout)
 
 
-def fetch_current_prices() -> Optional[pd.DataFrame]:
+def fetch_cash_flow(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
     """
-    Fetches current price and change data for all Nifty 50 symbols and returns a combined DataFrame.
+    Fetches cash flow data for `symbols` (default: all Nifty 50 symbols) and returns a DataFrame.
     Returns None if yfinance_api is not available or no data is collected.
     """
-    if yfinance_api is None:
-        print("yfinance_api is not available. Cannot ingest current prices.")
-        return None
+    return _fetch_statements("cash_flow", symbols, max_workers, timeout)
 
-    all_current_price_dfs: List[pd.DataFrame] = []
 
-    for symbol in nifty50_symbols:
-        df = yfinance_api.current(symbol)
+def fetch_current_prices(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetches current price and change data for `symbols` (default: all Nifty 50 symbols) and returns a combined DataFrame.
+    Returns None if yfinance_api is not available or no data is collected.
+    """
+    return _fetch_dataset(yfinance_api.current, "current_prices", symbols, max_workers, timeout)
+
+
+# Per-symbol yfinance fetcher for each dataset, used by the streaming pipeline.
+DATASET_FETCHERS: Dict[str, Callable[[str], Optional[pd.DataFrame]]] = {
+    "stock_info": yfinance_api.stock,
+    "balance_sheet": yfinance_api.balance_sheet,
+    "income_statement": yfinance_api.income_statement,
+    "cash_flow": yfinance_api.cash_flow,
+    "current_prices": yfinance_api.current,
+    "daily_prices": yfinance_api.daily_prices,
+}
+
+
+def iter_dataset_frames(
+    dataset: str,
+    symbols: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields one non-empty DataFrame per symbol (default: Nifty 50) for `dataset` as soon as it
+    is fetched, without collecting the whole universe in memory.
+    """
+    fetcher = DATASET_FETCHERS[dataset]
+    for symbol, df in _iter_per_symbol(fetcher, dataset, resolve_symbols(symbols), max_workers, timeout):
         if df is not None and not df.empty:
-            all_current_price_dfs.append(df)
+            yield df
         else:
-            print(f"  Skipping {symbol} for current price (no data or error).")
+            print(f"  Skipping {symbol} for {_display(dataset)} (no data).")
 
-    if not all_current_price_dfs:
-        print("No current price or change data collected for any symbol.")
-        return None 
 
-    # Concatenate all collected DataFrames
-    combined_df = pd.concat(all_current_price_dfs, ignore_index=True)
-    print("Current price and change ingestion complete.")
-    return combined_df
+def fetch_symbol_bundles(
+    symbols: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Fetches stock info, balance sheet, income statement, cash flow and current
+    prices for `symbols` (default: all Nifty 50 symbols) in a single pass, reusing one yf.Ticker per symbol.
+
+    Returns a dict keyed by dataset name (see `yfinance_api.BUNDLE_DATASETS`);
+    each value is the combined DataFrame, or None if no data was collected.
+    """
+    symbols = resolve_symbols(symbols)
+    combined: Dict[str, Optional[pd.DataFrame]] = dict.fromkeys(yfinance_api.BUNDLE_DATASETS)
+    bundles = _run_per_symbol(yfinance_api.symbol_bundle, "symbol_bundle", symbols, max_workers, timeout)
+
+    for dataset in yfinance_api.BUNDLE_DATASETS:
+        dfs: List[pd.DataFrame] = []
+        for symbol, bundle in zip(symbols, bundles):
+            df = bundle.get(dataset) if bundle else None
+            if df is not None and not df.empty:
+                dfs.append(df)
+            else:
+                print(f"  Skipping {symbol} for {_display(dataset)} (no data).")
+        if dfs:
+            started = time.perf_counter()
+            combined[dataset] = pd.concat(dfs, ignore_index=True)
+            progress.transformed(dataset, time.perf_counter() - started, combined[dataset])
+        else:
+            print(f"No {_display(dataset)} data collected for any symbol.")
+
+    print("Symbol bundle ingestion complete.")
+    return combined
 
 
 # # --- Main Execution Block ---
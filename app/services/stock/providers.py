@@ -0,0 +1,272 @@
+# app/services/stock/providers.py
+"""
+Market data providers behind `yfinance_api`.
+
+`yfinance_api` only talks to a provider through two calls that mirror the
+yfinance API it was written against:
+
+    provider.ticker(symbol)          -> object with `.info`, `.history(**kwargs)`
+                                        and the statement attributes
+                                        (`balance_sheet`, `financials`, ...)
+    provider.download(symbols, ...)  -> wide multi-ticker frame like `yf.download`
+
+Implementations, selected with DATA_PROVIDER:
+
+    live    - yfinance over the network (default)
+    record  - live, and every response is also saved under PROVIDER_RECORDINGS_DIR
+    replay  - serves the saved responses from disk without any network access,
+              after an artificial latency of REPLAY_LATENCY_SECONDS
+              (+/- REPLAY_LATENCY_JITTER, seeded by REPLAY_SEED)
+
+Price histories from every `history`/`download` call are merged into one
+recording per symbol and interval, so incremental and batched fetches extend
+it rather than replace it. Record a universe once, then benchmark ingestion concurrency, batching and
+write paths repeatably on a machine with no network. Recordings are pickles
+and must only be loaded from trusted directories.
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from app.core.config import settings
+
+# Statement attributes a ticker exposes (see yfinance_api.STATEMENTS).
+STATEMENT_ATTRS = (
+    "balance_sheet", "financials", "quarterly_financials", "cashflow", "quarterly_cashflow",
+)
+
+
+class LiveProvider:
+    """yfinance over the network."""
+    name = "live"
+    rate_limit_key = "yfinance"
+
+    def ticker(self, symbol: str):
+        return yf.Ticker(symbol)
+
+    def download(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        return yf.download(symbols, **kwargs)
+
+
+class Recordings:
+    """File layout of a recordings directory: <dir>/<symbol>/<name>.pkl and info.json."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str, name: str) -> str:
+        return os.path.join(self.directory, symbol, name)
+
+    def save_info(self, symbol: str, info: Optional[Dict[str, Any]]):
+        os.makedirs(os.path.join(self.directory, symbol), exist_ok=True)
+        with open(self.path(symbol, "info.json"), "w") as f:
+            json.dump(info, f, default=str)
+
+    def load_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with open(self.path(symbol, "info.json")) as f:
+            return json.load(f)
+
+    def save_frame(self, symbol: str, name: str, df: pd.DataFrame):
+        os.makedirs(os.path.join(self.directory, symbol), exist_ok=True)
+        df.to_pickle(self.path(symbol, f"{name}.pkl"))
+
+    def load_frame(self, symbol: str, name: str) -> pd.DataFrame:
+        return pd.read_pickle(self.path(symbol, f"{name}.pkl"))
+
+    def merge_history(self, symbol: str, name: str, df: pd.DataFrame):
+        """
+        Merges bars into a saved history, so an incremental or batched fetch adds to
+        the recording instead of replacing it. Bars already recorded are overwritten
+        by newer ones at the same timestamp.
+        """
+        with self._lock:
+            try:
+                recorded = self.load_frame(symbol, name)
+            except FileNotFoundError:
+                recorded = None
+            if recorded is not None and not recorded.empty:
+                if df.empty:
+                    return
+                df = pd.concat([recorded, _align_tz(df, recorded.index.tz)])
+                df = df[~df.index.duplicated(keep="last")].sort_index()
+            self.save_frame(symbol, name, df)
+
+
+def _history_name(interval: str) -> str:
+    return f"history_{interval}"
+
+
+def _align_tz(df: pd.DataFrame, tz) -> pd.DataFrame:
+    """`df` with its index in `tz` (yf.download dates are naive, Ticker.history's are not)."""
+    if df.index.tz is None and tz is not None:
+        return df.tz_localize(tz)
+    if df.index.tz is not None:
+        return df.tz_convert(tz) if tz is not None else df.tz_localize(None)
+    return df
+
+
+class _RecordingTicker:
+    """A live yf.Ticker whose responses are written to disk as they are read."""
+
+    def __init__(self, symbol: str, recordings: Recordings):
+        self._symbol = symbol
+        self._ticker = yf.Ticker(symbol)
+        self._recordings = recordings
+
+    @property
+    def info(self):
+        info = self._ticker.info
+        self._recordings.save_info(self._symbol, info)
+        return info
+
+    def history(self, **kwargs) -> pd.DataFrame:
+        df = self._ticker.history(**kwargs)
+        self._recordings.merge_history(self._symbol, _history_name(kwargs.get("interval", "1d")), df)
+        return df
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._ticker, attr)
+        if attr in STATEMENT_ATTRS:
+            self._recordings.save_frame(self._symbol, attr, value)
+        return value
+
+
+class RecordingProvider(LiveProvider):
+    """Live yfinance that also saves every response for later replay."""
+    name = "record"
+
+    def __init__(self, directory: str):
+        self.recordings = Recordings(directory)
+
+    def ticker(self, symbol: str):
+        return _RecordingTicker(symbol, self.recordings)
+
+    def download(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        raw = super().download(symbols, **kwargs)
+        # Saved per symbol, like a daily `history`, so replay can serve any batch split
+        if raw is not None and not raw.empty:
+            for symbol in raw.columns.get_level_values(1).unique():
+                df = raw.xs(symbol, axis=1, level=1).dropna(how="all")
+                self.recordings.merge_history(symbol, _history_name(kwargs.get("interval", "1d")), df)
+        return raw
+
+
+class _ReplayTicker:
+    def __init__(self, symbol: str, provider: "ReplayProvider"):
+        self._symbol = symbol
+        self._provider = provider
+
+    @property
+    def info(self):
+        self._provider.wait()
+        return self._provider.recordings.load_info(self._symbol)
+
+    def history(self, interval: str = "1d", start=None, end=None, **kwargs) -> pd.DataFrame:
+        self._provider.wait()
+        df = self._provider.recordings.load_frame(self._symbol, _history_name(interval))
+        return _slice_history(df, start, end)
+
+    def __getattr__(self, attr: str):
+        if attr not in STATEMENT_ATTRS:
+            raise AttributeError(attr)
+        self._provider.wait()
+        return self._provider.recordings.load_frame(self._symbol, attr)
+
+
+def _slice_history(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Applies `start`/`end` the way yfinance does; `period` is ignored (the whole recording is served)."""
+    if df.empty:
+        return df
+    tz = df.index.tz
+    if start is not None:
+        start = pd.Timestamp(start)
+        start = start.tz_localize(tz) if start.tzinfo is None and tz is not None else start
+        df = df[df.index >= start]
+    if end is not None:
+        end = pd.Timestamp(end)
+        end = end.tz_localize(tz) if end.tzinfo is None and tz is not None else end
+        df = df[df.index < end]
+    return df
+
+
+class ReplayProvider:
+    """Serves recorded responses from disk after an artificial, reproducible latency."""
+    name = "replay"
+    rate_limit_key = "replay"
+
+    def __init__(self, directory: str, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No provider recordings at '{directory}'; record them with DATA_PROVIDER=record.")
+        self.recordings = Recordings(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if self.latency <= 0 and self.jitter <= 0:
+            return
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, delay))
+
+    def ticker(self, symbol: str):
+        return _ReplayTicker(symbol, self)
+
+    def download(self, symbols: List[str], interval: str = "1d", start=None, end=None, **kwargs) -> pd.DataFrame:
+        # One request for the whole batch, as with yf.download
+        self.wait()
+        frames = {}
+        for symbol in symbols:
+            try:
+                frames[symbol] = _slice_history(
+                    self.recordings.load_frame(symbol, _history_name(interval)), start, end
+                )
+            except FileNotFoundError:
+                continue
+        if not frames:
+            return pd.DataFrame()
+        # (Date) x (ticker, field)  ->  (Date) x (field, ticker), like group_by='column'
+        return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def _create_provider():
+    if settings.DATA_PROVIDER == "live":
+        return LiveProvider()
+    if settings.DATA_PROVIDER == "record":
+        return RecordingProvider(settings.PROVIDER_RECORDINGS_DIR)
+    if settings.DATA_PROVIDER == "replay":
+        return ReplayProvider(
+            settings.PROVIDER_RECORDINGS_DIR,
+            latency=settings.REPLAY_LATENCY_SECONDS,
+            jitter=settings.REPLAY_LATENCY_JITTER,
+            seed=settings.REPLAY_SEED,
+        )
+    raise ValueError(f"Unknown DATA_PROVIDER '{settings.DATA_PROVIDER}'; use live, record or replay.")
+
+
+def get_provider():
+    """Returns the process-wide provider selected by DATA_PROVIDER."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = _create_provider()
+        return _provider
+
+
+def set_provider(provider):
+    """Replaces the process-wide provider, e.g. with a ReplayProvider in a benchmark."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -1,12 +1,32 @@
-import yfinance as yf
 import pandas as pd
+from datetime import date, datetime, timedelta, timezone
+from app.core import progress
+from app.core.rate_limit import call_with_retry
+from app.services.stock.providers import get_provider
+
+def _provider_call(func, *args, **kwargs):
+    """Calls the data provider under its rate limit and retry policy."""
+    return call_with_retry(get_provider().rate_limit_key, func, *args, **kwargs)
+
+
+# Datasets returned by `symbol_bundle`, in ingestion order.
+BUNDLE_DATASETS = ('stock_info', 'balance_sheet', 'income_statement', 'cash_flow', 'current_prices')
 
 def stock(symbol: str) -> pd.DataFrame | None:
     """Fetches company info for a given symbol and returns a DataFrame with key fields."""
     print(f"Fetching stock info for {symbol}...")
     try:
-        ticker_obj = yf.Ticker(symbol) # Instantiate Ticker inside the function
-        info = ticker_obj.info
+        ticker_obj = get_provider().ticker(symbol) # Instantiate Ticker inside the function
+        return _stock_from_info(symbol, _provider_call(lambda: ticker_obj.info))
+    except Exception as e:
+        print(f"  An error occurred while fetching stock info for {symbol}: {e}")
+        progress.fetch_error(e)
+        return None
+
+
+def _stock_from_info(symbol: str, info: dict | None) -> pd.DataFrame | None:
+    """Builds the stock info frame from an already fetched `Ticker.info` dict."""
+    try:
         if not info:
             print(f"  Warning: Could not fetch info for {symbol}. Returning None.")
             return None
@@ -34,16 +54,23 @@ def stock(symbol: str) -> pd.DataFrame | None:
 
     except Exception as e:
         print(f"  An error occurred while fetching stock info for {symbol}: {e}")
+        progress.fetch_error(e)
         return None
 
 
-def daily_prices(symbol: str) -> pd.DataFrame | None:
-    """Fetches historical daily prices for a given symbol and returns a DataFrame with key fields."""
+def daily_prices(symbol: str, start: date | None = None) -> pd.DataFrame | None:
+    """
+    Fetches historical daily prices for a given symbol and returns a DataFrame with key fields.
+    Fetches the last year by default, or every bar from `start` (inclusive) when given.
+    """
     print(f"Fetching daily prices for {symbol}...")
     try:
-        ticker_obj = yf.Ticker(symbol) 
-        # Fetch historical data (e.g., for the last 1y available period)
-        hist_data = ticker_obj.history(period="1y")
+        ticker_obj = get_provider().ticker(symbol) 
+        if start is not None:
+            hist_data = _provider_call(ticker_obj.history, start=start.isoformat())
+        else:
+            # Fetch historical data (e.g., for the last 1y available period)
+            hist_data = _provider_call(ticker_obj.history, period="1y")
 
         if hist_data.empty:
             print(f"  Warning: No historical data found for {symbol}. Returning None.")
@@ -69,150 +96,183 @@ def daily_prices(symbol: str) -> pd.DataFrame | None:
 
     except Exception as e:
         print(f"  An error occurred while fetching daily prices for {symbol}: {e}")
+        progress.fetch_error(e)
         return None
 
 
+DAILY_PRICE_COLS = ['symbol', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume']
 
-def balance_sheet(symbol: str) -> pd.DataFrame | None:
-    """Fetches balance sheet data for a given symbol and returns a DataFrame with key fields."""
-    print(f"Fetching balance sheet for {symbol}...")
+
+def daily_prices_batch(symbols: list[str], start: date | None = None) -> pd.DataFrame | None:
+    """
+    Fetches daily prices for many symbols with one multi-ticker `yf.download` call.
+
+    The wide (field, ticker) frame is stacked into the long
+    symbol, Date, Open, High, Low, Close, Volume layout returned by `daily_prices`.
+    Fetches the last year by default, or every bar from `start` (inclusive) when given.
+    """
+    print(f"Fetching daily prices for {len(symbols)} symbols in one batch...")
     try:
-        ticker_obj = yf.Ticker(symbol)  # Instantiate Ticker inside the function
-        balance_sheet_data = ticker_obj.balance_sheet
-        if balance_sheet_data.empty:
-            print(f"  Warning: Could not fetch balance sheet for {symbol}. Returning None.")
+        kwargs = {'start': start.isoformat()} if start is not None else {'period': '1y'}
+        raw = _provider_call(
+            get_provider().download,
+            symbols, group_by='column', auto_adjust=True, threads=True,
+            progress=False, multi_level_index=True, **kwargs
+        )
+        if raw is None or raw.empty:
+            print("  Warning: No historical data found for batch. Returning None.")
             return None
 
-        # Transpose and reset index, renaming the index column to "Date"
-        bs_df = balance_sheet_data.T.reset_index().rename(columns={"index": "Date"})
+        # (Date) x (field, ticker)  ->  (Date, ticker) x (field)
+        long_df = raw.stack(level=1, future_stack=True).rename_axis(['Date', 'symbol']).reset_index()
+        # Tickers with no bar on a date come back as all-NaN rows
+        long_df = long_df.dropna(subset=['Open', 'High', 'Low', 'Close'], how='all')
+        long_df = long_df.reindex(columns=DAILY_PRICE_COLS).rename_axis(columns=None)
+        long_df = long_df.sort_values(['symbol', 'Date'], ignore_index=True)
 
-        # Add the symbol column
-        if 'symbol' not in bs_df.columns:
-            bs_df.insert(0, 'symbol', symbol)  # Insert symbol at the beginning
-
-        # Create a mapping from Yahoo Finance column names to our new database column names
-        column_mapping = {
-            'Total Assets': 'total_assets',
-            'Total Debt': 'total_debt',
-            'Stockholders Equity': 'stockholders_equity',
-            'Cash And Cash Equivalents': 'cash_and_cash_equivalents'
-        }
-        
-        # Create a new DataFrame with our desired column structure
-        result_df = pd.DataFrame()
-        result_df['symbol'] = bs_df['symbol']
-        result_df['Date'] = bs_df['Date']
-        
-        # Map the columns using our mapping
-        for original_col, new_col in column_mapping.items():
-            if original_col in bs_df.columns:
-                result_df[new_col] = bs_df[original_col]
-            else:
-                result_df[new_col] = None  # Add column with NULLs if not available
-
-        print(f"  Successfully fetched balance sheet for {symbol}.")
-        return result_df
+        print(f"  Successfully fetched daily prices for {long_df['symbol'].nunique()} of {len(symbols)} symbols.")
+        return long_df
 
     except Exception as e:
-        print(f"  An error occurred while fetching balance sheet for {symbol}: {e}")
+        print(f"  An error occurred while fetching daily prices batch: {e}")
+        progress.fetch_error(e)
         return None
-    
-def income_statement(symbol: str) -> pd.DataFrame | None:
-    """Fetches income statement data for a given symbol and returns a DataFrame with key fields."""
-    print(f"Fetching income statement for {symbol}...")
+
+
+
+INTRADAY_PRICE_COLS = ['symbol', 'interval', 'Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']
+# How far back Yahoo Finance serves each intraday interval (1m is limited to ~7 days per request).
+INTRADAY_LOOKBACK_DAYS = {'1m': 7, '5m': 59}
+
+
+def intraday_prices(symbol: str, interval: str = '5m', start: datetime | None = None) -> pd.DataFrame | None:
+    """
+    Fetches intraday bars (`interval` '1m' or '5m') for a given symbol, as far back as
+    Yahoo Finance allows, or from `start` (inclusive) when given. Bar times are returned in UTC.
+    """
+    print(f"Fetching {interval} intraday prices for {symbol}...")
     try:
-        ticker_obj = yf.Ticker(symbol)  # Instantiate Ticker inside the function
-        income_stmt_data = ticker_obj.financials  # financials method gets annual income statement
-        if income_stmt_data.empty:
-            # Try quarterly if annual is empty
-            income_stmt_data = ticker_obj.quarterly_financials
-            if income_stmt_data.empty:
-                print(f"  Warning: Could not fetch income statement (annual or quarterly) for {symbol}. Returning None.")
-                return None
+        earliest = datetime.now(timezone.utc) - timedelta(days=INTRADAY_LOOKBACK_DAYS[interval])
+        start = max(start, earliest) if start is not None else earliest
+        ticker_obj = get_provider().ticker(symbol)
+        hist_data = _provider_call(ticker_obj.history, interval=interval, start=start)
 
-        # Transpose and reset index, renaming the index column to "Date"
-        is_df = income_stmt_data.T.reset_index().rename(columns={"index": "Date"})
+        if hist_data.empty:
+            print(f"  Warning: No {interval} intraday data found for {symbol}. Returning None.")
+            return None
 
-        # Add the symbol column
-        if 'symbol' not in is_df.columns:
-            is_df.insert(0, 'symbol', symbol)  # Insert symbol at the beginning
-
-        # Create a mapping from Yahoo Finance column names to our new database column names
-        column_mapping = {
-            'Total Revenue': 'total_revenue',
-            'Gross Profit': 'gross_profit',
-            'Operating Income': 'operating_income',
-            'Net Income': 'net_income',
-            'Basic EPS': 'basic_eps',
-            'Diluted EPS': 'diluted_eps'
-        }
-        
-        # Create a new DataFrame with our desired column structure
-        result_df = pd.DataFrame()
-        result_df['symbol'] = is_df['symbol']
-        result_df['Date'] = is_df['Date']
-        
-        # Map the columns using our mapping
-        for original_col, new_col in column_mapping.items():
-            if original_col in is_df.columns:
-                result_df[new_col] = is_df[original_col]
-            else:
-                result_df[new_col] = None  # Add column with NULLs if not available
-
-        print(f"  Successfully fetched income statement for {symbol}.")
-        return result_df
+        intraday_df = hist_data.rename_axis('Datetime').reset_index()
+        intraday_df['Datetime'] = pd.to_datetime(intraday_df['Datetime'], utc=True)
+        intraday_df.insert(0, 'symbol', symbol)
+        intraday_df.insert(1, 'interval', interval)
+        intraday_df = intraday_df.reindex(columns=INTRADAY_PRICE_COLS)
+
+        print(f"  Successfully fetched {len(intraday_df)} {interval} bars for {symbol}.")
+        return intraday_df
 
     except Exception as e:
-        print(f"  An error occurred while fetching income statement for {symbol}: {e}")
+        print(f"  An error occurred while fetching {interval} intraday prices for {symbol}: {e}")
+        progress.fetch_error(e)
         return None
 
 
-def cash_flow(symbol: str) -> pd.DataFrame | None:
-    """Fetches cash flow data for a given symbol and returns a DataFrame with key fields."""
-    print(f"Fetching cash flow for {symbol}...")
+# Per statement: Ticker attribute for annual data, quarterly fallback attribute
+# (None = no fallback), and the Yahoo Finance line item -> DB column mapping.
+STATEMENTS = {
+    'balance_sheet': ('balance_sheet', None, {
+        'Total Assets': 'total_assets',
+        'Total Debt': 'total_debt',
+        'Stockholders Equity': 'stockholders_equity',
+        'Cash And Cash Equivalents': 'cash_and_cash_equivalents'
+    }),
+    'income_statement': ('financials', 'quarterly_financials', {
+        'Total Revenue': 'total_revenue',
+        'Gross Profit': 'gross_profit',
+        'Operating Income': 'operating_income',
+        'Net Income': 'net_income',
+        'Basic EPS': 'basic_eps',
+        'Diluted EPS': 'diluted_eps'
+    }),
+    'cash_flow': ('cashflow', 'quarterly_cashflow', {
+        'Operating Cash Flow': 'operating_cash_flow',
+        'Capital Expenditure': 'capital_expenditure',
+        'Free Cash Flow': 'free_cash_flow',
+        'Cash Dividends Paid': 'cash_dividends_paid'
+    }),
+}
+
+
+def normalize_statements(statement: str, raw_frames: dict[str, pd.DataFrame | None]) -> pd.DataFrame | None:
+    """
+    Reshapes raw yfinance statement frames (line items x period dates) for many
+    symbols into one `symbol, Date, <columns>` frame in a single pass:
+    one concat, one transpose, one `reindex` to select and rename the mapped
+    line items. Missing line items and NaN values become None, ready to be
+    stored as NULL.
+    """
+    column_mapping = STATEMENTS[statement][2]
+    frames = {symbol: df for symbol, df in raw_frames.items() if df is not None and not df.empty}
+    if not frames:
+        return None
+
+    # (line item) x (symbol, Date)  ->  (symbol, Date) x (line item)
+    wide = pd.concat(frames, axis=1, names=['symbol', 'Date']).T
+    result_df = (
+        wide.reindex(columns=list(column_mapping))
+        .rename(columns=column_mapping)
+        .rename_axis(columns=None)
+        .reset_index()
+    )
+    return result_df.astype(object).where(result_df.notna(), None)
+
+
+def _raw_statement_from_ticker(symbol: str, ticker_obj, statement: str) -> pd.DataFrame | None:
+    """Reads a raw statement from an existing Ticker, falling back to quarterly data if annual is empty."""
+    annual_attr, quarterly_attr, _ = STATEMENTS[statement]
+    label = statement.replace('_', ' ')
     try:
-        ticker_obj = yf.Ticker(symbol) # Instantiate Ticker inside the function
-        cash_flow_data = ticker_obj.cashflow
-        if cash_flow_data.empty:
+        data = _provider_call(getattr, ticker_obj, annual_attr)
+        if data.empty and quarterly_attr:
             # Try quarterly if annual is empty
-            cash_flow_data = ticker_obj.quarterly_cashflow
-            if cash_flow_data.empty:
-                print(f"  Warning: Could not fetch cash flow (annual or quarterly) for {symbol}. Returning None.")
-                return None
+            data = _provider_call(getattr, ticker_obj, quarterly_attr)
+        if data.empty:
+            print(f"  Warning: Could not fetch {label} for {symbol}. Returning None.")
+            return None
+        print(f"  Successfully fetched {label} for {symbol}.")
+        return data
 
-        # Transpose and reset index, renaming the index column to "Date"
-        cf_df = cash_flow_data.T.reset_index().rename(columns={"index": "Date"})
+    except Exception as e:
+        print(f"  An error occurred while fetching {label} for {symbol}: {e}")
+        progress.fetch_error(e)
+        return None
 
-        # Add the symbol column
-        if 'symbol' not in cf_df.columns:
-            cf_df.insert(0, 'symbol', symbol) # Insert symbol at the beginning
-
-        # Create a mapping from Yahoo Finance column names to our new database column names
-        column_mapping = {
-            'Operating Cash Flow': 'operating_cash_flow',
-            'Capital Expenditure': 'capital_expenditure', 
-            'Free Cash Flow': 'free_cash_flow',
-            'Cash Dividends Paid': 'cash_dividends_paid'
-        }
-        
-        # Create a new DataFrame with our desired column structure
-        result_df = pd.DataFrame()
-        result_df['symbol'] = cf_df['symbol']
-        result_df['Date'] = cf_df['Date']
-        
-        # Map the columns using our mapping
-        for original_col, new_col in column_mapping.items():
-            if original_col in cf_df.columns:
-                result_df[new_col] = cf_df[original_col]
-            else:
-                result_df[new_col] = None  # Add column with NULLs if not available
-        
-        print(f"  Successfully fetched cash flow for {symbol}.")
-        return result_df
 
+def raw_statement(symbol: str, statement: str) -> pd.DataFrame | None:
+    """Fetches the raw yfinance frame of `statement` ('balance_sheet', 'income_statement' or 'cash_flow')."""
+    print(f"Fetching {statement.replace('_', ' ')} for {symbol}...")
+    try:
+        ticker_obj = get_provider().ticker(symbol)  # Instantiate Ticker inside the function
+        return _raw_statement_from_ticker(symbol, ticker_obj, statement)
     except Exception as e:
-        print(f"  An error occurred while fetching cash flow for {symbol}: {e}")
-        return None   
+        print(f"  An error occurred while fetching {statement.replace('_', ' ')} for {symbol}: {e}")
+        progress.fetch_error(e)
+        return None
+
+
+def balance_sheet(symbol: str) -> pd.DataFrame | None:
+    """Fetches balance sheet data for a given symbol and returns a DataFrame with key fields."""
+    return normalize_statements('balance_sheet', {symbol: raw_statement(symbol, 'balance_sheet')})
+
+
+def income_statement(symbol: str) -> pd.DataFrame | None:
+    """Fetches income statement data for a given symbol and returns a DataFrame with key fields."""
+    return normalize_statements('income_statement', {symbol: raw_statement(symbol, 'income_statement')})
+
+
+def cash_flow(symbol: str) -> pd.DataFrame | None:
+    """Fetches cash flow data for a given symbol and returns a DataFrame with key fields."""
+    return normalize_statements('cash_flow', {symbol: raw_statement(symbol, 'cash_flow')})
+
 
 def current(symbol: str) -> pd.DataFrame | None:
     """
@@ -223,9 +283,17 @@ def current(symbol: str) -> pd.DataFrame | None:
     """
     print(f"Fetching current price and change for {symbol}...")
     try:
-        ticker_obj = yf.Ticker(symbol)
-        info = ticker_obj.info
+        ticker_obj = get_provider().ticker(symbol)
+        return _current_from_info(symbol, _provider_call(lambda: ticker_obj.info))
+    except Exception as e:
+        print(f"  An error occurred while fetching current price and change for {symbol}: {e}")
+        progress.fetch_error(e)
+        return None
 
+
+def _current_from_info(symbol: str, info: dict | None) -> pd.DataFrame | None:
+    """Builds the current price frame from an already fetched `Ticker.info` dict."""
+    try:
         # Ensure essential keys are present
         if not info or info.get('currentPrice') is None or info.get('previousClose') is None or info.get('shortName') is None:
             print(f"  Warning: Could not fetch essential price info or name for {symbol}. Returning None.")
@@ -270,9 +338,39 @@ def current(symbol: str) -> pd.DataFrame | None:
 
     except Exception as e:
         print(f"  An error occurred while fetching current price and change for {symbol}: {e}")
+        progress.fetch_error(e)
         return None
 
 
+def symbol_bundle(symbol: str) -> dict[str, pd.DataFrame | None]:
+    """
+    Fetches stock info, the three financial statements and the current quote
+    for a symbol from a single Ticker, so session setup and `.info` are shared.
+
+    Returns a dict keyed by dataset name ('stock_info', 'balance_sheet',
+    'income_statement', 'cash_flow', 'current_prices'); a dataset that could
+    not be fetched maps to None.
+    """
+    print(f"Fetching symbol bundle for {symbol}...")
+    bundle: dict[str, pd.DataFrame | None] = dict.fromkeys(BUNDLE_DATASETS)
+    ticker_obj, info = None, None
+    try:
+        ticker_obj = get_provider().ticker(symbol)
+        info = _provider_call(lambda: ticker_obj.info)
+    except Exception as e:
+        print(f"  An error occurred while fetching info for {symbol}: {e}")
+        progress.fetch_error(e)
+
+    bundle['stock_info'] = _stock_from_info(symbol, info)
+    bundle['current_prices'] = _current_from_info(symbol, info)
+    # The statements come from their own endpoints, so a failed `.info` does not skip them
+    if ticker_obj is not None:
+        for statement in STATEMENTS:
+            raw = _raw_statement_from_ticker(symbol, ticker_obj, statement)
+            bundle[statement] = normalize_statements(statement, {symbol: raw})
+    return bundle
+
+
 # # --- Main Execution ---
 # if __name__ == "__main__":
 #     STOCK_SYMBOL = "AAPL" # Change this to your desired stock symbol
@@ -1,83 +1,134 @@
 import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, BigInteger, Numeric
+from app.core.config import settings
+from app.models.stock import (
+    StockInfo, BalanceSheet, IncomeStatement,
+    CashFlow, DailyPrice, CurrentPrice
+)
 from app.services.stock.helper import (
     fetch_balance_sheet,
     fetch_cash_flow,
     fetch_daily_prices,
     fetch_income_statement,
     fetch_stock_info,
-    fetch_current_prices
+    fetch_current_prices,
+    fetch_symbol_bundles
 )
 
-OUTPUT_DIR = "data/nifty50_csvs"
+OUTPUT_DIR = settings.SNAPSHOT_DIR
+MANIFEST_FILE = "manifest.json"
+
+# Table model of each dataset; the snapshot schema follows the table's column types.
+DATASET_MODELS = {
+    "stock_info": StockInfo,
+    "balance_sheet": BalanceSheet,
+    "income_statement": IncomeStatement,
+    "cash_flow": CashFlow,
+    "current_prices": CurrentPrice,
+    "daily_prices": DailyPrice,
+}
+
+
+def _typed_frame(model, df: pd.DataFrame) -> pd.DataFrame:
+    """Keeps `model`'s columns and casts them to the table's types, so a snapshot reloads without guessing."""
+    table = model.__table__
+    out = df[[col for col in df.columns if col in table.c]].copy()
+    for name in out.columns:
+        col_type = table.c[name].type
+        if isinstance(col_type, Date):
+            out[name] = pd.to_datetime(out[name]).dt.date
+        elif isinstance(col_type, DateTime):
+            out[name] = pd.to_datetime(out[name])
+        elif isinstance(col_type, (Integer, BigInteger)):
+            out[name] = pd.to_numeric(out[name], errors="coerce").round().astype("Int64")
+        elif isinstance(col_type, (Float, Numeric)):
+            out[name] = pd.to_numeric(out[name], errors="coerce").astype("float64")
+        elif isinstance(col_type, Boolean):
+            out[name] = out[name].astype("boolean")
+        else:
+            out[name] = out[name].astype("string")
+    return out
+
+
+def snapshot_path(directory: str, dataset: str) -> str:
+    return os.path.join(directory, f"{dataset}.parquet")
+
+
+def save_dataset(dataset: str, df: Optional[pd.DataFrame], directory: str = OUTPUT_DIR) -> Optional[str]:
+    """Writes `df` as a typed, zstd-compressed Parquet file for `dataset` under `directory`."""
+    if df is None or df.empty:
+        print(f"No {dataset} DataFrame to save.")
+        return None
+    os.makedirs(directory, exist_ok=True)
+    file_path = snapshot_path(directory, dataset)
+    try:
+        _typed_frame(DATASET_MODELS[dataset], df).to_parquet(file_path, index=False, compression="zstd")
+        print(f"Successfully saved {dataset} ({len(df)} rows) to {file_path}")
+        return file_path
+    except Exception as e:
+        print(f"Error saving {dataset} snapshot: {e}")
+        return None
+
+
+def read_snapshot(directory: str, dataset: str) -> Optional[pd.DataFrame]:
+    """Reads one dataset from a snapshot directory; None if the snapshot does not contain it."""
+    file_path = snapshot_path(directory, dataset)
+    if not os.path.exists(file_path):
+        return None
+    return pd.read_parquet(file_path)
+
+
+def write_snapshot(symbols: Optional[List[str]] = None, directory: Optional[str] = None) -> str:
+    """
+    Fetches every dataset for `symbols` (default: Nifty 50) and writes them as one
+    snapshot directory (default: a new timestamped directory under OUTPUT_DIR).
+    Returns the directory; load it back with `app.tasks.ingestor.ingest_from_snapshot`.
+    """
+    directory = directory or os.path.join(OUTPUT_DIR, datetime.utcnow().strftime("%Y%m%dT%H%M%S"))
+    frames: Dict[str, Optional[pd.DataFrame]] = dict(fetch_symbol_bundles(symbols))
+    frames["daily_prices"] = fetch_daily_prices(symbols)
+
+    rows = {}
+    for dataset, df in frames.items():
+        if save_dataset(dataset, df, directory):
+            rows[dataset] = len(df)
+    with open(os.path.join(directory, MANIFEST_FILE), "w") as f:
+        json.dump({"created_at": datetime.utcnow().isoformat(), "rows": rows}, f, indent=2)
+    print(f"Snapshot written to {directory}")
+    return directory
 
 
 def ingest_daily_prices():
     df = fetch_daily_prices()
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_daily_prices.csv")
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined daily prices to {file_path}")
-        except Exception as e:
-            print(f"Error saving daily prices CSV: {e}")
-    else:
-        print("No daily prices DataFrame to save.")
+    save_dataset("daily_prices", df)
     return df
 
 
 def ingest_stock_info():
     df = fetch_stock_info()
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_stock_info.csv")
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined stock info to {file_path}")
-        except Exception as e:
-            print(f"Error saving stock info CSV: {e}")
-    else:
-        print("No stock info DataFrame to save.")
+    save_dataset("stock_info", df)
     return df
 
 
 def ingest_balance_sheet():
     df = fetch_balance_sheet()
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_balance_sheet.csv")
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined balance sheet to {file_path}")
-        except Exception as e:
-            print(f"Error saving balance sheet CSV: {e}")
-    else:
-        print("No balance sheet DataFrame to save.")
+    save_dataset("balance_sheet", df)
     return df
 
 
 def ingest_income_statement():
     df = fetch_income_statement()
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_income_statement.csv")
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined income statement to {file_path}")
-        except Exception as e:
-            print(f"Error saving income statement CSV: {e}")
-    else:
-        print("No income statement DataFrame to save.")
+    save_dataset("income_statement", df)
     return df
 
 
 def ingest_cash_flow():
     df = fetch_cash_flow()
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_cash_flow.csv")
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined cash flow to {file_path}")
-        except Exception as e:
-            print(f"Error saving cash flow CSV: {e}")
-    else:
-        print("No cash flow DataFrame to save.")
+    save_dataset("cash_flow", df)
     return df
 
 
@@ -86,34 +137,11 @@ def ingest_current_prices():
     Fetches and saves current price and change data for all Nifty 50 symbols.
     """
     print("\n--- Starting Current Price and Change Ingestion ---")
-    df = fetch_current_prices() 
-    if df is not None:
-        file_path = os.path.join(OUTPUT_DIR, "nifty50_current_prices.csv") # Define the CSV path
-        try:
-            df.to_csv(file_path, index=False)
-            print(f"Successfully saved combined current prices to {file_path}")
-        except Exception as e:
-            print(f"Error saving current prices CSV: {e}")
-    else:
-        print("No current prices DataFrame to save.")
+    df = fetch_current_prices()
+    save_dataset("current_prices", df)
     return df
 
 if __name__ == "__main__":
     print("Starting Nifty 50 data fetch process...")
-
-    # Create output directory if it doesn't exist
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        print(f"Created output directory: {OUTPUT_DIR}")
-
-    # Ingest all components
-    # ingest_stock_info()
-    # ingest_daily_prices()
-    # ingest_balance_sheet()
-    # ingest_income_statement()
-    # ingest_cash_flow()
-    ingest_current_prices()
-
+    write_snapshot()
     print("\nNifty 50 data fetch and saving process completed.")
-
-
@@ -0,0 +1,90 @@
+# app/tasks/distributed.py
+"""
+Celery tasks for distributed ingestion.
+
+Each dataset fans out into one `ingest_symbol` task per symbol and fans back
+in through a chord callback that summarises rows written and failures, so
+throughput scales with the number of workers consuming the dataset's queue.
+"""
+from typing import Any, Dict, List, Optional
+from celery import chord
+from celery.result import AsyncResult
+
+from app.core.celery_app import celery_app, QUOTES_QUEUE, FUNDAMENTALS_QUEUE, INGESTION_QUEUE
+from app.db.config import get_db
+from app.core import change_feed
+from app.db.copy_loader import copy_upsert_dataframe
+from app.db.row_hash import filter_changed_rows, store_row_hashes
+from app.repositories.freshness import latest_periods, record_fetches
+from app.services.stock.helper import DATASET_FETCHERS
+from app.tasks.ingestor import DATASET_TABLES, HASHED_MODELS, resolve_universe
+from app.tasks.refresh_planner import FUNDAMENTAL_DATASETS
+
+# Queue each dataset's per-symbol tasks are routed to.
+DATASET_QUEUES = {
+    "current_prices": QUOTES_QUEUE,
+    "stock_info": FUNDAMENTALS_QUEUE,
+    "balance_sheet": FUNDAMENTALS_QUEUE,
+    "income_statement": FUNDAMENTALS_QUEUE,
+    "cash_flow": FUNDAMENTALS_QUEUE,
+    "daily_prices": INGESTION_QUEUE,
+}
+
+
+@celery_app.task(name="ingestion.ingest_symbol")
+def ingest_symbol(dataset: str, symbol: str) -> Dict[str, Any]:
+    """
+    Fetches and upserts one dataset for one symbol, recording statement fetches for
+    the refresh planner. Errors are returned, not raised, so the chord completes.
+    """
+    model, _ = DATASET_TABLES[dataset]
+    try:
+        df = DATASET_FETCHERS[dataset](symbol)
+        if df is None or df.empty:
+            return {"symbol": symbol, "rows": 0, "error": None}
+        with next(get_db()) as db:
+            if dataset in FUNDAMENTAL_DATASETS:
+                record_fetches(db, dataset, latest_periods(df))
+            hashes = None
+            if model in HASHED_MODELS:
+                df, hashes = filter_changed_rows(db, model, df)
+                if df.empty:
+                    db.commit()
+                    return {"symbol": symbol, "rows": 0, "error": None}
+            written = copy_upsert_dataframe(db, model, df)
+            if hashes:
+                store_row_hashes(db, model, hashes)
+            db.commit()
+        if hashes:
+            change_feed.publish(model.__table__.name, [symbol])
+        return {"symbol": symbol, "rows": written, "error": None}
+    except Exception as e:
+        print(f"  An error occurred while ingesting {dataset} for {symbol}: {e}")
+        return {"symbol": symbol, "rows": 0, "error": f"{type(e).__name__}: {e}"}
+
+
+@celery_app.task(name="ingestion.summarize_dataset")
+def summarize_dataset(results: List[Dict[str, Any]], dataset: str) -> Dict[str, Any]:
+    """Chord callback: aggregates the per-symbol results of one dataset."""
+    failed = sorted(result["symbol"] for result in results if result["error"])
+    summary = {
+        "dataset": dataset,
+        "symbols": len(results),
+        "rows_written": sum(result["rows"] for result in results),
+        "failed_symbols": failed,
+    }
+    print(f"{dataset} distributed ingestion complete: {summary['rows_written']} rows, {len(failed)} failures.")
+    return summary
+
+
+def dispatch_dataset(dataset: str, symbols: Optional[List[str]] = None) -> AsyncResult:
+    """Queues a per-symbol chord for `dataset` and returns the result of its summary callback."""
+    queue = DATASET_QUEUES[dataset]
+    header = [ingest_symbol.si(dataset, symbol).set(queue=queue) for symbol in resolve_universe(symbols)]
+    return chord(header)(summarize_dataset.s(dataset).set(queue=queue))
+
+
+def dispatch_all(symbols: Optional[List[str]] = None) -> Dict[str, AsyncResult]:
+    """Queues a chord for every dataset; they run in parallel on their own queues."""
+    symbols = resolve_universe(symbols)
+    return {dataset: dispatch_dataset(dataset, symbols) for dataset in DATASET_TABLES}
@@ -1,79 +1,451 @@
+import time as timer
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import pandas as pd
+from app.core import progress
+from app.core.config import settings
+from app.core.market_calendar import IST
+from app.core import change_feed
 from app.db.config import get_db
+from app.db.copy_loader import copy_upsert_dataframe
+from app.db.snapshot import swap_in_snapshot, rollback_snapshot
+from app.db.partitions import ensure_intraday_partitions, intraday_partition_days, drop_intraday_partition
+from app.db.upsert import upsert_records
+from app.db.row_hash import (
+    filter_changed_rows, store_row_hashes, reset_row_hashes, clear_row_hashes, hash_rows, changed_symbols
+)
 from app.models.stock import (
     StockInfo, BalanceSheet, IncomeStatement,
-    CashFlow, DailyPrice, CurrentPrice
+    CashFlow, DailyPrice, CurrentPrice, IntradayPrice
 )
 from app.services.stock.helper import (
     fetch_stock_info, fetch_balance_sheet,
     fetch_income_statement, fetch_cash_flow,
-    fetch_daily_prices, fetch_current_prices
+    fetch_daily_prices, fetch_current_prices,
+    fetch_daily_prices_batched, fetch_intraday_prices,
+    fetch_symbol_bundles, iter_dataset_frames,
+    nifty50_symbols, shard_symbols
 )
+from app.repositories.universe import get_universe_symbols, register_symbols
+from app.repositories.freshness import latest_periods, record_fetches
+from app.tasks.refresh_planner import FUNDAMENTAL_DATASETS, plan_refresh
+from app.tasks.csvv import read_snapshot
 
 from app.models.market_sentiment import MarketSentiment
 from app.services.crawler.market_index import fear_greed_index, mmi
 
 
-def ingest_stock_info():
-    df = fetch_stock_info()
-    if df is not None and not df.empty:
-        with next(get_db()) as db:
-            db.query(StockInfo).delete()
-            db.bulk_insert_mappings(StockInfo, df.to_dict(orient="records"))
+def resolve_universe(symbols: Optional[List[str]] = None, snapshot: bool = False) -> List[str]:
+    """
+    Returns `symbols`, or every active symbol in the universe registry when none are given.
+    An empty registry is seeded with the Nifty 50 list on first use.
+    A snapshot replaces the whole table, so it cannot be limited to a symbol subset.
+    """
+    if symbols is not None:
+        if snapshot:
+            raise ValueError("Snapshot ingestion always covers the whole universe; do not pass symbols.")
+        return list(symbols)
+    with next(get_db()) as db:
+        registered = get_universe_symbols(db)
+        if not registered:
+            register_symbols(db, nifty50_symbols, exchange="NSE", index="NIFTY50")
             db.commit()
-            print("Stock info ingested successfully.")
+            registered = list(nifty50_symbols)
+    return registered
 
 
-def ingest_balance_sheet():
-    df = fetch_balance_sheet()
-    if df is not None and not df.empty:
-        with next(get_db()) as db:
-            db.query(BalanceSheet).delete()
-            db.bulk_insert_mappings(BalanceSheet, df.to_dict(orient="records"))
+# Wide, mostly unchanging tables whose rows are hashed so only changed rows are written.
+HASHED_MODELS = (StockInfo, CurrentPrice)
+
+
+def _write_table(model, df: pd.DataFrame, label: str, snapshot: bool = False):
+    """
+    Writes `df` into `model`'s table. By default rows are upserted on the primary key;
+    with `snapshot=True` the table is replaced by an atomically swapped-in snapshot.
+    For HASHED_MODELS only rows whose hash changed since the last write are sent.
+    Symbols with changed rows are published on the change feed. Progress is
+    reported under the table name (the DATASET_TABLES key); `label` is for log lines.
+    """
+    started = timer.perf_counter()
+    table_name = model.__table__.name
+    with next(get_db()) as db:
+        if snapshot:
+            # Hashes first: the swap's table lock is held from its renames until commit
+            if model in HASHED_MODELS:
+                reset_row_hashes(db, model, hash_rows(model, df).to_dict())
+            result = swap_in_snapshot(db, model, df)
             db.commit()
-            print("Balance sheet ingested successfully.")
+            progress.rows_written(table_name, result["rows"], timer.perf_counter() - started, df)
+            change_feed.publish(table_name, sorted(result["changed_symbols"]))
+            print(
+                f"{label} snapshot v{result['version']} swapped in "
+                f"({len(result['changed_symbols'])} symbols changed)."
+            )
+            return
+        if model in HASHED_MODELS:
+            fetched = len(df)
+            df, hashes = filter_changed_rows(db, model, df)
+            print(f"{label}: {len(df)} of {fetched} rows changed since the last write.")
+            if df.empty:
+                return
+        written = copy_upsert_dataframe(db, model, df)
+        if model in HASHED_MODELS:
+            store_row_hashes(db, model, hashes)
+        db.commit()
+        progress.rows_written(table_name, written, timer.perf_counter() - started, df)
+        if model in HASHED_MODELS:
+            change_feed.publish(table_name, changed_symbols(df))
+        print(f"{label} ingested successfully ({written} of {len(df)} rows changed).")
 
 
-def ingest_income_statement():
-    df = fetch_income_statement()
+def ingest_stock_info(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    df = fetch_stock_info(resolve_universe(symbols, snapshot))
     if df is not None and not df.empty:
-        with next(get_db()) as db:
-            db.query(IncomeStatement).delete()
-            db.bulk_insert_mappings(IncomeStatement, df.to_dict(orient="records"))
-            db.commit()
-            print("Income statement ingested successfully.")
+        _write_table(StockInfo, df, "Stock info", snapshot)
+
+
+def _record_freshness(dataset: str, df: Optional[pd.DataFrame]):
+    """Records that `dataset` was just fetched for every symbol in `df`, with its latest period."""
+    if df is None or df.empty:
+        return
+    with next(get_db()) as db:
+        record_fetches(db, dataset, latest_periods(df))
+        db.commit()
+
+
+def ingest_balance_sheet(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    df = fetch_balance_sheet(resolve_universe(symbols, snapshot))
+    if df is not None and not df.empty:
+        _write_table(BalanceSheet, df, "Balance sheet", snapshot)
+        _record_freshness("balance_sheet", df)
+
 
+def ingest_income_statement(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    df = fetch_income_statement(resolve_universe(symbols, snapshot))
+    if df is not None and not df.empty:
+        _write_table(IncomeStatement, df, "Income statement", snapshot)
+        _record_freshness("income_statement", df)
 
 
-def ingest_cash_flow():
-    df = fetch_cash_flow() 
+def ingest_cash_flow(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    df = fetch_cash_flow(resolve_universe(symbols, snapshot))
     if df is not None and not df.empty:
-        records = df.to_dict(orient="records")  
+        _write_table(CashFlow, df, "Cash flow", snapshot)
+        _record_freshness("cash_flow", df)
+
+
+def _latest_daily_dates(db: Session) -> Dict[str, date]:
+    """Returns the most recent stored `Date` for every symbol in daily_prices."""
+    rows = (
+        db.query(DailyPrice.symbol, func.max(DailyPrice.Date))
+        .group_by(DailyPrice.symbol)
+        .all()
+    )
+    return {symbol: latest for symbol, latest in rows if latest is not None}
+
+
+def ingest_daily_prices(
+    incremental: bool = False,
+    snapshot: bool = False,
+    batched: bool = False,
+    symbols: Optional[List[str]] = None,
+):
+    """
+    Ingests daily prices. By default a year of bars is fetched for every symbol.
+
+    With `incremental=True` only bars from each symbol's latest stored date onwards
+    are fetched. The latest stored bar is re-fetched too, since it may have been
+    written mid-session, and is updated in place by the upsert.
+    A snapshot swap needs the full history, so it cannot be combined with `incremental`.
+    With `batched=True` prices are downloaded for many tickers per request.
+    """
+    if incremental and snapshot:
+        raise ValueError("Incremental daily price ingestion cannot be written as a snapshot.")
+    symbols = resolve_universe(symbols, snapshot)
+
+    since = None
+    if incremental:
         with next(get_db()) as db:
-            db.query(CashFlow).delete()
-            db.bulk_insert_mappings(CashFlow, records)
-            db.commit()
-            print("Cash flow ingested successfully.") 
+            since = _latest_daily_dates(db)
 
-def ingest_daily_prices():
-    df = fetch_daily_prices()
+    if batched:
+        df = fetch_daily_prices_batched(symbols, since=since)
+    else:
+        df = fetch_daily_prices(symbols, since=since)
     if df is not None and not df.empty:
+        _write_table(DailyPrice, df, "Daily prices", snapshot)
+
+
+def _check_interval(interval: str):
+    if interval not in settings.INTRADAY_RETENTION_DAYS:
+        raise ValueError(f"Unsupported intraday interval '{interval}'.")
+
+
+def ingest_intraday_prices(interval: str = "5m", symbols: Optional[List[str]] = None) -> int:
+    """
+    Ingests `interval` ('1m' or '5m') bars. Each symbol is fetched from its latest
+    stored bar onwards (the full available lookback on first run); the latest bar
+    is re-fetched since it may have been incomplete. Returns rows changed.
+    """
+    _check_interval(interval)
+    symbols = resolve_universe(symbols)
+    with next(get_db()) as db:
+        rows = (
+            db.query(IntradayPrice.symbol, func.max(IntradayPrice.Datetime))
+            .filter(IntradayPrice.interval == interval, IntradayPrice.symbol.in_(symbols))
+            .group_by(IntradayPrice.symbol)
+            .all()
+        )
+    # Naive values come back from dialects without time zone support and are UTC
+    since = {symbol: pd.Timestamp(latest, tz="UTC") if latest.tzinfo is None else latest
+             for symbol, latest in rows if latest is not None}
+
+    df = fetch_intraday_prices(symbols, interval, since=since)
+    if df is None or df.empty:
+        return 0
+    label = f"{interval} intraday prices"
+    started = timer.perf_counter()
+    with next(get_db()) as db:
+        ensure_intraday_partitions(db, interval, df["Datetime"].dt.tz_convert(IST).dt.date.unique())
+        written = copy_upsert_dataframe(db, IntradayPrice, df)
+        db.commit()
+    progress.rows_written(f"intraday_prices_{interval}", written, timer.perf_counter() - started, df)
+    print(f"{label.capitalize()} ingested successfully ({written} of {len(df)} rows changed).")
+    return written
+
+
+def _rollup_daily_bars(bars: pd.DataFrame, day: date) -> pd.DataFrame:
+    """Aggregates one trading day of intraday bars into one daily bar per symbol."""
+    bars = bars.sort_values("Datetime")
+    daily = bars.groupby("symbol").agg(
+        Open=("Open", "first"), High=("High", "max"), Low=("Low", "min"),
+        Close=("Close", "last"), Volume=("Volume", "sum"),
+    ).reset_index()
+    daily.insert(1, "Date", day)
+    return daily
+
+
+def _day_bounds(day: date):
+    """UTC start and end of IST trading day `day` (bar times are stored in UTC)."""
+    start = datetime.combine(day, time.min, tzinfo=IST).astimezone(timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def apply_intraday_retention(today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Rolls intraday bars older than INTRADAY_RETENTION_DAYS up into daily_prices and
+    removes them, one trading day at a time. A rolled-up bar only fills a missing
+    (symbol, Date); daily bars fetched from the provider are kept. On PostgreSQL each
+    day is removed by dropping its partition. Returns the days removed per interval.
+    """
+    today = today or datetime.now(IST).date()
+    removed = {}
+    for interval, retention_days in settings.INTRADAY_RETENTION_DAYS.items():
+        cutoff = today - timedelta(days=retention_days)
         with next(get_db()) as db:
-            db.query(DailyPrice).delete()
-            db.bulk_insert_mappings(DailyPrice, df.to_dict(orient="records"))
-            db.commit()
-            print("Daily prices ingested successfully.")
+            days = [day for day in intraday_partition_days(db, interval) if day < cutoff]
+            if not days:
+                # Unpartitioned table: find the days from the bars themselves
+                old = (
+                    db.query(IntradayPrice.Datetime)
+                    .filter(IntradayPrice.interval == interval, IntradayPrice.Datetime < _day_bounds(cutoff)[0])
+                    .all()
+                )
+                days = sorted(set(pd.to_datetime([ts for (ts,) in old], utc=True).tz_convert(IST).date))
+
+            for day in days:
+                start, end = _day_bounds(day)
+                day_filter = (
+                    (IntradayPrice.interval == interval)
+                    & (IntradayPrice.Datetime >= start)
+                    & (IntradayPrice.Datetime < end)
+                )
+                bars = pd.read_sql(db.query(IntradayPrice).filter(day_filter).statement, db.get_bind())
+                if not bars.empty:
+                    daily = _rollup_daily_bars(bars, day)
+                    existing = {
+                        symbol for (symbol,) in
+                        db.query(DailyPrice.symbol).filter(DailyPrice.Date == day).all()
+                    }
+                    missing = daily[~daily["symbol"].isin(existing)]
+                    upsert_records(db, DailyPrice, missing.to_dict(orient="records"))
+                drop_intraday_partition(db, interval, day)
+                db.query(IntradayPrice).filter(day_filter).delete(synchronize_session=False)
+                db.commit()
+                print(f"Rolled up {interval} bars of {day} into daily prices.")
+            removed[interval] = len(days)
+    return removed
 
 
-def ingest_current_prices():
-    df = fetch_current_prices()
+def ingest_current_prices(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    """Fetches and writes current prices; returns the fetched frame (None if nothing was fetched)."""
+    df = fetch_current_prices(resolve_universe(symbols, snapshot))
     if df is not None and not df.empty:
-        with next(get_db()) as db:
-            db.query(CurrentPrice).delete()
-            db.bulk_insert_mappings(CurrentPrice, df.to_dict(orient="records"))
+        _write_table(CurrentPrice, df, "Current prices", snapshot)
+    return df
+
+
+# Target model and log label for each ingested dataset. Keys are the table names and
+# are what progress and the run ledger record; labels are only printed.
+DATASET_TABLES = {
+    "stock_info": (StockInfo, "Stock info"),
+    "balance_sheet": (BalanceSheet, "Balance sheet"),
+    "income_statement": (IncomeStatement, "Income statement"),
+    "cash_flow": (CashFlow, "Cash flow"),
+    "current_prices": (CurrentPrice, "Current prices"),
+    "daily_prices": (DailyPrice, "Daily prices"),
+}
+
+
+def ingest_all(snapshot: bool = False, symbols: Optional[List[str]] = None):
+    """
+    Ingests stock info, the three statements and current prices from a single
+    per-symbol pass (one yf.Ticker per symbol), then daily prices.
+    """
+    symbols = resolve_universe(symbols, snapshot)
+    frames = fetch_symbol_bundles(symbols)
+    for dataset, df in frames.items():
+        if df is not None and not df.empty:
+            model, label = DATASET_TABLES[dataset]
+            _write_table(model, df, label, snapshot)
+            if dataset in FUNDAMENTAL_DATASETS:
+                _record_freshness(dataset, df)
+    ingest_daily_prices(snapshot=snapshot, symbols=None if snapshot else symbols)
+
+
+def ingest_fundamentals(force: bool = False, symbols: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """
+    Refreshes the balance sheet, income statement and cash flow of only the symbols
+    the refresh planner marks as stale (see `app.tasks.refresh_planner`), or of all
+    symbols with `force=True`. Returns the symbols refetched per dataset.
+    """
+    symbols = resolve_universe(symbols)
+    ingesters = {
+        "balance_sheet": ingest_balance_sheet,
+        "income_statement": ingest_income_statement,
+        "cash_flow": ingest_cash_flow,
+    }
+    refreshed = {}
+    for dataset in FUNDAMENTAL_DATASETS:
+        due = list(symbols) if force else list(plan_refresh(dataset, symbols))
+        print(f"{dataset}: {len(due)} of {len(symbols)} symbols due for refresh.")
+        if due:
+            ingesters[dataset](symbols=due)
+        refreshed[dataset] = due
+    return refreshed
+
+
+def ingest_shard(shard_index: int, shard_count: int):
+    """
+    Runs `ingest_all` for one shard of the registered universe. Run each shard in
+    its own process or worker to split a large universe across them.
+    """
+    symbols = shard_symbols(resolve_universe(), shard_count, shard_index)
+    print(f"Ingesting shard {shard_index + 1}/{shard_count} ({len(symbols)} symbols).")
+    if symbols:
+        ingest_all(symbols=symbols)
+    return symbols
+
+
+def _table_frame(model, df: pd.DataFrame) -> pd.DataFrame:
+    """Transform stage: keeps only the columns that exist on `model`'s table."""
+    return df[[col for col in df.columns if col in model.__table__.c]]
+
+
+def _chunked(frames: Iterable[pd.DataFrame], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Groups a stream of small frames into frames of at least `chunk_rows` rows."""
+    buffer: List[pd.DataFrame] = []
+    buffered = 0
+    for df in frames:
+        buffer.append(df)
+        buffered += len(df)
+        if buffered >= chunk_rows:
+            yield pd.concat(buffer, ignore_index=True)
+            buffer, buffered = [], 0
+    if buffer:
+        yield pd.concat(buffer, ignore_index=True)
+
+
+def ingest_dataset_streaming(
+    dataset: str,
+    chunk_rows: Optional[int] = None,
+    symbols: Optional[List[str]] = None,
+) -> int:
+    """
+    Ingests `dataset` as a pipeline of generators: per-symbol fetch -> column
+    transform -> chunked upsert that commits every `chunk_rows` rows.
+    Peak memory is bounded by the chunk size and the fetch window rather than
+    by the size of the symbol universe or history. For HASHED_MODELS each chunk
+    is filtered and its hashes stored like `_write_table` does, and statement
+    fetches are recorded for the refresh planner. Returns rows written.
+    """
+    model, label = DATASET_TABLES[dataset]
+    chunk_rows = chunk_rows or settings.INGEST_CHUNK_ROWS
+    frames = (_table_frame(model, df) for df in iter_dataset_frames(dataset, resolve_universe(symbols)))
+    hashed = model in HASHED_MODELS
+    fundamental = dataset in FUNDAMENTAL_DATASETS
+
+    written = 0
+    with next(get_db()) as db:
+        for chunk in _chunked(frames, chunk_rows):
+            started = timer.perf_counter()
+            if fundamental:
+                # Fetched is fetched, even if none of the rows changed
+                record_fetches(db, dataset, latest_periods(chunk))
+            if hashed:
+                chunk, hashes = filter_changed_rows(db, model, chunk)
+                if chunk.empty:
+                    db.commit()
+                    continue
+            chunk_written = copy_upsert_dataframe(db, model, chunk)
+            if hashed:
+                store_row_hashes(db, model, hashes)
             db.commit()
-            print("Current prices ingested successfully.")
+            progress.rows_written(dataset, chunk_written, timer.perf_counter() - started, chunk)
+            if hashed:
+                change_feed.publish(model.__table__.name, changed_symbols(chunk))
+            written += chunk_written
+            print(f"  Committed {len(chunk)} {label.lower()} rows.")
+    print(f"{label} streamed successfully ({written} rows changed).")
+    return written
+
+
+def ingest_from_snapshot(
+    directory: str,
+    snapshot: bool = False,
+    datasets: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Bulk-loads a Parquet snapshot directory written by `app.tasks.csvv.write_snapshot`
+    into the database without touching the network. Rows are upserted by default;
+    with `snapshot=True` each table is replaced by the snapshot's contents.
+    Returns the number of rows read per dataset.
+    """
+    loaded = {}
+    for dataset in datasets or list(DATASET_TABLES):
+        df = read_snapshot(directory, dataset)
+        if df is None or df.empty:
+            print(f"No {dataset} in snapshot {directory}.")
+            continue
+        model, label = DATASET_TABLES[dataset]
+        _write_table(model, df, label, snapshot)
+        loaded[dataset] = len(df)
+    return loaded
+
+
+def rollback_dataset(dataset: str):
+    """Restores the previous snapshot of a dataset's table (see `swap_in_snapshot`)."""
+    model, label = DATASET_TABLES[dataset]
+    with next(get_db()) as db:
+        # The stored hashes describe the snapshot being swapped out
+        if model in HASHED_MODELS:
+            clear_row_hashes(db, model)
+        result = rollback_snapshot(db, model)
+        db.commit()
+        print(f"{label} rolled back to its previous snapshot.")
+        return result
 
 
 # ...existing code...
@@ -107,3 +479,20 @@ def ingest_market_sentiment():
             ))
             db.commit()
             print("Market Mood Index ingested successfully.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest one shard of the symbol universe, or replay a snapshot.")
+    parser.add_argument("--shard", type=int, help="zero-based shard index")
+    parser.add_argument("--shards", type=int, help="total number of shards")
+    parser.add_argument("--replay", metavar="DIR", help="load a Parquet snapshot directory instead of fetching")
+    parser.add_argument("--replace", action="store_true", help="with --replay, replace tables instead of upserting")
+    args = parser.parse_args()
+    if args.replay:
+        ingest_from_snapshot(args.replay, snapshot=args.replace)
+    elif args.shard is not None and args.shards:
+        ingest_shard(args.shard, args.shards)
+    else:
+        parser.error("either --replay or both --shard and --shards are required")
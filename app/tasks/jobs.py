@@ -0,0 +1,175 @@
+# app/tasks/jobs.py
+"""
+Background ingestion jobs.
+
+`submit_job` queues an ingestion callable on a bounded thread pool and returns
+immediately; the job records per-symbol progress through `app.core.progress`
+so its status can be polled while it runs. When it finishes, the run and its
+per-symbol fetch, transform and write timings are saved to the ingestion run
+ledger (see `app.repositories.ingestion_runs`).
+"""
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core import progress
+from app.core.config import settings
+from app.db.config import get_db
+from app.repositories.ingestion_runs import save_run
+
+
+class IngestionJob:
+    """Status and per-symbol progress of one background ingestion run."""
+
+    def __init__(self, name: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.params = params or {}
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.symbols: Dict[str, Dict[str, Any]] = {}
+        self.rows_written: Dict[str, int] = {}
+        self.metrics: List[Dict[str, Any]] = []
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    # progress listener interface
+    def on_symbol(
+        self,
+        label: str,
+        symbol: str,
+        rows: int,
+        error: Optional[str],
+        seconds: Optional[float] = None,
+        nbytes: Optional[int] = None,
+        error_class: Optional[str] = None,
+    ):
+        # Provider functions swallow their own exceptions, so a failed fetch often
+        # arrives with only its error class set
+        error = error or error_class
+        with self._lock:
+            entry = self.symbols.setdefault(symbol, {"datasets": {}, "rows": 0, "errors": []})
+            entry["datasets"][label] = "failed" if error else ("ok" if rows else "empty")
+            entry["rows"] += rows
+            if error:
+                entry["errors"].append(f"{label}: {error}")
+            self._add_metric(label, "fetch", seconds, rows, nbytes, symbol, error_class)
+
+    def on_transform(self, label: str, seconds: float, rows: int, nbytes: int):
+        with self._lock:
+            self._add_metric(label, "transform", seconds, rows, nbytes)
+
+    def on_rows_written(self, label: str, count: int, seconds: Optional[float] = None, nbytes: Optional[int] = None):
+        with self._lock:
+            self.rows_written[label] = self.rows_written.get(label, 0) + count
+            self._add_metric(label, "write", seconds, count, nbytes)
+
+    def _add_metric(self, label, stage, seconds, rows, nbytes, symbol=None, error_class=None):
+        self.metrics.append({
+            "dataset": label,
+            "symbol": symbol,
+            "stage": stage,
+            "seconds": round(seconds, 4) if seconds is not None else None,
+            "rows": rows,
+            "bytes": nbytes,
+            "error_class": error_class,
+            "recorded_at": datetime.utcnow(),
+        })
+
+    def save(self):
+        """Writes the finished run to the ingestion run ledger; failures are logged, not raised."""
+        try:
+            with next(get_db()) as db:
+                save_run(db, self.to_dict(include_symbols=False), self.metrics)
+                db.commit()
+        except Exception as e:
+            print(f"Could not save ingestion run {self.id} to the ledger: {e}")
+
+    def run(self, func: Callable[..., Any]):
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        token = progress.set_listener(self)
+        try:
+            func(**self.params)
+            self.status = "succeeded"
+        except Exception as e:
+            self.status = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        finally:
+            progress.reset_listener(token)
+            self._finished = time.perf_counter()
+            self.finished_at = datetime.utcnow()
+            self.save()
+
+    @property
+    def elapsed_seconds(self) -> Optional[float]:
+        if self._started is None:
+            return None
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return round(end - self._started, 3)
+
+    def to_dict(self, include_symbols: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            failed = sorted(symbol for symbol, entry in self.symbols.items() if entry["errors"])
+            result = {
+                "id": self.id,
+                "name": self.name,
+                "params": self.params,
+                "status": self.status,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed_seconds": self.elapsed_seconds,
+                "symbols_processed": len(self.symbols),
+                "rows_written": dict(self.rows_written),
+                "total_rows_written": sum(self.rows_written.values()),
+                "failures": len(failed),
+                "failed_symbols": failed,
+            }
+            if include_symbols:
+                result["symbols"] = {symbol: dict(entry) for symbol, entry in self.symbols.items()}
+        return result
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.INGEST_JOB_CONCURRENCY, thread_name_prefix="ingest-job")
+_jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs():
+    """Drops the oldest finished jobs beyond INGEST_JOB_HISTORY."""
+    finished = [job_id for job_id, job in _jobs.items() if job.status in ("succeeded", "failed")]
+    for job_id in finished[:max(0, len(_jobs) - settings.INGEST_JOB_HISTORY)]:
+        del _jobs[job_id]
+
+
+def submit_job(name: str, func: Callable[..., Any], **params) -> IngestionJob:
+    """Queues `func(**params)` as a background ingestion job and returns it without waiting."""
+    job = IngestionJob(name, params)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        _prune_jobs()
+    _executor.submit(job.run, func)
+    return job
+
+
+def get_job(job_id: str) -> Optional[IngestionJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def list_jobs() -> List[IngestionJob]:
+    with _jobs_lock:
+        return list(reversed(_jobs.values()))
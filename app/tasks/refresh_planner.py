@@ -0,0 +1,57 @@
+# app/tasks/refresh_planner.py
+"""
+Staleness-driven refresh planning for fundamentals.
+
+Statements change once per reporting period, so a symbol's dataset is only
+refetched when
+  * it has never been fetched,
+  * its last fetch is older than FUNDAMENTALS_TTL_DAYS, or
+  * the next period's results are due (latest period + FUNDAMENTALS_PERIOD_DAYS
+    + FUNDAMENTALS_REPORTING_LAG_DAYS, opened FUNDAMENTALS_REPORTING_WINDOW_DAYS
+    early) and it was not checked in the last FUNDAMENTALS_RECHECK_DAYS.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.db.config import get_db
+from app.models.ingestion import DatasetFreshness
+from app.repositories.freshness import get_freshness
+
+FUNDAMENTAL_DATASETS = ("balance_sheet", "income_statement", "cash_flow")
+
+
+def expected_report_date(latest_period: date) -> date:
+    """Date the period after `latest_period` is expected to be published."""
+    return latest_period + timedelta(
+        days=settings.FUNDAMENTALS_PERIOD_DAYS + settings.FUNDAMENTALS_REPORTING_LAG_DAYS
+    )
+
+
+def refresh_reason(entry: Optional[DatasetFreshness], now: Optional[datetime] = None) -> Optional[str]:
+    """Why the entry needs a refetch ("new", "ttl" or "reporting"), or None if it is fresh."""
+    now = now or datetime.utcnow()
+    if entry is None or entry.last_fetched_at is None:
+        return "new"
+    age = now - entry.last_fetched_at
+    if age >= timedelta(days=settings.FUNDAMENTALS_TTL_DAYS):
+        return "ttl"
+    if entry.latest_period is not None:
+        window_start = expected_report_date(entry.latest_period) - timedelta(
+            days=settings.FUNDAMENTALS_REPORTING_WINDOW_DAYS
+        )
+        if now.date() >= window_start and age >= timedelta(days=settings.FUNDAMENTALS_RECHECK_DAYS):
+            return "reporting"
+    return None
+
+
+def plan_refresh(dataset: str, symbols: List[str], now: Optional[datetime] = None) -> Dict[str, str]:
+    """Returns the symbols of `dataset` due for a refetch, mapped to the reason."""
+    with next(get_db()) as db:
+        entries = get_freshness(db, dataset, symbols)
+    plan = {}
+    for symbol in symbols:
+        reason = refresh_reason(entries.get(symbol), now)
+        if reason:
+            plan[symbol] = reason
+    return plan
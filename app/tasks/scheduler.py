@@ -0,0 +1,237 @@
+# app/tasks/scheduler.py
+"""
+Market-hours-aware refresh of current prices.
+
+While the NSE session is open, quotes are refreshed every
+PRICE_REFRESH_OPEN_SECONDS; outside it, every PRICE_REFRESH_CLOSED_SECONDS
+(and at the next open at the latest). A symbol whose quote came back unchanged
+is skipped for a growing number of refreshes (1, 2, 4, ... up to
+PRICE_REFRESH_MAX_SKIP), so illiquid or halted symbols do not cost a fetch on
+every cycle. The skip counters are reset when a new session opens.
+
+Every API process that enables the scheduler starts one, so on PostgreSQL only
+the process holding a session-level advisory lock refreshes; the others stand
+by and take over if it goes away.
+"""
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.market_calendar import IST, is_market_open, next_market_open, has_holidays_for
+from app.db.config import engine, get_db
+from app.models.stock import CurrentPrice
+from app.tasks.ingestor import ingest_current_prices, resolve_universe
+
+
+# pg_advisory_lock key held by the one process that runs the refresh
+LEADER_LOCK_KEY = 0x50524943  # "PRIC"
+
+
+class _SymbolState:
+    def __init__(self):
+        self.quote: Optional[Tuple[Any, Any]] = None
+        self.unchanged = 0  # consecutive refreshes with an unchanged quote
+        self.skip = 0  # refreshes left to skip
+        self.fetched_at: Optional[datetime] = None
+        self.changed_at: Optional[datetime] = None
+
+
+class CurrentPriceScheduler:
+    """Background thread that keeps `current_prices` fresh during market hours."""
+
+    def __init__(self):
+        self.symbols: Dict[str, _SymbolState] = {}
+        self.market_open: Optional[bool] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_seconds: Optional[float] = None
+        self.last_run: Dict[str, Any] = {}
+        self.next_run_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.leader = False
+        self._seeded = False
+        self._leader_conn = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        if not has_holidays_for(datetime.now(IST).year):
+            print(
+                f"Warning: NSE_HOLIDAYS has no {datetime.now(IST).year} dates; exchange holidays "
+                "will be polled like trading days."
+            )
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="price-scheduler", daemon=True)
+        self._thread.start()
+        print("Current price scheduler started.")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._release_leadership()
+        print("Current price scheduler stopped.")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self._acquire_leadership():
+                    if not self._seeded:
+                        self._seed_quotes()
+                        self._seeded = True
+                    self.refresh()
+                self.error = None
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+            # Standbys check for the lock at the open-market cadence
+            delay = self.seconds_until_next_run() if self.leader else settings.PRICE_REFRESH_OPEN_SECONDS
+            self.next_run_at = datetime.now(IST) + timedelta(seconds=delay)
+            self._stop.wait(delay)
+
+    def _acquire_leadership(self) -> bool:
+        """
+        True if this process should refresh. On PostgreSQL that means holding the
+        advisory lock on a dedicated connection; it is released when the connection
+        closes, so a crashed leader's lock frees up for a standby.
+        """
+        if engine.dialect.name != "postgresql":
+            self.leader = True
+            return True
+        if self._leader_conn is not None:
+            try:
+                self._leader_conn.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # Connection lost, and the lock with it
+                self._release_leadership()
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": LEADER_LOCK_KEY}).scalar():
+            self._leader_conn = conn
+            self.leader = True
+            print("Current price scheduler is the active refresher.")
+        else:
+            conn.close()
+        return self.leader
+
+    def _release_leadership(self):
+        self.leader = False
+        if self._leader_conn is not None:
+            try:
+                self._leader_conn.close()
+            except Exception:
+                pass
+            self._leader_conn = None
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(IST)
+        if is_market_open(now):
+            return settings.PRICE_REFRESH_OPEN_SECONDS
+        until_open = (next_market_open(now) - now).total_seconds()
+        return max(1.0, min(settings.PRICE_REFRESH_CLOSED_SECONDS, until_open))
+
+    def _seed_quotes(self):
+        """Starts from the stored quotes so unchanged symbols are recognised on the first refresh."""
+        with next(get_db()) as db:
+            rows = db.query(CurrentPrice.symbol, CurrentPrice.currentPrice, CurrentPrice.previousClose).all()
+        with self._lock:
+            for symbol, current_price, previous_close in rows:
+                self.symbols.setdefault(symbol, _SymbolState()).quote = (current_price, previous_close)
+
+    def _due_symbols(self, universe: List[str]) -> List[str]:
+        due = []
+        with self._lock:
+            for symbol in universe:
+                state = self.symbols.setdefault(symbol, _SymbolState())
+                if state.skip > 0:
+                    state.skip -= 1
+                else:
+                    due.append(symbol)
+        return due
+
+    def refresh(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Runs one refresh cycle over the due symbols and returns its summary."""
+        now = now or datetime.now(IST)
+        market_open = is_market_open(now)
+        if market_open and self.market_open is False:
+            # New session: every symbol is due again
+            with self._lock:
+                for state in self.symbols.values():
+                    state.unchanged = state.skip = 0
+        self.market_open = market_open
+
+        universe = resolve_universe()
+        due = self._due_symbols(universe)
+        started = time.perf_counter()
+        df = ingest_current_prices(symbols=due) if due else None
+        fetched_at = datetime.now(IST)
+
+        changed = []
+        quotes = {} if df is None else {
+            row.symbol: (row.currentPrice, row.previousClose) for row in df.itertuples(index=False)
+        }
+        with self._lock:
+            for symbol in due:
+                state = self.symbols[symbol]
+                if symbol not in quotes:
+                    continue
+                state.fetched_at = fetched_at
+                if quotes[symbol] != state.quote:
+                    state.quote = quotes[symbol]
+                    state.changed_at = fetched_at
+                    state.unchanged = state.skip = 0
+                    changed.append(symbol)
+                else:
+                    state.unchanged += 1
+                    state.skip = min(2 ** (state.unchanged - 1), settings.PRICE_REFRESH_MAX_SKIP)
+
+        self.last_run_at = fetched_at
+        self.last_run_seconds = round(time.perf_counter() - started, 3)
+        self.last_run = {
+            "market_open": market_open,
+            "universe": len(universe),
+            "fetched": len(quotes),
+            "skipped": len(universe) - len(due),
+            "failed": len(due) - len(quotes),
+            "changed": len(changed),
+        }
+        print(
+            f"Current price refresh: {len(changed)} changed, {len(quotes)} fetched, "
+            f"{len(universe) - len(due)} skipped ({self.last_run_seconds}s)."
+        )
+        return self.last_run
+
+    def status(self) -> Dict[str, Any]:
+        """Scheduler state and refresh lag (seconds since each symbol's quote was last fetched)."""
+        now = datetime.now(IST)
+        with self._lock:
+            lags = {
+                symbol: round((now - state.fetched_at).total_seconds(), 1)
+                for symbol, state in self.symbols.items() if state.fetched_at
+            }
+            never_fetched = sorted(symbol for symbol, state in self.symbols.items() if not state.fetched_at)
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "leader": self.leader,
+            "market_open": is_market_open(now),
+            "next_market_open": next_market_open(now),
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": self.last_run_seconds,
+            "last_run": self.last_run,
+            "next_run_at": self.next_run_at,
+            "error": self.error,
+            "max_lag_seconds": max(lags.values(), default=None),
+            "avg_lag_seconds": round(sum(lags.values()) / len(lags), 1) if lags else None,
+            "lag_seconds": lags,
+            "never_fetched": never_fetched,
+        }
+
+
+price_scheduler = CurrentPriceScheduler()
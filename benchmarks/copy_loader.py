@@ -0,0 +1,101 @@
+# benchmarks/copy_loader.py
+"""
+Compares DataFrame load paths into PostgreSQL on a synthetic daily price set.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.copy_loader [--symbols 50] [--years 5]
+
+Each path loads into a scratch copy of `daily_prices` (bench_daily_prices),
+which is dropped afterwards, so real data is never touched.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import declarative_base
+
+from app.db.config import SessionLocal, engine
+from app.db.copy_loader import copy_upsert_dataframe
+from app.db.upsert import upsert_records
+from app.models.stock import DailyPrice
+
+BenchBase = declarative_base()
+
+
+class BenchDailyPrice(BenchBase):
+    __table__ = DailyPrice.__table__.to_metadata(BenchBase.metadata, name="bench_daily_prices")
+
+
+def synthetic_daily_prices(n_symbols: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a random-walk OHLCV frame in the same layout `fetch_daily_prices` returns."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years, tz="Asia/Kolkata")
+    frames = []
+    for i in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+        frames.append(pd.DataFrame({
+            "symbol": f"SYM{i:03d}.NS",
+            "Date": dates,
+            "Open": close * (1 + rng.normal(0, 0.002, len(dates))),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(10_000, 5_000_000, len(dates)),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_bulk_insert_mappings(db, df: pd.DataFrame) -> int:
+    """The original ingestion path: delete everything, then ORM bulk insert."""
+    db.query(BenchDailyPrice).delete()
+    db.bulk_insert_mappings(BenchDailyPrice, df.to_dict(orient="records"))
+    return len(df)
+
+
+def load_upsert_records(db, df: pd.DataFrame) -> int:
+    return upsert_records(db, BenchDailyPrice, df.to_dict(orient="records"))
+
+
+def load_copy(db, df: pd.DataFrame) -> int:
+    return copy_upsert_dataframe(db, BenchDailyPrice, df)
+
+
+LOADERS = {
+    "bulk_insert_mappings": load_bulk_insert_mappings,
+    "upsert_records": load_upsert_records,
+    "copy_upsert_dataframe": load_copy,
+}
+
+
+def run(n_symbols: int, years: int):
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This benchmark needs a PostgreSQL DATABASE_URL.")
+
+    df = synthetic_daily_prices(n_symbols, years)
+    print(f"Synthetic dataset: {n_symbols} symbols x {years}y = {len(df)} rows\n")
+
+    BenchBase.metadata.create_all(bind=engine)
+    try:
+        for name, loader in LOADERS.items():
+            # Cold load into an empty table, then a warm reload of identical data
+            for phase in ("cold", "warm"):
+                if phase == "cold":
+                    with SessionLocal() as db:
+                        db.query(BenchDailyPrice).delete()
+                        db.commit()
+                with SessionLocal() as db:
+                    start = time.perf_counter()
+                    written = loader(db, df)
+                    db.commit()
+                    elapsed = time.perf_counter() - start
+                print(f"{name:<24} {phase:<5} {elapsed:8.3f}s  {len(df) / elapsed:>10,.0f} rows/s  ({written} written)")
+    finally:
+        BenchBase.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+    run(args.symbols, args.years)
@@ -0,0 +1,87 @@
+# benchmarks/ingestion_replay.py
+"""
+Benchmarks the fetch side of ingestion offline against recorded provider responses.
+
+    # once, with network access: record a universe
+    DATA_PROVIDER=record python -c "from app.tasks.csvv import write_snapshot; write_snapshot()"
+
+    # anywhere, without network access
+    python -m benchmarks.ingestion_replay [--recordings data/recordings] [--latency 0.2] [--jitter 0.05]
+    python -m benchmarks.ingestion_replay --synthetic 200 --latency 0.2   # no recordings needed
+
+Runs per-symbol daily prices at several INGEST_MAX_WORKERS settings, the
+batched multi-ticker download and the per-symbol bundle pass, each against the
+same replayed responses and the same seeded latency. Write paths are covered
+by benchmarks/copy_loader.py.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.core.config import settings
+from app.services.stock import helper
+from app.services.stock.providers import ReplayProvider, Recordings, set_provider
+from benchmarks.copy_loader import synthetic_daily_prices
+
+
+def write_synthetic_recordings(directory: str, n_symbols: int) -> list:
+    """Records a year of random-walk daily bars and a minimal `info` per synthetic symbol."""
+    recordings = Recordings(directory)
+    df = synthetic_daily_prices(n_symbols, years=1)
+    for symbol, bars in df.groupby("symbol"):
+        recordings.save_frame(symbol, "history_1d", bars.drop(columns="symbol").set_index("Date"))
+        last = bars.iloc[-1]
+        recordings.save_info(symbol, {
+            "shortName": symbol, "currentPrice": float(last["Close"]), "previousClose": float(bars.iloc[-2]["Close"]),
+        })
+    return sorted(df["symbol"].unique())
+
+
+def recorded_symbols(directory: str) -> list:
+    return sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+
+def run(name: str, func) -> float:
+    started = time.perf_counter()
+    df = func()
+    elapsed = time.perf_counter() - started
+    rows = 0 if df is None else (sum(len(v) for v in df.values() if v is not None) if isinstance(df, dict) else len(df))
+    print(f"{name:<32} {elapsed:8.2f}s  {rows:>9} rows")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", default=settings.PROVIDER_RECORDINGS_DIR)
+    parser.add_argument("--synthetic", type=int, help="generate N synthetic symbols instead of using recordings")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per replayed request")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    directory = args.recordings
+    if args.synthetic:
+        directory = tempfile.mkdtemp(prefix="replay_bench_")
+        symbols = write_synthetic_recordings(directory, args.synthetic)
+    else:
+        symbols = recorded_symbols(directory)
+    print(f"{len(symbols)} symbols, latency {args.latency}s +/- {args.jitter}s, recordings in {directory}\n")
+
+    def replay():
+        # Fresh provider per case so every case sees the same latency sequence
+        set_provider(ReplayProvider(directory, latency=args.latency, jitter=args.jitter, seed=0))
+
+    for workers in args.workers:
+        replay()
+        run(f"daily prices, {workers} workers", lambda: helper.fetch_daily_prices(symbols, max_workers=workers))
+    replay()
+    run("daily prices, batched", lambda: helper.fetch_daily_prices_batched(symbols))
+    if not args.synthetic:
+        replay()
+        run(f"symbol bundles, {max(args.workers)} workers",
+            lambda: helper.fetch_symbol_bundles(symbols, max_workers=max(args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# tests/conftest.py
+"""
+Runs the tests against a throwaway SQLite database. Settings are read once at
+import time, so the environment is set up before anything from `app` is imported.
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="stock_advisory_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("PRICE_SCHEDULER_ENABLED", "false")
+os.environ.setdefault("QUERY_PLAN_CHECK_ON_STARTUP", "false")
+
+import pytest
+
+from app.db.config import Base, engine
+from app.db.db_init import init_db
+
+
+@pytest.fixture()
+def db_tables():
+    """Fresh, empty tables for each test."""
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+STOCK_SYMBOLS = ("TCS.NS", "INFY.NS", "HDFC.NS")
+
+
+@pytest.fixture()
+def stock_data(db_tables):
+    """
+    A few symbols with info, a quote, daily prices and three years of statements.
+    HDFC.NS has only stock info, so getters must cope with missing rows.
+    """
+    from datetime import date, timedelta
+
+    from app.db.config import get_db
+    from app.db.upsert import upsert_records
+    from app.models.stock import BalanceSheet, CashFlow, CurrentPrice, DailyPrice, IncomeStatement, StockInfo
+
+    with next(get_db()) as db:
+        upsert_records(db, StockInfo, [
+            {"symbol": symbol, "shortName": symbol.split(".")[0], "currency": "INR", "sector": "Technology",
+             "currentPrice": 100.0 + i, "marketCap": 10 ** 12 * (i + 1), "trailingPE": 20.0 + i}
+            for i, symbol in enumerate(STOCK_SYMBOLS)
+        ])
+        priced = STOCK_SYMBOLS[:2]
+        upsert_records(db, CurrentPrice, [
+            {"symbol": symbol, "companyName": symbol, "currentPrice": 100.0 + i, "previousClose": 99.0,
+             "Change": 1.0 + i, "PercentChange": 1.0}
+            for i, symbol in enumerate(priced)
+        ])
+        upsert_records(db, DailyPrice, [
+            {"symbol": symbol, "Date": date(2026, 1, 1) + timedelta(days=day), "Open": 10.0 + day,
+             "High": 11.0 + day, "Low": 9.0 + day, "Close": 10.5 + day + i, "Volume": 1000 + day}
+            for i, symbol in enumerate(priced) for day in range(5 + i * 3)
+        ])
+        for offset, model, values in (
+            (0, BalanceSheet, {"total_assets": 1000.5, "total_debt": 200.25}),
+            (1, IncomeStatement, {"total_revenue": 500.0, "net_income": 50.75, "basic_eps": 12.5}),
+            (2, CashFlow, {"operating_cash_flow": 80.0, "free_cash_flow": 60.5}),
+        ):
+            upsert_records(db, model, [
+                {"symbol": symbol, "Date": date(2023 + year, 3, 31), **{k: v * (year + 1) for k, v in values.items()}}
+                for symbol in priced for year in range(3 - (offset if symbol == "INFY.NS" else 0))
+            ])
+        db.commit()
+    return STOCK_SYMBOLS
@@ -0,0 +1,81 @@
+# tests/test_async_helper.py
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect
+
+from app.db.config import AsyncSessionLocal, async_engine, get_db
+from app.db.upsert import upsert_records
+from app.models.stock import IntradayPrice
+from app.repositories import async_helper, helper
+
+
+def _values(obj):
+    if obj is None:
+        return None
+    if isinstance(obj, list):
+        return [_values(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: _values(value) for key, value in obj.items()}
+    return tuple(getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs)
+
+
+def _run(calls):
+    """Runs `calls(db)` on an async session and disposes the engine, so each test owns its event loop."""
+    async def main():
+        try:
+            async with AsyncSessionLocal() as db:
+                return await calls(db)
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(main())
+
+
+GETTERS = [
+    ("get_all_current_prices", ()),
+    ("get_current_price_by_symbol", ("tcs.ns",)),
+    ("get_current_price_by_symbol", ("HDFC.NS",)),
+    ("get_daily_prices_by_symbol", ("INFY.NS",)),
+    ("get_daily_prices_by_symbol", ("INFY.NS", 3)),
+    ("get_all_stock_info", ()),
+    ("get_stock_info_by_symbol", ("INFY.NS",)),
+    ("get_all_balance_sheets", ()),
+    ("get_balance_sheets_by_symbol", ("TCS.NS",)),
+    ("get_all_income_statements", ()),
+    ("get_income_statements_by_symbol", ("INFY.NS",)),
+    ("get_all_cash_flows", ()),
+    ("get_cash_flows_by_symbol", ("INFY.NS",)),
+    ("get_stock_profile_by_symbol", ("TCS.NS",)),
+    ("load_stock_profile", ("INFY.NS",)),
+    ("load_stock_profile", ("HDFC.NS", 2)),
+]
+
+
+def test_async_getters_match_sync_getters(stock_data):
+    async def calls(db):
+        return [_values(await getattr(async_helper, name)(db, *args)) for name, args in GETTERS]
+
+    with next(get_db()) as db:
+        expected = [_values(getattr(helper, name)(db, *args)) for name, args in GETTERS]
+    assert _run(calls) == expected
+    assert expected[1] is not None and expected[2] is None and len(expected[4]) == 3
+
+
+def test_async_intraday_window(db_tables):
+    utc = timezone.utc
+    with next(get_db()) as db:
+        upsert_records(db, IntradayPrice, [
+            {"symbol": "TCS.NS", "interval": "5m", "Datetime": datetime(2026, 10, 16, 4, minute, tzinfo=utc),
+             "Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0 + minute, "Volume": 1}
+            for minute in range(0, 30, 5)
+        ])
+        db.commit()
+    window = ("TCS.NS", "5m", datetime(2026, 10, 16, 4, 5, tzinfo=utc), datetime(2026, 10, 16, 4, 20, tzinfo=utc))
+
+    async def calls(db):
+        return _values(await async_helper.get_intraday_prices_by_symbol(db, *window, limit=2))
+
+    with next(get_db()) as db:
+        expected = _values(helper.get_intraday_prices_by_symbol(db, *window, limit=2))
+    assert _run(calls) == expected
+    assert [bar[-2] for bar in expected] == [16.0, 11.0]
@@ -0,0 +1,79 @@
+# tests/test_batch_getters.py
+from unittest import mock
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Query, Session
+
+from app.db.config import get_db
+from app.repositories import helper
+
+# Asked for in mixed case, with a duplicate and a symbol that has no rows at all
+REQUESTED = ["tcs.ns", "INFY.NS", "TCS.NS", "HDFC.NS", "NONE.NS"]
+SYMBOLS = ["TCS.NS", "INFY.NS", "HDFC.NS", "NONE.NS"]
+
+STATEMENT_GETTERS = [
+    (helper.get_balance_sheets_by_symbols, helper.get_latest_balance_sheets, helper.get_balance_sheets_by_symbol),
+    (helper.get_income_statements_by_symbols, helper.get_latest_income_statements,
+     helper.get_income_statements_by_symbol),
+    (helper.get_cash_flows_by_symbols, helper.get_latest_cash_flows, helper.get_cash_flows_by_symbol),
+]
+
+
+def _values(obj):
+    if obj is None:
+        return None
+    if isinstance(obj, list):
+        return [_values(item) for item in obj]
+    return tuple(getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs)
+
+
+def _latest_first(rows):
+    return sorted(rows, key=lambda row: row.Date, reverse=True)
+
+
+def test_latest_daily_prices_per_symbol_match_single_symbol_getter(stock_data):
+    with next(get_db()) as db:
+        for limit in (None, 1, 3, 100):
+            batch = helper.get_daily_prices_by_symbols(db, REQUESTED, limit=limit)
+            assert list(batch) == SYMBOLS
+            for symbol in SYMBOLS:
+                assert _values(batch[symbol]) == _values(helper.get_daily_prices_by_symbol(db, symbol, limit=limit))
+        assert [len(rows) for rows in helper.get_daily_prices_by_symbols(db, REQUESTED, limit=6).values()] == [5, 6, 0, 0]
+
+
+def test_statement_batches_match_single_symbol_getters(stock_data):
+    with next(get_db()) as db:
+        for by_symbols, latest, by_symbol in STATEMENT_GETTERS:
+            batch, newest = by_symbols(db, REQUESTED), latest(db, REQUESTED)
+            assert list(batch) == SYMBOLS and list(newest) == SYMBOLS
+            for symbol in SYMBOLS:
+                single = by_symbol(db, symbol)
+                assert _values(batch[symbol]) == _values(_latest_first(single))
+                assert _values(newest[symbol]) == _values(helper.get_latest_financial_data(single))
+            assert newest["HDFC.NS"] is None and newest["TCS.NS"] is not None
+
+
+def test_one_per_symbol_getters(stock_data):
+    with next(get_db()) as db:
+        prices = helper.get_current_prices_by_symbols(db, REQUESTED)
+        info = helper.get_stock_info_by_symbols(db, REQUESTED)
+        assert list(prices) == SYMBOLS and list(info) == SYMBOLS
+        for symbol in SYMBOLS:
+            assert _values(prices[symbol]) == _values(helper.get_current_price_by_symbol(db, symbol))
+            assert _values(info[symbol]) == _values(helper.get_stock_info_by_symbol(db, symbol))
+
+
+def test_latest_statements_use_distinct_on_with_postgres():
+    compiled = []
+
+    def capture(query):
+        compiled.append(str(query.statement.compile(dialect=query.session.get_bind().dialect)))
+        return []
+
+    # Never connects: the query is only compiled
+    db = Session(bind=create_engine("postgresql+psycopg2://user@localhost/unused"))
+    with mock.patch.object(Query, "all", capture):
+        assert helper.get_latest_balance_sheets(db, ["tcs.ns"]) == {"TCS.NS": None}
+    sql = " ".join(compiled[0].split())
+    assert sql.startswith("SELECT DISTINCT ON (balance_sheet.symbol)")
+    assert sql.endswith('ORDER BY balance_sheet.symbol, balance_sheet."Date" DESC')
@@ -0,0 +1,95 @@
+# tests/test_copy_loader.py
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from app.db.config import get_db
+from app.db.copy_loader import copy_upsert_dataframe
+from app.models.stock import CurrentPrice, DailyPrice
+
+
+class _RecordingCursor:
+    """psycopg2 cursor stand-in that keeps the SQL and the COPY payloads it receives."""
+
+    def __init__(self, rowcount: int):
+        self.statements = []
+        self.copied = []
+        self.rowcount = rowcount
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+    def copy_expert(self, sql, buffer):
+        self.statements.append(sql)
+        self.copied.append(buffer.read())
+
+    def close(self):
+        pass
+
+
+class _PostgresSession:
+    def __init__(self, cursor):
+        self._bind = SimpleNamespace(dialect=PGDialect_psycopg2())
+        self._cursor = cursor
+
+    def get_bind(self):
+        return self._bind
+
+    def connection(self):
+        return SimpleNamespace(connection=SimpleNamespace(cursor=lambda: self._cursor))
+
+
+def _daily(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["symbol", "Date", "Open", "Close", "Volume"])
+
+
+def test_postgres_copies_through_staging_table():
+    cursor = _RecordingCursor(rowcount=2)
+    df = _daily([
+        ("TCS.NS", pd.Timestamp("2026-01-02 00:00", tz="Asia/Kolkata"), 10.0, np.nan, 1000.0),
+        ("TCS.NS", pd.Timestamp("2026-01-05 00:00", tz="Asia/Kolkata"), 11.0, 12.0, np.nan),
+        # A duplicate key: the last one wins, as ON CONFLICT cannot update a row twice
+        ("TCS.NS", pd.Timestamp("2026-01-05 00:00", tz="Asia/Kolkata"), 11.5, 12.5, 900.0),
+    ])
+
+    assert copy_upsert_dataframe(_PostgresSession(cursor), DailyPrice, df) == 2
+
+    create, copy, merge, drop = cursor.statements
+    assert create.startswith("CREATE TEMP TABLE _stage_daily_prices_") and "ON COMMIT DROP" in create
+    assert copy.startswith("COPY _stage_daily_prices_") and "FROM STDIN WITH (FORMAT csv)" in copy
+    assert merge.startswith('INSERT INTO daily_prices (symbol, "Date", "Open", "Close", "Volume") SELECT')
+    assert 'ON CONFLICT (symbol, "Date") DO UPDATE SET' in merge
+    assert "IS DISTINCT FROM ROW(" in merge
+    assert drop.startswith("DROP TABLE _stage_daily_prices_")
+    # NaN becomes an empty CSV field, i.e. NULL; dates lose their time and zone; volumes are integers
+    assert cursor.copied == ["TCS.NS,2026-01-02,10.0,,1000\nTCS.NS,2026-01-05,11.5,12.5,900\n"]
+
+
+def test_postgres_without_update_columns_does_nothing_on_conflict():
+    cursor = _RecordingCursor(rowcount=1)
+    df = pd.DataFrame([{"symbol": "TCS.NS", "Date": "2026-01-02"}])
+
+    copy_upsert_dataframe(_PostgresSession(cursor), DailyPrice, df)
+    assert cursor.statements[2].endswith('ON CONFLICT (symbol, "Date") DO NOTHING')
+
+
+def test_fallback_upserts_and_loads_nan_as_null(db_tables):
+    df = pd.DataFrame([
+        {"symbol": "TCS.NS", "companyName": "TCS", "currentPrice": 100.0, "previousClose": np.nan,
+         "Change": np.nan, "PercentChange": np.nan},
+        {"symbol": "INFY.NS", "companyName": "Infosys", "currentPrice": 50.0, "previousClose": 49.0,
+         "Change": 1.0, "PercentChange": 2.0},
+    ])
+    with next(get_db()) as db:
+        assert copy_upsert_dataframe(db, CurrentPrice, df) == 2
+        db.commit()
+        # Same values again: the IS DISTINCT FROM guard skips both rows
+        assert copy_upsert_dataframe(db, CurrentPrice, df) == 0
+        tcs = db.get(CurrentPrice, "TCS.NS")
+        assert tcs.currentPrice == 100.0 and tcs.previousClose is None and tcs.Change is None
+
+
+def test_empty_frame_writes_nothing():
+    assert copy_upsert_dataframe(None, DailyPrice, pd.DataFrame()) == 0
@@ -0,0 +1,97 @@
+# tests/test_db_init.py
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+from sqlalchemy.exc import ProgrammingError
+
+from app.db import db_init
+from app.db.config import engine
+from app.models.stock import DailyPrice
+
+
+def _index_names(table: str) -> set:
+    with engine.connect() as conn:
+        return {name for (name,) in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,)
+        )}
+
+
+def test_missing_index_is_created_on_existing_table(db_tables):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_daily_prices_symbol_date_desc")
+    assert "ix_daily_prices_symbol_date_desc" not in _index_names("daily_prices")
+
+    db_init.ensure_indexes()
+    assert "ix_daily_prices_symbol_date_desc" in _index_names("daily_prices")
+
+
+def test_index_created_meanwhile_is_not_an_error(db_tables):
+    # Another worker created the index after this one inspected the table
+    with mock.patch.object(db_init, "inspect") as inspector:
+        inspector.return_value.has_table.return_value = True
+        inspector.return_value.get_indexes.return_value = []
+        db_init.ensure_indexes()
+    assert "ix_daily_prices_symbol_date_desc" in _index_names("daily_prices")
+
+
+class _DuplicateIndex(Exception):
+    pgcode = "42P07"
+
+
+class _PostgresEngine:
+    """Records the DDL and isolation level `_create_index` uses; optionally fails like a racing worker."""
+
+    def __init__(self, error=None):
+        self.dialect = PGDialect_psycopg2()
+        self.statements = []
+        self.isolation_level = None
+        self._error = error
+
+    def connect(self):
+        engine = self
+
+        class _Connection:
+            def execution_options(self, isolation_level=None):
+                engine.isolation_level = isolation_level
+                return self
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def exec_driver_sql(self, sql):
+                engine.statements.append(sql)
+                if engine._error is not None:
+                    raise engine._error
+
+        return _Connection()
+
+
+def _daily_index():
+    return next(iter(DailyPrice.__table__.indexes))
+
+
+def test_postgres_builds_index_concurrently_if_not_exists():
+    pg = _PostgresEngine()
+    with mock.patch.object(db_init, "engine", pg):
+        db_init._create_index(_daily_index())
+    assert pg.isolation_level == "AUTOCOMMIT"
+    assert pg.statements == [
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_daily_prices_symbol_date_desc ON daily_prices '
+        '(symbol, "Date" DESC) INCLUDE ("Open", "High", "Low", "Close", "Volume")'
+    ]
+
+
+def test_postgres_duplicate_from_racing_worker_is_ignored():
+    duplicate = ProgrammingError("CREATE INDEX", {}, _DuplicateIndex("relation already exists"))
+    with mock.patch.object(db_init, "engine", _PostgresEngine(duplicate)):
+        db_init._create_index(_daily_index())
+
+    other = ProgrammingError("CREATE INDEX", {}, SimpleNamespace(pgcode="42501"))
+    with mock.patch.object(db_init, "engine", _PostgresEngine(other)):
+        with pytest.raises(ProgrammingError):
+            db_init._create_index(_daily_index())
@@ -0,0 +1,62 @@
+# tests/test_distributed.py
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from app.core.celery_app import celery_app
+from app.db.config import get_db
+from app.models.stock import DailyPrice
+from app.services.stock import helper
+from app.tasks import distributed
+
+
+@pytest.fixture()
+def eager_celery():
+    previous = celery_app.conf.task_always_eager, celery_app.conf.task_eager_propagates
+    celery_app.conf.update(task_always_eager=True, task_eager_propagates=True)
+    yield
+    celery_app.conf.update(task_always_eager=previous[0], task_eager_propagates=previous[1])
+
+
+def _daily_prices(symbol: str) -> pd.DataFrame:
+    if symbol == "BAD.NS":
+        raise ConnectionError("provider unreachable")
+    if symbol == "NONE.NS":
+        return None
+    return pd.DataFrame([
+        {"symbol": symbol, "Date": date(2026, 1, 2), "Open": 10.0, "High": 11.0, "Low": 9.0,
+         "Close": 10.5, "Volume": 1000},
+        {"symbol": symbol, "Date": date(2026, 1, 5), "Open": 10.5, "High": 12.0, "Low": 10.0,
+         "Close": 11.5, "Volume": 1200},
+    ])
+
+
+def test_ingest_symbol_returns_errors_instead_of_raising(db_tables):
+    with mock.patch.dict(helper.DATASET_FETCHERS, {"daily_prices": _daily_prices}):
+        assert distributed.ingest_symbol("daily_prices", "TCS.NS") == {"symbol": "TCS.NS", "rows": 2, "error": None}
+        assert distributed.ingest_symbol("daily_prices", "NONE.NS") == {"symbol": "NONE.NS", "rows": 0, "error": None}
+        failed = distributed.ingest_symbol("daily_prices", "BAD.NS")
+    assert failed == {"symbol": "BAD.NS", "rows": 0, "error": "ConnectionError: provider unreachable"}
+
+
+def test_summarize_dataset():
+    summary = distributed.summarize_dataset([
+        {"symbol": "TCS.NS", "rows": 2, "error": None},
+        {"symbol": "BAD.NS", "rows": 0, "error": "ConnectionError: provider unreachable"},
+        {"symbol": "AAA.NS", "rows": 0, "error": "ValueError: bad frame"},
+    ], "daily_prices")
+    assert summary == {
+        "dataset": "daily_prices", "symbols": 3, "rows_written": 2, "failed_symbols": ["AAA.NS", "BAD.NS"],
+    }
+
+
+def test_dispatch_dataset_runs_chord_and_summarises(db_tables, eager_celery):
+    symbols = ["TCS.NS", "INFY.NS", "BAD.NS", "NONE.NS"]
+    with mock.patch.dict(helper.DATASET_FETCHERS, {"daily_prices": _daily_prices}):
+        summary = distributed.dispatch_dataset("daily_prices", symbols).get()
+
+    assert summary == {"dataset": "daily_prices", "symbols": 4, "rows_written": 4, "failed_symbols": ["BAD.NS"]}
+    with next(get_db()) as db:
+        assert db.query(DailyPrice).count() == 4
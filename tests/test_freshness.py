@@ -0,0 +1,37 @@
+# tests/test_freshness.py
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from app.services.stock import helper
+from app.tasks import distributed, ingestor
+from app.tasks.refresh_planner import plan_refresh
+
+
+def _balance_sheet(symbol: str) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"symbol": symbol, "Date": date(2025, 3, 31), "total_assets": 100.0},
+        {"symbol": symbol, "Date": date(2024, 3, 31), "total_assets": 90.0},
+    ])
+
+
+def test_streaming_ingest_records_statement_fetches(db_tables):
+    frames = [_balance_sheet("TCS.NS"), _balance_sheet("INFY.NS")]
+    assert plan_refresh("balance_sheet", ["TCS.NS", "INFY.NS"]) == {"TCS.NS": "new", "INFY.NS": "new"}
+
+    with mock.patch.object(ingestor, "iter_dataset_frames", return_value=iter(frames)):
+        ingestor.ingest_dataset_streaming("balance_sheet", symbols=["TCS.NS", "INFY.NS"])
+    assert plan_refresh("balance_sheet", ["TCS.NS", "INFY.NS"]) == {}
+
+    # Unchanged rows are not rewritten, but the fetch is still recorded
+    with mock.patch.object(ingestor, "iter_dataset_frames", return_value=iter([_balance_sheet("TCS.NS")])):
+        assert ingestor.ingest_dataset_streaming("balance_sheet", symbols=["TCS.NS"]) == 0
+
+
+def test_distributed_ingest_records_statement_fetches(db_tables):
+    with mock.patch.dict(helper.DATASET_FETCHERS, {"balance_sheet": _balance_sheet}):
+        result = distributed.ingest_symbol("balance_sheet", "TCS.NS")
+
+    assert result == {"symbol": "TCS.NS", "rows": 2, "error": None}
+    assert plan_refresh("balance_sheet", ["TCS.NS", "INFY.NS"]) == {"INFY.NS": "new"}
@@ -0,0 +1,114 @@
+# tests/test_intraday.py
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from app.db import partitions
+from app.db.config import get_db
+from app.db.upsert import upsert_records
+from app.models.stock import DailyPrice, IntradayPrice
+from app.tasks import ingestor
+
+
+class _PostgresSession:
+    """Records the SQL it is asked to run; `rows` is what every statement returns."""
+
+    def __init__(self, rows=()):
+        self._bind = SimpleNamespace(dialect=PGDialect_psycopg2())
+        self.statements = []
+        self._rows = list(rows)
+
+    def get_bind(self):
+        return self._bind
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return iter(self._rows)
+
+
+def _bar(symbol, ts, open_, high, low, close, volume, interval="5m"):
+    return {"symbol": symbol, "interval": interval, "Datetime": ts,
+            "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}
+
+
+def test_partitions_cover_ist_trading_days():
+    db = _PostgresSession()
+    partitions.ensure_intraday_partitions(db, "5m", [date(2026, 10, 16), date(2026, 10, 16)])
+
+    interval_ddl, day_ddl = db.statements
+    assert interval_ddl == (
+        "CREATE TABLE IF NOT EXISTS intraday_prices_5m PARTITION OF intraday_prices "
+        "FOR VALUES IN ('5m') PARTITION BY RANGE (\"Datetime\")"
+    )
+    assert day_ddl == (
+        "CREATE TABLE IF NOT EXISTS intraday_prices_5m_p20261016 PARTITION OF intraday_prices_5m "
+        "FOR VALUES FROM ('2026-10-16T00:00:00+05:30') TO ('2026-10-17T00:00:00+05:30')"
+    )
+
+
+def test_partition_days_parsed_from_names():
+    db = _PostgresSession(rows=[
+        ("intraday_prices_1m_p20261016",), ("intraday_prices_1m_p20261014",), ("intraday_prices_1m_default",),
+    ])
+    assert partitions.intraday_partition_days(db, "1m") == [date(2026, 10, 14), date(2026, 10, 16)]
+
+    partitions.drop_intraday_partition(db, "1m", date(2026, 10, 14))
+    assert db.statements[-1] == "DROP TABLE IF EXISTS intraday_prices_1m_p20261014"
+
+
+def test_day_bounds_are_ist_midnights_in_utc():
+    assert ingestor._day_bounds(date(2026, 10, 16)) == (
+        datetime(2026, 10, 15, 18, 30, tzinfo=timezone.utc), datetime(2026, 10, 16, 18, 30, tzinfo=timezone.utc),
+    )
+
+
+def test_ingest_creates_partitions_for_ist_days_of_utc_bars(db_tables):
+    bars = pd.DataFrame([
+        # 20:00 UTC is 01:30 IST the next day
+        _bar("TCS.NS", pd.Timestamp("2026-10-15 20:00", tz="UTC"), 10, 11, 9, 10.5, 100),
+        _bar("TCS.NS", pd.Timestamp("2026-10-16 04:00", tz="UTC"), 10.5, 12, 10, 11.5, 200),
+    ])
+    with mock.patch.object(ingestor, "fetch_intraday_prices", return_value=bars), \
+            mock.patch.object(ingestor, "ensure_intraday_partitions") as ensure:
+        assert ingestor.ingest_intraday_prices("5m", symbols=["TCS.NS"]) == 2
+    _, interval, days = ensure.call_args.args
+    assert interval == "5m" and list(days) == [date(2026, 10, 16)]
+
+
+def test_retention_rolls_old_bars_into_missing_daily_rows(db_tables):
+    utc = timezone.utc
+    with next(get_db()) as db:
+        upsert_records(db, IntradayPrice, [
+            # IST day 2026-08-03: 03:45 UTC is 09:15 IST, 09:55 UTC is 15:25 IST
+            _bar("TCS.NS", datetime(2026, 8, 3, 3, 45, tzinfo=utc), 10, 12, 9, 11, 100),
+            _bar("TCS.NS", datetime(2026, 8, 3, 9, 55, tzinfo=utc), 11, 13, 8, 12, 150),
+            # Already has a provider daily bar, which is kept
+            _bar("INFY.NS", datetime(2026, 8, 3, 3, 45, tzinfo=utc), 50, 51, 49, 50, 10),
+            # 19:00 UTC on 08-03 is 00:30 IST on 08-04: a separate day
+            _bar("TCS.NS", datetime(2026, 8, 3, 19, 0, tzinfo=utc), 20, 21, 19, 20, 5),
+            # Inside the retention window
+            _bar("TCS.NS", datetime(2026, 10, 15, 4, 0, tzinfo=utc), 30, 31, 29, 30, 7),
+        ])
+        upsert_records(db, DailyPrice, [{
+            "symbol": "INFY.NS", "Date": date(2026, 8, 3), "Open": 1.0, "High": 2.0, "Low": 0.5,
+            "Close": 1.5, "Volume": 999,
+        }])
+        db.commit()
+
+    assert ingestor.apply_intraday_retention(today=date(2026, 10, 16)) == {"1m": 0, "5m": 2}
+
+    with next(get_db()) as db:
+        daily = {
+            (row.symbol, row.Date): (row.Open, row.High, row.Low, row.Close, row.Volume)
+            for row in db.query(DailyPrice)
+        }
+        remaining = db.query(IntradayPrice).count()
+    assert daily == {
+        ("TCS.NS", date(2026, 8, 3)): (10, 13, 8, 12, 250),
+        ("TCS.NS", date(2026, 8, 4)): (20, 21, 19, 20, 5),
+        ("INFY.NS", date(2026, 8, 3)): (1.0, 2.0, 0.5, 1.5, 999),
+    }
+    assert remaining == 1
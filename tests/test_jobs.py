@@ -0,0 +1,44 @@
+# tests/test_jobs.py
+from unittest import mock
+
+from app.core import progress
+from app.services.stock import helper, yfinance_api
+from app.tasks.jobs import IngestionJob
+
+
+class _FailingTicker:
+    @property
+    def info(self):
+        raise ValueError("quoteSummary unavailable")
+
+
+class _Provider:
+    rate_limit_key = "replay"
+
+    def ticker(self, symbol):
+        return _FailingTicker()
+
+
+def test_error_class_alone_marks_symbol_failed():
+    job = IngestionJob("test")
+    job.on_symbol("daily_prices", "X.NS", 0, None, error_class="HTTPError")
+
+    result = job.to_dict()
+    assert result["symbols"]["X.NS"]["datasets"] == {"daily_prices": "failed"}
+    assert result["symbols"]["X.NS"]["errors"] == ["daily_prices: HTTPError"]
+    assert result["failures"] == 1 and result["failed_symbols"] == ["X.NS"]
+
+
+def test_swallowed_provider_error_counts_as_failure():
+    job = IngestionJob("test")
+    token = progress.set_listener(job)
+    try:
+        with mock.patch.object(yfinance_api, "get_provider", return_value=_Provider()):
+            assert helper.fetch_stock_info(["X.NS", "Y.NS"], max_workers=1) is None
+    finally:
+        progress.reset_listener(token)
+
+    result = job.to_dict()
+    assert result["failures"] == 2 and result["failed_symbols"] == ["X.NS", "Y.NS"]
+    assert result["symbols"]["X.NS"]["errors"] == ["stock_info: ValueError"]
+    assert [m["error_class"] for m in job.metrics if m["stage"] == "fetch"] == ["ValueError", "ValueError"]
@@ -0,0 +1,56 @@
+# tests/test_progress_datasets.py
+from unittest import mock
+
+import pandas as pd
+
+from app.core import progress
+from app.services.stock import helper, yfinance_api
+from app.tasks import ingestor
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_symbol(self, label, symbol, rows, error, **kwargs):
+        self.events.append(("fetch", label))
+
+    def on_transform(self, label, seconds, rows, nbytes):
+        self.events.append(("transform", label))
+
+    def on_rows_written(self, label, count, seconds=None, nbytes=None):
+        self.events.append(("write", label))
+
+
+def _stock_info(symbol: str) -> pd.DataFrame:
+    return pd.DataFrame([{"symbol": symbol, "shortName": symbol}])
+
+
+def _recorded(run) -> _Recorder:
+    recorder = _Recorder()
+    token = progress.set_listener(recorder)
+    try:
+        run()
+    finally:
+        progress.reset_listener(token)
+    return recorder
+
+
+def test_dataset_ingest_records_one_dataset_key(db_tables):
+    with mock.patch.object(helper.yfinance_api, "stock", side_effect=_stock_info):
+        recorder = _recorded(lambda: ingestor.ingest_stock_info(symbols=["TCS.NS", "INFY.NS"]))
+
+    assert {stage for stage, _ in recorder.events} == {"fetch", "transform", "write"}
+    assert {label for _, label in recorder.events} == {"stock_info"}
+
+
+def test_bundle_ingest_records_dataset_keys(db_tables):
+    def bundle(symbol):
+        return {"stock_info": _stock_info(symbol)}
+
+    with mock.patch.object(yfinance_api, "symbol_bundle", side_effect=bundle), \
+            mock.patch.object(ingestor, "ingest_daily_prices"):
+        recorder = _recorded(lambda: ingestor.ingest_all(symbols=["TCS.NS"]))
+
+    assert {label for stage, label in recorder.events if stage != "fetch"} == {"stock_info"}
+    assert {label for stage, label in recorder.events if stage == "fetch"} == {"symbol_bundle"}
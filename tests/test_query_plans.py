@@ -0,0 +1,74 @@
+# tests/test_query_plans.py
+from types import SimpleNamespace
+from unittest import mock
+
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+from app.db import query_plans
+
+SEQ_SCAN_PLAN = {
+    "Node Type": "Limit", "Total Cost": 1234.5,
+    "Plans": [{"Node Type": "Sort", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "daily_prices"}]}],
+}
+INDEX_PLAN = {
+    "Node Type": "Limit", "Total Cost": 4.2,
+    "Plans": [{"Node Type": "Index Only Scan", "Relation Name": "balance_sheet"}],
+}
+
+
+class _PlanningEngine:
+    """Answers EXPLAIN with `plans(sql)` and pg_class lookups with `table_rows`; keeps the SQL it saw."""
+
+    def __init__(self, plans, table_rows):
+        self.dialect = PGDialect_psycopg2()
+        self.explained = []
+        self._plans = plans
+        self._table_rows = table_rows
+
+    def connect(self):
+        engine = self
+
+        class _Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement, params=None):
+                sql = str(statement)
+                if sql.startswith("EXPLAIN"):
+                    engine.explained.append(sql)
+                    return SimpleNamespace(scalar=lambda: [{"Plan": engine._plans(sql)}])
+                return [(name, rows) for name, rows in engine._table_rows.items() if name in params["tables"]]
+
+        return _Connection()
+
+
+def _plans(sql):
+    return SEQ_SCAN_PLAN if "daily_prices" in sql and "row_number" not in sql else INDEX_PLAN
+
+
+def test_skipped_without_postgres():
+    assert query_plans.check_query_plans() == []
+
+
+def test_flags_seq_scans_on_large_tables():
+    engine = _PlanningEngine(_plans, {"daily_prices": 50_000})
+    with mock.patch.object(query_plans, "read_engine", engine):
+        results = query_plans.check_query_plans("TCS.NS", min_rows=10_000)
+
+    assert [result["query"] for result in results] == list(query_plans.hot_queries("TCS.NS"))
+    assert all("'TCS.NS'" in sql for sql in engine.explained)
+    flagged = {result["query"] for result in results if result["flagged"]}
+    assert flagged == {"stock profile", "daily prices by symbol"}
+    profile = results[0]
+    assert profile["plan"] == "Limit" and profile["seq_scans"] == [{"table": "daily_prices", "rows": 50_000}]
+
+
+def test_seq_scans_on_small_tables_are_not_flagged():
+    engine = _PlanningEngine(_plans, {"daily_prices": 500})
+    with mock.patch.object(query_plans, "read_engine", engine):
+        results = query_plans.check_query_plans("TCS.NS", min_rows=10_000)
+    assert not any(result["flagged"] for result in results)
+    assert results[1]["seq_scans"] == [{"table": "daily_prices", "rows": 500}]
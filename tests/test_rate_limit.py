@@ -0,0 +1,46 @@
+# tests/test_rate_limit.py
+import threading
+import time
+from unittest import mock
+
+import requests
+
+from app.core import rate_limit
+from app.services.stock import helper
+
+
+def _replay_limiter(rate_per_sec: float):
+    return mock.patch.dict(rate_limit._limiters, {"replay": rate_limit.TokenBucket(rate_per_sec, capacity=1)})
+
+
+def test_rate_limit_waits_do_not_count_towards_symbol_timeout():
+    # Three symbols share one token per 0.5s, so the last waits ~1s for its token
+    def fetcher(symbol):
+        return rate_limit.call_with_retry("replay", lambda: symbol)
+
+    with _replay_limiter(2.0):
+        results = helper._run_per_symbol(fetcher, "test", ["A", "B", "C"], max_workers=3, timeout=0.3)
+    assert results == ["A", "B", "C"]
+
+
+def test_timed_out_fetch_stops_retrying():
+    calls = []
+    finished = threading.Event()
+
+    def failing_call():
+        calls.append(time.monotonic())
+        time.sleep(0.4)  # provider work
+        raise requests.ConnectionError("connection reset")
+
+    def fetcher(symbol):
+        try:
+            return rate_limit.call_with_retry("replay", failing_call)
+        finally:
+            finished.set()
+
+    with _replay_limiter(1000.0), mock.patch.object(rate_limit, "backoff_delay", return_value=30.0):
+        results = helper._run_per_symbol(fetcher, "test", ["A"], max_workers=2, timeout=0.2)
+        assert results == [None]
+        # The worker is cancelled out of its 30s backoff instead of retrying
+        assert finished.wait(2.0)
+    assert len(calls) == 1
@@ -0,0 +1,25 @@
+# tests/test_recordings.py
+import pandas as pd
+
+from app.services.stock.providers import Recordings, ReplayProvider
+
+
+def _bars(start: str, days: int, tz=None) -> pd.DataFrame:
+    index = pd.date_range(start, periods=days, freq="D", tz=tz, name="Date")
+    return pd.DataFrame({"Close": [float(i) for i in range(days)]}, index=index)
+
+
+def test_incremental_fetch_extends_recording(tmp_path):
+    recordings = Recordings(str(tmp_path))
+    recordings.merge_history("TEST.NS", "history_1d", _bars("2026-01-01", 10, tz="Asia/Kolkata"))
+    # An incremental fetch overlapping the last recorded bar, then a naive-dated batch download
+    recordings.merge_history("TEST.NS", "history_1d", _bars("2026-01-10", 3, tz="Asia/Kolkata"))
+    recordings.merge_history("TEST.NS", "history_1d", _bars("2026-01-13", 2))
+    recordings.merge_history("TEST.NS", "history_1d", _bars("2026-01-15", 0))
+
+    df = ReplayProvider(str(tmp_path)).ticker("TEST.NS").history(interval="1d")
+
+    assert len(df) == 14
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    assert df.loc["2026-01-10", "Close"].item() == 0.0
+    assert df.index.min() == pd.Timestamp("2026-01-01", tz="Asia/Kolkata")
@@ -0,0 +1,42 @@
+# tests/test_row_hashes.py
+from unittest import mock
+
+import pandas as pd
+
+from app.db.config import get_db
+from app.models.ingestion import RowHash
+from app.models.stock import CurrentPrice
+from app.tasks import ingestor
+
+
+def _quote(price: float) -> pd.DataFrame:
+    return pd.DataFrame([{
+        "symbol": "TCS.NS", "companyName": "TCS", "currentPrice": price,
+        "previousClose": 99.0, "Change": price - 99.0, "PercentChange": 1.0,
+    }])
+
+
+def _stored_price() -> float:
+    with next(get_db()) as db:
+        return db.get(CurrentPrice, "TCS.NS").currentPrice
+
+
+def test_streaming_write_keeps_row_hashes_current(db_tables):
+    ingestor._write_table(CurrentPrice, _quote(100.0), "Current prices")
+
+    with mock.patch.object(ingestor, "iter_dataset_frames", return_value=iter([_quote(105.0)])):
+        ingestor.ingest_dataset_streaming("current_prices", symbols=["TCS.NS"])
+    assert _stored_price() == 105.0
+
+    # Back to the first value: must be seen as a change, not matched against the stale hash
+    ingestor._write_table(CurrentPrice, _quote(100.0), "Current prices")
+    assert _stored_price() == 100.0
+
+
+def test_rollback_clears_row_hashes(db_tables):
+    ingestor._write_table(CurrentPrice, _quote(100.0), "Current prices")
+
+    with mock.patch.object(ingestor, "rollback_snapshot", return_value={"version": 2, "rows": 1}):
+        ingestor.rollback_dataset("current_prices")
+    with next(get_db()) as db:
+        assert db.query(RowHash).filter(RowHash.table_name == "current_prices").count() == 0
@@ -0,0 +1,22 @@
+# tests/test_scheduler.py
+import time
+from unittest import mock
+
+from app.tasks import scheduler
+
+
+def test_loop_survives_seed_failure(db_tables):
+    price_scheduler = scheduler.CurrentPriceScheduler()
+    seed = mock.Mock(side_effect=[RuntimeError("database unreachable"), None])
+
+    with mock.patch.object(price_scheduler, "_seed_quotes", seed), \
+            mock.patch.object(price_scheduler, "refresh", return_value={}), \
+            mock.patch.object(price_scheduler, "seconds_until_next_run", return_value=0.01):
+        price_scheduler.start()
+        time.sleep(0.2)
+        try:
+            assert price_scheduler._thread.is_alive()
+            assert seed.call_count == 2
+            assert price_scheduler._seeded and price_scheduler.error is None
+        finally:
+            price_scheduler.stop()
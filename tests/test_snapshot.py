@@ -0,0 +1,69 @@
+# tests/test_snapshot.py
+from unittest import mock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db import snapshot
+
+
+class _LockNotAvailable(Exception):
+    pgcode = "55P03"
+
+
+def _lock_timeout():
+    return OperationalError("ALTER TABLE", {}, _LockNotAvailable())
+
+
+def _executed(db) -> list:
+    return [str(call.args[0]) for call in db.execute.call_args_list]
+
+
+def test_rename_retries_after_lock_timeout():
+    db = mock.MagicMock()
+    failures = [_lock_timeout()]
+
+    def execute(statement):
+        if str(statement).startswith("ALTER") and failures:
+            raise failures.pop()
+
+    db.execute.side_effect = execute
+    with mock.patch.object(snapshot.time, "sleep") as sleep:
+        snapshot._rename_tables(db, ["ALTER TABLE a RENAME TO b"])
+
+    assert sleep.call_count == 1
+    assert db.begin_nested.return_value.rollback.call_count == 1
+    assert db.begin_nested.return_value.commit.call_count == 1
+    assert _executed(db)[0].startswith("SET LOCAL lock_timeout")
+    assert _executed(db)[-1] == "SET LOCAL lock_timeout = DEFAULT"
+
+
+def test_rename_gives_up_after_retries():
+    db = mock.MagicMock()
+
+    def execute(statement):
+        if str(statement).startswith("ALTER"):
+            raise _lock_timeout()
+
+    db.execute.side_effect = execute
+
+    with mock.patch.object(snapshot.time, "sleep"), pytest.raises(OperationalError):
+        snapshot._rename_tables(db, ["ALTER TABLE a RENAME TO b"])
+    assert db.begin_nested.call_count == snapshot.settings.SNAPSHOT_SWAP_RETRIES + 1
+
+
+def test_rename_backoff_uses_swap_settings():
+    db = mock.MagicMock()
+
+    def execute(statement):
+        if str(statement).startswith("ALTER"):
+            raise _lock_timeout()
+
+    db.execute.side_effect = execute
+    swap_settings = mock.patch.multiple(
+        snapshot.settings, SNAPSHOT_SWAP_RETRIES=4, SNAPSHOT_SWAP_BACKOFF_BASE=0.25, SNAPSHOT_SWAP_BACKOFF_MAX=1.0,
+        RATE_LIMIT_BACKOFF_BASE=100.0, RATE_LIMIT_BACKOFF_MAX=100.0,
+    )
+    with swap_settings, mock.patch.object(snapshot.time, "sleep") as sleep, pytest.raises(OperationalError):
+        snapshot._rename_tables(db, ["ALTER TABLE a RENAME TO b"])
+    assert [call.args[0] for call in sleep.call_args_list] == [0.25, 0.5, 1.0, 1.0]
@@ -0,0 +1,85 @@
+# tests/test_snapshot_replay.py
+import json
+import os
+from datetime import date
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import ingest as ingest_routes
+from app.db.config import get_db
+from app.models.stock import BalanceSheet, DailyPrice, StockInfo
+from app.tasks import csvv, ingestor
+
+
+def _bundles(symbols):
+    return {
+        "stock_info": pd.DataFrame([
+            {"symbol": "TCS.NS", "shortName": "TCS", "currentPrice": 100.0, "volume": 1000.0,
+             "marketCap": 1.5e12, "beta": np.nan, "notAColumn": "dropped"},
+        ]),
+        "balance_sheet": pd.DataFrame([
+            {"symbol": "TCS.NS", "Date": pd.Timestamp("2025-03-31"), "total_assets": 100.5, "total_debt": None},
+        ]),
+        "income_statement": None,
+        "cash_flow": pd.DataFrame(),
+        "current_prices": None,
+    }
+
+
+def _daily(symbols):
+    return pd.DataFrame([
+        {"symbol": "TCS.NS", "Date": pd.Timestamp("2026-01-02", tz="Asia/Kolkata"), "Open": 10.0,
+         "High": 11.0, "Low": 9.0, "Close": 10.5, "Volume": 1000.0},
+        {"symbol": "TCS.NS", "Date": pd.Timestamp("2026-01-05", tz="Asia/Kolkata"), "Open": 10.5,
+         "High": 12.0, "Low": 10.0, "Close": 11.5, "Volume": np.nan},
+    ])
+
+
+def test_write_snapshot_replays_into_tables(db_tables, tmp_path):
+    directory = str(tmp_path / "20260102T000000")
+    with mock.patch.object(csvv, "fetch_symbol_bundles", side_effect=_bundles), \
+            mock.patch.object(csvv, "fetch_daily_prices", side_effect=_daily):
+        assert csvv.write_snapshot(["TCS.NS"], directory) == directory
+
+    with open(os.path.join(directory, csvv.MANIFEST_FILE)) as f:
+        assert json.load(f)["rows"] == {"stock_info": 1, "balance_sheet": 1, "daily_prices": 2}
+    assert list(csvv.read_snapshot(directory, "stock_info").columns).count("notAColumn") == 0
+    assert csvv.read_snapshot(directory, "cash_flow") is None
+
+    assert ingestor.ingest_from_snapshot(directory) == {"stock_info": 1, "balance_sheet": 1, "daily_prices": 2}
+    with next(get_db()) as db:
+        info = db.get(StockInfo, "TCS.NS")
+        assert (info.shortName, info.volume, int(info.marketCap), info.beta) == ("TCS", 1000, 1500000000000, None)
+        sheet = db.get(BalanceSheet, ("TCS.NS", date(2025, 3, 31)))
+        assert float(sheet.total_assets) == 100.5 and sheet.total_debt is None
+        prices = db.query(DailyPrice).order_by(DailyPrice.Date).all()
+        assert [(p.Date, p.Close, p.Volume) for p in prices] == [
+            (date(2026, 1, 2), 10.5, 1000), (date(2026, 1, 5), 11.5, None),
+        ]
+
+
+@pytest.mark.parametrize("name", [".", "..", "", "a/b", "../outside"])
+def test_replay_rejects_names_outside_snapshot_dir(tmp_path, name):
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    with mock.patch.object(ingest_routes.settings, "SNAPSHOT_DIR", str(snapshots)):
+        with pytest.raises(HTTPException) as raised:
+            ingest_routes.trigger_snapshot_replay(name)
+    assert raised.value.status_code == 404
+
+
+def test_replay_rejects_symlink_out_of_snapshot_dir(tmp_path):
+    snapshots, outside = tmp_path / "snapshots", tmp_path / "outside"
+    snapshots.mkdir()
+    outside.mkdir()
+    (snapshots / "link").symlink_to(outside)
+    with mock.patch.object(ingest_routes.settings, "SNAPSHOT_DIR", str(snapshots)):
+        assert ingest_routes._snapshot_directory("link") is None
+        (snapshots / "20260102T000000").mkdir()
+        assert ingest_routes._snapshot_directory("20260102T000000") == os.path.realpath(
+            snapshots / "20260102T000000"
+        )
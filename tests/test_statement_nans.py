@@ -0,0 +1,51 @@
+# tests/test_statement_nans.py
+from types import SimpleNamespace
+from unittest import mock
+
+from app.db import db_init, statement_nans
+
+
+class _PostgresEngine:
+    """Records the statements run in `begin()`; every UPDATE reports `rowcount` rows."""
+
+    def __init__(self, rowcount: int):
+        self.dialect = SimpleNamespace(name="postgresql")
+        self.statements = []
+        self._rowcount = rowcount
+
+    def begin(self):
+        engine = self
+
+        class _Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement):
+                engine.statements.append(str(statement))
+                return SimpleNamespace(rowcount=engine._rowcount)
+
+        return _Connection()
+
+
+def test_init_db_does_not_run_the_migration(db_tables):
+    with mock.patch.object(statement_nans, "engine") as engine:
+        db_init.init_db()
+    engine.begin.assert_not_called()
+
+
+def test_migration_nulls_every_statement_column():
+    pg = _PostgresEngine(rowcount=2)
+    with mock.patch.object(statement_nans, "engine", pg):
+        counts = statement_nans.null_statement_nans()
+
+    columns = sum(len(cols) for cols in statement_nans.STATEMENT_NAN_COLUMNS.values())
+    assert len(pg.statements) == len(counts) == columns
+    assert pg.statements[0] == 'UPDATE balance_sheet SET "total_assets" = NULL WHERE "total_assets" = \'NaN\''
+    assert counts["cash_flow.cash_dividends_paid"] == 2
+
+
+def test_migration_skipped_without_postgres():
+    assert statement_nans.null_statement_nans() == {}
@@ -0,0 +1,127 @@
+# tests/test_stock_profile.py
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import event, inspect
+
+from app.db.config import engine, get_db
+from app.models.stock import DailyPrice
+from app.repositories import helper
+from app.repositories.metrics_processor import CalculatedMetrics, MetricsProcessor
+
+
+def _values(obj):
+    if obj is None:
+        return None
+    if isinstance(obj, list):
+        return [_values(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: _values(value) for key, value in obj.items()}
+    return tuple(getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs)
+
+
+def _as_pg_json(obj):
+    """What row_to_json gives for a row: column names to JSON scalars (dates as ISO strings)."""
+    def scalar(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return float(value)
+        return value
+    row = {column.name: scalar(getattr(obj, attr.key))
+           for attr in inspect(type(obj)).column_attrs for column in attr.columns}
+    return json.loads(json.dumps(row))
+
+
+class _PostgresSession:
+    """Answers `stock_profile_query` the way PostgreSQL would, from the per-table getters' rows."""
+
+    def __init__(self, db):
+        self._db = db
+        self.queries = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, query, params):
+        self.queries.append((str(query), params))
+        symbol, limit = params["symbol"], params["daily_limit"]
+        mapping = {}
+        for key, model, many in helper.PROFILE_TABLES:
+            rows = self._db.query(model).filter(model.symbol == symbol).all()
+            if many:
+                mapping[key] = [_as_pg_json(row) for row in rows] or None
+            else:
+                mapping[key] = _as_pg_json(rows[0]) if rows else None
+        daily = helper.get_daily_prices_by_symbol(self._db, symbol, limit=limit) if limit else []
+        mapping["daily_prices"] = [_as_pg_json(row) for row in daily] or None
+        return SimpleNamespace(one=lambda: SimpleNamespace(_mapping=mapping))
+
+
+def _per_table(db, symbol, daily_limit=helper.PROFILE_DAILY_PRICES):
+    return {
+        "stock_info": helper.get_stock_info_by_symbol(db, symbol),
+        "current_price": helper.get_current_price_by_symbol(db, symbol),
+        "balance_sheet": helper.get_balance_sheets_by_symbol(db, symbol),
+        "income_statement": helper.get_income_statements_by_symbol(db, symbol),
+        "cash_flow": helper.get_cash_flows_by_symbol(db, symbol),
+        "daily_prices": helper.get_daily_prices_by_symbol(db, symbol, limit=daily_limit) if daily_limit else [],
+    }
+
+
+def test_one_statement_profile_matches_per_table_getters(stock_data):
+    with next(get_db()) as db:
+        for symbol, daily_limit in (("TCS.NS", 260), ("INFY.NS", 3), ("HDFC.NS", 260), ("TCS.NS", 0)):
+            pg = _PostgresSession(db)
+            profile = helper.load_stock_profile(pg, symbol.lower(), daily_limit=daily_limit)
+            assert len(pg.queries) == 1 and pg.queries[0][1] == {"symbol": symbol, "daily_limit": daily_limit}
+            assert _values(profile) == _values(_per_table(db, symbol, daily_limit))
+            # Types survive the JSON round trip, not only the values
+            if profile["balance_sheet"]:
+                sheet = profile["balance_sheet"][0]
+                assert isinstance(sheet.Date, date) and isinstance(sheet.total_assets, Decimal)
+            assert all(isinstance(bar, DailyPrice) for bar in profile["daily_prices"])
+
+
+def test_profile_query_binds_symbol_and_daily_limit():
+    sql = str(helper.stock_profile_query())
+    assert sql.count(":symbol") == len(helper.PROFILE_TABLES) + 1
+    assert 'ORDER BY "Date" DESC LIMIT :daily_limit' in sql
+
+
+def test_sqlite_profile_is_the_per_table_getters(stock_data):
+    with next(get_db()) as db:
+        assert _values(helper.load_stock_profile(db, "infy.ns")) == _values(_per_table(db, "INFY.NS"))
+
+
+def _metrics(processor):
+    return {
+        "current_price": processor.get_current_price_metrics(),
+        "stock_info": processor.get_stock_info_metrics(),
+        "balance_sheet": processor.get_balance_sheet_metrics(),
+        "income_statement": processor.get_income_statement_metrics(),
+        "cash_flow": processor.get_cash_flow_metrics(),
+        "daily_prices": processor.get_daily_prices_metrics(limit=4),
+        "debt_to_equity": CalculatedMetrics(processor).calculate_debt_to_equity_ratio(),
+        "technical": CalculatedMetrics(processor).get_comprehensive_technical_analysis(),
+    }
+
+
+def test_preloaded_metrics_match_and_need_no_more_queries(stock_data):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with next(get_db()) as db:
+        expected = _metrics(MetricsProcessor(db, "TCS.NS"))
+        assert expected["balance_sheet"] and len(expected["daily_prices"]) == 4
+        preloaded = MetricsProcessor(db, "tcs.ns").preload()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            assert _metrics(preloaded) == expected
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+    assert statements == []
@@ -0,0 +1,37 @@
+# tests/test_symbol_bundle.py
+from unittest import mock
+
+import pandas as pd
+
+from app.services.stock import yfinance_api
+
+
+class _NoInfoTicker:
+    """A Ticker whose `.info` fails while its statement endpoints still answer."""
+
+    def __init__(self):
+        dates = pd.to_datetime(["2025-03-31"])
+        self.balance_sheet = pd.DataFrame({dates[0]: [100.0]}, index=["Total Assets"])
+        self.financials = pd.DataFrame({dates[0]: [50.0]}, index=["Total Revenue"])
+        self.cashflow = pd.DataFrame({dates[0]: [10.0]}, index=["Free Cash Flow"])
+
+    @property
+    def info(self):
+        raise ValueError("quoteSummary unavailable")
+
+
+class _Provider:
+    rate_limit_key = "replay"
+
+    def ticker(self, symbol):
+        return _NoInfoTicker()
+
+
+def test_statements_fetched_when_info_fails():
+    with mock.patch.object(yfinance_api, "get_provider", return_value=_Provider()):
+        bundle = yfinance_api.symbol_bundle("TEST.NS")
+
+    assert bundle["stock_info"] is None
+    assert bundle["current_prices"] is None
+    for statement in yfinance_api.STATEMENTS:
+        assert bundle[statement] is not None and len(bundle[statement]) == 1
@@ -0,0 +1,63 @@
+# tests/test_upsert.py
+from unittest import mock
+
+from app.db import upsert
+from app.db.config import get_db
+from app.db.upsert import upsert_records
+from app.models.stock import CurrentPrice
+
+
+def _quote(symbol: str, price: float) -> dict:
+    return {
+        "symbol": symbol, "companyName": symbol, "currentPrice": price,
+        "previousClose": 99.0, "Change": price - 99.0, "PercentChange": 1.0,
+    }
+
+
+def _prices() -> dict:
+    with next(get_db()) as db:
+        return {row.symbol: row.currentPrice for row in db.query(CurrentPrice)}
+
+
+def test_inserts_then_updates_on_primary_key(db_tables):
+    with next(get_db()) as db:
+        assert upsert_records(db, CurrentPrice, [_quote("TCS.NS", 100.0), _quote("INFY.NS", 50.0)]) == 2
+        db.commit()
+        assert upsert_records(db, CurrentPrice, [_quote("TCS.NS", 101.0), _quote("HDFC.NS", 70.0)]) == 2
+        db.commit()
+    assert _prices() == {"TCS.NS": 101.0, "INFY.NS": 50.0, "HDFC.NS": 70.0}
+
+
+def test_unchanged_rows_are_not_rewritten(db_tables):
+    records = [_quote("TCS.NS", 100.0), _quote("INFY.NS", 50.0)]
+    with next(get_db()) as db:
+        upsert_records(db, CurrentPrice, records)
+        db.commit()
+        assert upsert_records(db, CurrentPrice, records) == 0
+        assert upsert_records(db, CurrentPrice, [_quote("TCS.NS", 100.0), _quote("INFY.NS", 51.0)]) == 1
+        db.commit()
+    assert _prices() == {"TCS.NS": 100.0, "INFY.NS": 51.0}
+
+
+def test_writes_in_chunks(db_tables):
+    records = [_quote(f"S{i}.NS", float(i)) for i in range(5)]
+    with next(get_db()) as db:
+        assert upsert_records(db, CurrentPrice, records, chunk_size=2) == 5
+        db.commit()
+    assert len(_prices()) == 5
+
+
+def test_merge_fallback_on_other_dialects(db_tables):
+    with next(get_db()) as db:
+        upsert_records(db, CurrentPrice, [_quote("TCS.NS", 100.0)])
+        db.commit()
+        with mock.patch.dict(upsert._DIALECT_INSERTS, clear=True):
+            written = upsert_records(db, CurrentPrice, [_quote("TCS.NS", 102.0), _quote("INFY.NS", 50.0)])
+        db.commit()
+    assert written == 2
+    assert _prices() == {"TCS.NS": 102.0, "INFY.NS": 50.0}
+
+
+def test_empty_records_write_nothing(db_tables):
+    with next(get_db()) as db:
+        assert upsert_records(db, CurrentPrice, []) == 0